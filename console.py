@@ -22,6 +22,17 @@ class LicenseAction(argparse.Action):
         sys.exit()
 
 
+def positive_int(text):
+    """Convert a command-line argument to an integer of at least 1."""
+    try:
+        rv = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid int value: '{}'".format(text))
+    if rv < 1:
+        raise argparse.ArgumentTypeError("must be at least 1: '{}'".format(text))
+    return rv
+
+
 def main():
     """Entry point for lamprop console application."""
     # Process the command-line arguments
@@ -48,6 +59,13 @@ def main():
     opts.add_argument(
         "-f", "--fea", action="store_true", help="output only material data for FEA"
     )
+    opts.add_argument(
+        "-p",
+        "--polar",
+        type=positive_int,
+        metavar="N",
+        help="output only the in-plane properties in N directions (plain text)",
+    )
     group = opts.add_mutually_exclusive_group()
     group.add_argument(
         "-L", "--license", action=LicenseAction, nargs=0, help="print the license"
@@ -85,6 +103,9 @@ def main():
         logging.info("processing file '{}'".format(f))
         laminates = lp.parse(f)
         for curlam in laminates:
+            if args.polar is not None:
+                print(*lp.text.polar(curlam, args.polar), sep="\n")
+                continue
             print(*out(curlam, args.eng, args.mat, args.fea), sep="\n")
 
 
@@ -12,5 +12,6 @@ from .html import out as html_output
 from .latex import out as latex_output
 from .parser import parse
 from .text import out as text_output
-from .core import fiber, resin, lamina, laminate
+from .core import fiber, resin, lamina, laminate, set_backend, get_backend
+from .batch import sweep, montecarlo
 from .version import __version__, __license__
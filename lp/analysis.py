@@ -0,0 +1,306 @@
+# file: analysis.py
+# vim:fileencoding=utf-8:ft=python:fdm=marker
+#
+# Copyright © 2026 R.F. Smith <rsmith@xs4all.nl>. All rights reserved.
+# SPDX-License-Identifier: BSD-2-Clause
+# Created: 2026-10-18T17:10:52+0200
+# Last modified: 2026-10-18T17:10:52+0200
+"""
+Stress and strain analysis of laminates.
+
+For a laminate and a load, the strains and stresses in the plies follow from
+the mid-plane strains and curvatures, [ε⁰, κ] = abd·([N, M] + ΔT·[Nᵗ, Mᵗ]).
+See Hyer:1998, chapters 7 and 11.
+
+The abd matrix, the thermal resultants and the ply data are gathered once per
+laminate; per load case only the mid-plane strains and curvatures and the
+resulting ply strains and stresses are calculated.
+
+The interlaminar shear stresses follow from integrating the equilibrium
+equations ∂τxz/∂z = -(∂σx/∂x + ∂τxy/∂y) and ∂τyz/∂z = -(∂τxy/∂x + ∂σy/∂y)
+through the thickness. The transverse shear forces are taken to come from
+the moment gradients ∂Mx/∂x = Qx and ∂My/∂y = Qy. Within a ply the in-plane
+stresses are linear in z and the interlaminar shear stresses quadratic, so
+they can be evaluated exactly at any number of points.
+"""
+
+from array import array
+from types import SimpleNamespace
+import math
+import operator
+import lp.core as core
+
+# The columns of the results of profile().
+_PROFILE = ("z", "εx", "εy", "γxy", "σx", "σy", "τxy", "τxz", "τyz", "γxz", "γyz")
+
+
+def ply_stresses(lam, loads, ΔT=0.0):
+    """
+    Calculate the strains and stresses in every ply of a laminate.
+
+    With the "numpy" backend, all load cases are evaluated at once.
+
+    Arguments:
+        lam: The laminate.
+        loads: A sequence of load cases. Every load case is a sequence
+            (Nx, Ny, Nxy, Mx, My, Mxy) of forces in N/mm and moments in N.
+        ΔT: Temperature difference in K with respect to the stress-free
+            temperature. Either a number for all load cases or a sequence
+            with a number for every load case.
+
+    Returns:
+        A SimpleNamespace with:
+            shape: (number of cases, number of plies, 3, 3).
+            z: Array of the z-coordinates in mm of the bottom, middle and top
+                of every ply; index 3·ply + position.
+            strain, stress: Arrays of the strains (εx, εy, γxy) and stresses
+                (σx, σy, τxy) in MPa in laminate coordinates.
+            strain12, stress12: Arrays of the strains (ε1, ε2, γ12) and
+                stresses (σ1, σ2, τ12) in MPa in ply coordinates.
+        Element ((case·plies + ply)·3 + position)·3 + component of these
+        arrays belongs to the given case, ply (0 is the bottom ply), position
+        (0 bottom, 1 middle, 2 top) and component. The arrays can be
+        reshaped with e.g. numpy.frombuffer(rv.stress).reshape(rv.shape).
+        Strains are mechanical strains, so without the free thermal
+        expansion.
+    """
+    loads = [tuple(float(v) for v in load) for load in loads]
+    if any(len(load) != 6 for load in loads):
+        raise ValueError("a load case must have 6 components")
+    if isinstance(ΔT, (int, float)):
+        ΔT = [float(ΔT)] * len(loads)
+    elif len(ΔT) != len(loads):
+        raise ValueError("ΔT needs a value for every load case")
+    abd = [list(row) for row in lam.abd]
+    # Mid-plane strains and curvatures per unit ΔT, for free expansion.
+    thermal = list(lam.Nt) + list(thermal_moments(lam))
+    g_t = [sum(map(operator.mul, row, thermal)) for row in abd]
+    plies, z = _plies(lam)
+    rv = SimpleNamespace(
+        shape=(len(loads), len(lam.layers), 3, 3),
+        z=array("d", z),
+        strain=array("d"),
+        stress=array("d"),
+        strain12=array("d"),
+        stress12=array("d"),
+    )
+    if core.get_backend() == "numpy":
+        _stresses_stack(rv, abd, g_t, plies, loads, ΔT)
+        return rv
+    mul = operator.mul
+    strain, stress, strain12, stress12 = [], [], [], []
+    for load, dt in zip(loads, ΔT):
+        εx0, εy0, γxy0, κx, κy, κxy = (
+            sum(map(mul, row, load)) + dt * t for row, t in zip(abd, g_t)
+        )
+        for zs, Q̅, Tε, Q, (αx, αy, αxy) in plies:
+            Q̅11, Q̅12, Q̅16, Q̅22, Q̅26, Q̅66 = Q̅
+            T11, T12, T16, T61 = Tε
+            Q11, Q12, Q22, Q66 = Q
+            for zp in zs:
+                # Mechanical strains in laminate and ply coordinates.
+                εx = εx0 + zp * κx - dt * αx
+                εy = εy0 + zp * κy - dt * αy
+                γxy = γxy0 + zp * κxy - dt * αxy
+                ε1 = T11 * εx + T12 * εy + T16 * γxy
+                ε2 = T12 * εx + T11 * εy - T16 * γxy
+                γ12 = T61 * (εy - εx) + (T11 - T12) * γxy
+                strain += (εx, εy, γxy)
+                stress += (
+                    Q̅11 * εx + Q̅12 * εy + Q̅16 * γxy,
+                    Q̅12 * εx + Q̅22 * εy + Q̅26 * γxy,
+                    Q̅16 * εx + Q̅26 * εy + Q̅66 * γxy,
+                )
+                strain12 += (ε1, ε2, γ12)
+                stress12 += (Q11 * ε1 + Q12 * ε2, Q12 * ε1 + Q22 * ε2, Q66 * γ12)
+        rv.strain.extend(strain)
+        rv.stress.extend(stress)
+        rv.strain12.extend(strain12)
+        rv.stress12.extend(stress12)
+        del strain[:], stress[:], strain12[:], stress12[:]
+    return rv
+
+
+def _stresses_stack(rv, abd, g_t, plies, loads, ΔT):
+    """
+    Calculate the strains and stresses of ply_stresses for all load cases at
+    once with NumPy, and append them to the arrays in rv.
+
+    The mid-plane strains and curvatures of all cases follow from a single
+    product of the (cases, 6) loads with abdᵀ; the ply transformations are
+    broadcast over the cases.
+    """
+    np = core.lpm.np
+    loads = np.array(loads, dtype=float).reshape(-1, 6)
+    dt = np.array(ΔT, dtype=float)
+    g = loads @ np.asarray(abd, dtype=float).T + dt[:, None] * np.array(g_t)
+    Q̅, T, Q, α = [], [], [], []
+    for _, (Q̅11, Q̅12, Q̅16, Q̅22, Q̅26, Q̅66), Tε, (Q11, Q12, Q22, Q66), ᾱ in plies:
+        T11, T12, T16, T61 = Tε
+        Q̅.append(((Q̅11, Q̅12, Q̅16), (Q̅12, Q̅22, Q̅26), (Q̅16, Q̅26, Q̅66)))
+        T.append(((T11, T12, T16), (T12, T11, -T16), (-T61, T61, T11 - T12)))
+        Q.append(((Q11, Q12, 0.0), (Q12, Q22, 0.0), (0.0, 0.0, Q66)))
+        α.append(ᾱ)
+    # Every ply has three positions.
+    Q̅, T, Q, α = (np.repeat(np.array(v), 3, axis=0) for v in (Q̅, T, Q, α))
+    z = np.array(rv.z)
+    # Mechanical strains; the axes are case, position and component.
+    strain = (
+        g[:, None, :3] + z[None, :, None] * g[:, None, 3:] - dt[:, None, None] * α
+    )
+    strain12 = np.einsum("pij,cpj->cpi", T, strain)
+    for name, v in (
+        ("strain", strain),
+        ("stress", np.einsum("pij,cpj->cpi", Q̅, strain)),
+        ("strain12", strain12),
+        ("stress12", np.einsum("pij,cpj->cpi", Q, strain12)),
+    ):
+        getattr(rv, name).frombytes(np.ascontiguousarray(v).tobytes())
+
+
+def profile(lam, load, shear=(0.0, 0.0), ΔT=0.0, samples=11):
+    """
+    Calculate strains and stresses through the thickness of a laminate.
+
+    With the "numpy" backend, the points of a ply are evaluated at once.
+
+    Arguments:
+        lam: The laminate.
+        load: Forces and moments (Nx, Ny, Nxy, Mx, My, Mxy) in N/mm and N.
+        shear: Transverse shear forces (Qx, Qy) in N/mm.
+        ΔT: Temperature difference in K with respect to the stress-free
+            temperature.
+        samples: Number of evenly spaced points per ply, including its bottom
+            and top. Must be at least 2.
+
+    Returns:
+        A SimpleNamespace with:
+            columns: The names of the columns; z (in mm), εx, εy, γxy, σx,
+                σy, τxy, τxz, τyz, γxz and γyz (stresses in MPa).
+            shape: (number of rows, number of columns).
+            data: Array with the rows one after another, from the bottom of
+                the laminate to the top.
+            ply: Array with the index of the ply of every row.
+        Strains are mechanical strains, so without the free thermal
+        expansion. The transverse shear strains follow from the transverse
+        shear stiffness of the plies.
+    """
+    load = tuple(float(v) for v in load)
+    if len(load) != 6:
+        raise ValueError("a load case must have 6 components")
+    if samples < 2:
+        raise ValueError("samples must be at least 2")
+    Qx, Qy = (float(v) for v in shear)
+    mul = operator.mul
+    abd = [list(row) for row in lam.abd]
+    thermal = list(lam.Nt) + list(thermal_moments(lam))
+    g = [
+        sum(map(mul, row, load)) + ΔT * sum(map(mul, row, thermal))
+        for row in abd
+    ]
+    # Derivatives of the mid-plane strains and curvatures to x and y.
+    gx = [row[3] * Qx for row in abd]
+    gy = [row[4] * Qy for row in abd]
+    rv = SimpleNamespace(
+        columns=_PROFILE,
+        shape=(samples * len(lam.layers), len(_PROFILE)),
+        data=array("d"),
+        ply=array("l"),
+    )
+    np = core.lpm.np if core.get_backend() == "numpy" else None
+    blocks = []
+    zb, τxz, τyz = -lam.thickness / 2, 0.0, 0.0
+    for j, la in enumerate(lam.layers):
+        Q̅11, Q̅12, Q̅16, Q̅22, Q̅26, Q̅66 = _qbar(la)
+        Q̅ = [[Q̅11, Q̅12, Q̅16], [Q̅12, Q̅22, Q̅26], [Q̅16, Q̅26, Q̅66]]
+        α = (la.αx, la.αy, la.αxy)
+        # Stress derivatives are linear in z; ∂σ/∂x = px + z·qx.
+        px, qx, py, qy = (
+            [sum(map(mul, row, v)) for row in Q̅]
+            for v in (gx[:3], gx[3:], gy[:3], gy[3:])
+        )
+        # Integrands of the equilibrium equations, a + b·z.
+        ax, bx = px[0] + py[2], qx[0] + qy[2]
+        ay, by = px[2] + py[1], qx[2] + qy[1]
+        # Transverse shear compliance of the ply.
+        det = la.Q̅s44 * la.Q̅s55 - la.Q̅s45 * la.Q̅s45
+        s44, s45, s55 = la.Q̅s55 / det, -la.Q̅s45 / det, la.Q̅s44 / det
+        t = la.thickness
+        if np is not None:
+            z = zb + t * np.arange(samples) / (samples - 1)
+            ε = np.array(g[:3]) + np.outer(z, g[3:]) - ΔT * np.array(α)
+            dz, dz2 = z - zb, (z * z - zb * zb) / 2
+            txz = τxz - ax * dz - bx * dz2
+            tyz = τyz - ay * dz - by * dz2
+            γxz, γyz = s45 * tyz + s55 * txz, s44 * tyz + s45 * txz
+            # The rows of ε·Q̅ are the stresses, since Q̅ is symmetric.
+            blocks.append(
+                np.column_stack((z, ε, ε @ np.array(Q̅), txz, tyz, γxz, γyz))
+            )
+            rv.ply.extend([j] * samples)
+        else:
+            for k in range(samples):
+                z = zb + t * k / (samples - 1)
+                ε = [a + z * b - ΔT * c for a, b, c in zip(g[:3], g[3:], α)]
+                σ = [sum(map(mul, row, ε)) for row in Q̅]
+                dz, dz2 = z - zb, (z * z - zb * zb) / 2
+                txz = τxz - ax * dz - bx * dz2
+                tyz = τyz - ay * dz - by * dz2
+                γxz, γyz = s45 * tyz + s55 * txz, s44 * tyz + s45 * txz
+                rv.data.extend((z, *ε, *σ, txz, tyz, γxz, γyz))
+                rv.ply.append(j)
+        zt = zb + t
+        dz2 = (zt * zt - zb * zb) / 2
+        τxz -= ax * t + bx * dz2
+        τyz -= ay * t + by * dz2
+        zb = zt
+    if blocks:
+        rv.data.frombytes(np.concatenate(blocks).tobytes())
+    return rv
+
+
+def thermal_moments(lam):
+    """
+    Calculate the unit thermal moment resultants (Mtx, Mty, Mtxy) of a
+    laminate. These are 0 for a symmetric laminate.
+    """
+    Mt = [0.0, 0.0, 0.0]
+    zs = -lam.thickness / 2
+    for la in lam.layers:
+        ze = zs + la.thickness
+        z2 = (ze * ze - zs * zs) / 2
+        for k, v in enumerate(core._qalpha(_qbar(la), (la.αx, la.αy, la.αxy))):
+            Mt[k] += v * z2
+        zs = ze
+    return tuple(Mt)
+
+
+def _plies(lam):
+    """
+    Collect the data of the plies that ply_stresses needs.
+
+    Returns:
+        A list with a tuple (z, Q̅, Tε, Q, ᾱ) for every ply and a list of all
+        z-coordinates. Here z are the bottom, middle and top of the ply and
+        Tε = (m², n², mn, 2mn) defines the transformation of strains to ply
+        coordinates.
+    """
+    plies, zs = [], []
+    z = -lam.thickness / 2
+    for la in lam.layers:
+        p = la.ply
+        a = math.radians(float(la.angle))
+        m, n = math.cos(a), math.sin(a)
+        # Hyer:1998, p. 112
+        Tε = (m * m, n * n, m * n, 2 * m * n)
+        z3 = (z, z + la.thickness / 2, z + la.thickness)
+        zs += z3
+        Q = (p.Q11, p.Q12, p.Q22, p.Q66)
+        plies.append((z3, _qbar(la), Tε, Q, (la.αx, la.αy, la.αxy)))
+        z += la.thickness
+    return plies, zs
+
+
+def _qbar(la):
+    """Return (Q̅11, Q̅12, Q̅16, Q̅22, Q̅26, Q̅66) of the lamina la."""
+    return (la.Q̅11, la.Q̅12, la.Q̅16, la.Q̅22, la.Q̅26, la.Q̅66)
@@ -0,0 +1,460 @@
+# file: batch.py
+# vim:fileencoding=utf-8:ft=python:fdm=marker
+#
+# Copyright © 2026 R.F. Smith <rsmith@xs4all.nl>. All rights reserved.
+# SPDX-License-Identifier: BSD-2-Clause
+# Created: 2026-10-18T15:02:33+0200
+# Last modified: 2026-10-18T16:02:45+0200
+"""
+Evaluation of many laminates.
+
+The laminates are evaluated in chunks. On request, chunks are distributed over
+a pool of worker processes. Results are returned per chunk, as columns of
+numbers.
+"""
+
+from array import array
+from collections import deque
+from types import SimpleNamespace
+import itertools
+import math
+import multiprocessing
+import os
+import random
+from .core import (
+    Fiber,
+    PlyMaterial,
+    fiber,
+    resin,
+    lamina_cache,
+    laminate,
+    get_backend,
+    _lamina,
+    _alphabar,
+    _micromechanics,
+)
+
+# The columns of laminate properties in the results.
+_PROPERTIES = ("Ex", "Ey", "Gxy", "νxy", "αx", "αy", "thickness", "weight")
+
+# Properties of which montecarlo returns statistics.
+_STATISTICS = _PROPERTIES + ("Ez", "Gxz", "Gyz", "νyx", "ρ")
+
+# Input properties of fibers and resins, in the order of the arguments of
+# fiber() and resin().
+_FIBER_INPUTS = ("E1", "ν12", "α1", "ρ")
+_RESIN_INPUTS = ("E", "ν", "α", "ρ")
+# Inputs that must be positive.
+_POSITIVE = ("E1", "E", "ρ")
+
+
+def sweep(
+    template,
+    vf=None,
+    angles=None,
+    fiber_weight=None,
+    repeat=None,
+    processes=1,
+    chunksize=256,
+):
+    """
+    Evaluate laminates for every combination of the given parameters.
+
+    The grid is the Cartesian product of the parameter axes. An axis that is
+    not given uses the value from the template.
+
+    Arguments:
+        template: A laminate, or a sequence of laminae, providing the fiber,
+            resin, fiber weight, angle and fiber volume fraction of every ply.
+        vf: Sequence of fiber volume fractions, used for all plies.
+        angles: Sequence of stackings; every stacking is a sequence with an
+            angle for every ply of the template.
+        fiber_weight: Sequence of fiber weights in g/m², used for all plies.
+        repeat: Sequence of the number of times the stacking is repeated.
+        processes: Number of worker processes. The default 1 evaluates
+            the grid in the calling process; None means the number of CPUs.
+            A script that uses more than one process must only call this
+            function under an ``if __name__ == "__main__":`` guard, because
+            on Windows and macOS the worker processes import the script.
+        chunksize: Number of laminates in a chunk.
+
+    Returns:
+        An iterator of SimpleNamespace, one per chunk, in grid order. Every
+        one contains the arrays index (position in the grid), vf and
+        fiber_weight (the parameters, or NaN for the template values), angles
+        (index in the angles axis, or -1 for the template angles), repeat,
+        and the laminate properties Ex, Ey, Gxy, νxy, αx, αy, thickness and
+        weight (fiber plus resin in g/m²). Only a few chunks are in memory at
+        the same time.
+    """
+    plies = tuple(
+        (la.fiber, la.resin, la.fiber_weight, la.angle, la.vf)
+        for la in getattr(template, "layers", template)
+    )
+    if not plies:
+        raise ValueError("no layers in the template")
+    if chunksize < 1:
+        raise ValueError("chunksize must be >0")
+    angles = [None] if angles is None else [tuple(a) for a in angles]
+    if any(a is not None and len(a) != len(plies) for a in angles):
+        raise ValueError("every stacking needs an angle for every ply")
+    axes = (
+        [None] if vf is None else list(vf),
+        list(range(len(angles))) if angles != [None] else [-1],
+        [None] if fiber_weight is None else list(fiber_weight),
+        [1] if repeat is None else [int(r) for r in repeat],
+    )
+    if any(r < 1 for r in axes[3]):
+        raise ValueError("repeat must be >0")
+    grid = enumerate(itertools.product(*axes))
+    chunks = iter(lambda: list(itertools.islice(grid, chunksize)), [])
+    return _run(_sweep_chunk, (plies, angles), chunks, processes)
+
+
+def montecarlo(
+    template,
+    distributions,
+    n,
+    seed=None,
+    percentiles=(5, 50, 95),
+    processes=1,
+    chunksize=1024,
+):
+    """
+    Propagate the scatter of fiber and resin properties to the laminate
+    properties.
+
+    Arguments:
+        template: A laminate, or a sequence of laminae.
+        distributions: A dict. The keys are tuples (name, property), where
+            name is the name of a fiber or resin in the template, and property
+            is E1, ν12, α1 or ρ for a fiber or E, ν, α or ρ for a resin. The
+            values are either a number; the standard deviation relative to
+            the value in the template, or a tuple ("normal", mean, sd) or
+            ("uniform", low, high). Samples of moduli and densities that are
+            not positive are drawn again.
+        n: The number of samples.
+        seed: Seed for the random number generator. The samples only
+            depend on the seed, not on the number of processes or the
+            chunksize.
+        percentiles: The percentiles to calculate.
+        processes: Number of worker processes. The default 1 evaluates
+            the samples in the calling process; None means the number of CPUs.
+            A script that uses more than one process must only call this
+            function under an ``if __name__ == "__main__":`` guard, because
+            on Windows and macOS the worker processes import the script.
+        chunksize: Number of samples in a chunk. With the "numpy" backend
+            the samples of a chunk are evaluated together, as arrays.
+
+    Returns:
+        A SimpleNamespace with n and for each of Ex, Ey, Ez, Gxy, Gxz, Gyz,
+        νxy, νyx, αx, αy, ρ, thickness and weight a SimpleNamespace with mean,
+        std (sample standard deviation), min, max and percentiles; a dict of
+        the requested percentiles.
+    """
+    layers = tuple(getattr(template, "layers", template))
+    if not layers:
+        raise ValueError("no layers in the template")
+    if n < 1:
+        raise ValueError("the number of samples must be >0")
+    if chunksize < 1:
+        raise ValueError("chunksize must be >0")
+    materials = list(dict.fromkeys(m for la in layers for m in (la.fiber, la.resin)))
+    index = {m: j for j, m in enumerate(materials)}
+    specs = [
+        (index[la.fiber], index[la.resin], la.fiber_weight, la.angle, la.vf)
+        for la in layers
+    ]
+    # Identical plies are only calculated once per sample.
+    unique = list(dict.fromkeys(specs))
+    plies = (tuple(unique), tuple(unique.index(p) for p in specs))
+    samplers = []
+    for (name, prop), spec in distributions.items():
+        found = False
+        for mi, m in enumerate(materials):
+            if m.name == name and prop in _inputs(m):
+                samplers.append((mi, prop, _distribution(spec, getattr(m, prop))))
+                found = True
+        if not found:
+            raise ValueError(f"no fiber or resin property {prop} of '{name}'")
+    rng = random.Random(seed)
+
+    def chunks():
+        for start in range(0, n, chunksize):
+            yield [
+                tuple(_sample(rng, d, prop) for _, prop, d in samplers)
+                for _ in range(min(chunksize, n - start))
+            ]
+
+    keys = tuple((mi, prop) for mi, prop, _ in samplers)
+    values = {name: array("d") for name in _STATISTICS}
+    func = _montecarlo_stack if get_backend() == "numpy" else _montecarlo_chunk
+    for rv in _run(func, (materials, plies, keys), chunks(), processes):
+        for name, column in values.items():
+            column.extend(getattr(rv, name))
+    return SimpleNamespace(
+        n=n, **{name: _statistics(v, percentiles) for name, v in values.items()}
+    )
+
+
+def _sweep_chunk(args, points):
+    """Evaluate the grid points of a chunk; runs in a worker process."""
+    plies, angles = args
+    rv = _columns()
+    rv.index, rv.angles, rv.repeat = array("l"), array("l"), array("l")
+    rv.vf, rv.fiber_weight = array("d"), array("d")
+    for index, (vf, ai, fw, repeat) in points:
+        stacking = angles[ai] if ai >= 0 else [p[3] for p in plies]
+        layers = [
+            lamina_cache.lamina(
+                f, r, pfw if fw is None else fw, a, pvf if vf is None else vf
+            )
+            for (f, r, pfw, _, pvf), a in zip(plies, stacking)
+        ]
+        lam = laminate("sweep", layers * repeat)
+        rv.index.append(index)
+        rv.vf.append(math.nan if vf is None else vf)
+        rv.fiber_weight.append(math.nan if fw is None else fw)
+        rv.angles.append(ai)
+        rv.repeat.append(repeat)
+        _append(rv, lam)
+    return rv
+
+
+def _montecarlo_chunk(args, samples):
+    """Evaluate the samples of a chunk; runs in a worker process."""
+    materials, plies, keys = args
+    rv = _columns(_STATISTICS)
+    for sample in samples:
+        props = [
+            {p: getattr(m, p) for p in _inputs(m)}
+            for m in materials
+        ]
+        for (mi, prop), v in zip(keys, sample):
+            props[mi][prop] = v
+        mats = [
+            (fiber if isinstance(m, Fiber) else resin)(**p, name=m.name)
+            for m, p in zip(materials, props)
+        ]
+        unique, order = plies
+        # The sampled materials are only used once, so they are kept out of
+        # the memo of ply_material() and out of lamina_cache.
+        plymats = {}
+        built = []
+        for f, r, fw, a, vf in unique:
+            if (f, r, vf) not in plymats:
+                plymats[f, r, vf] = PlyMaterial(mats[f], mats[r], vf)
+            built.append(_lamina(plymats[f, r, vf], fw, a))
+        lam = laminate("montecarlo", [built[j] for j in order])
+        _append(rv, lam)
+        rv.Ez.append(lam.Ez)
+        rv.Gxz.append(lam.Gxz)
+        rv.Gyz.append(lam.Gyz)
+        rv.νyx.append(lam.νyx)
+        rv.ρ.append(lam.ρ)
+    return rv
+
+
+def _montecarlo_stack(args, samples):
+    """
+    Evaluate the samples of a chunk at once with NumPy arrays; runs in a
+    worker process.
+
+    The micromechanics, the rotation of the plies and the integration over
+    the thickness are done for all samples of the chunk together, and the
+    ABD matrices are inverted with inv_stack. Only the properties in
+    _STATISTICS are calculated.
+    """
+    from . import npmatrix as npm
+
+    np = npm.np
+    materials, plies, keys = args
+    props = [
+        {p: np.full(len(samples), float(getattr(m, p))) for p in _inputs(m)}
+        for m in materials
+    ]
+    for (mi, prop), column in zip(keys, zip(*samples)):
+        props[mi][prop] = np.array(column)
+    mats = [SimpleNamespace(**p) for p in props]
+    unique, order = plies
+    built = []
+    for f, r, fw, a, vf in unique:
+        fb, rs = mats[f], mats[r]
+        p = _micromechanics(fb, rs, vf)
+        t = fw / (fb.ρ * 1000) * (1 + p.vm / vf)
+        θ = math.radians(a)
+        m, n = math.cos(θ), math.sin(θ)
+        # Qstar (Qs) according to Barbero:2018, p. 167
+        Q̅s44 = p.Qs44 * m * m + p.Qs55 * n * n
+        Q̅s55 = p.Qs44 * n * n + p.Qs55 * m * m
+        built.append(
+            SimpleNamespace(
+                thickness=t,
+                fiber_weight=fw,
+                resin_weight=t * p.vm * rs.ρ * 1000,
+                ρ=p.ρ,
+                E3=p.E3,
+                α=_alphabar(p.α1, p.α2, m, n),
+                Q̅=npm.qbar_stack(p.Q11, p.Q12, p.Q22, p.Q66, a),
+                Q̅s=(Q̅s44, (Q̅s55 - Q̅s44) * n * m, Q̅s55),
+            )
+        )
+    layers = [built[j] for j in order]
+    thickness = sum(la.thickness for la in layers)
+    # Like Laminate._zcoords, a symmetric stack is integrated over its upper
+    # half.
+    symmetric = order == order[::-1]
+    if symmetric:
+        half = layers[len(layers) // 2:]
+        ts = [la.thickness for la in half]
+        if len(layers) % 2:
+            ts[0] = ts[0] / 2
+        stack, mult, zs = tuple(zip(half, ts)), 2.0, 0.0
+    else:
+        stack = tuple((la, la.thickness) for la in layers)
+        mult, zs = 1.0, -thickness / 2
+    A, B, D = np.zeros((3, 6, len(samples)))
+    Nt, H = np.zeros((3, len(samples))), np.zeros((3, len(samples)))
+    c3 = 0.0
+    for la, t in stack:
+        ze = zs + t
+        z2 = (ze * ze - zs * zs) / 2
+        z3 = (ze * ze * ze - zs * zs * zs) / 3
+        zs = ze
+        Q̅ = np.array(la.Q̅)
+        A += Q̅ * t
+        B += Q̅ * z2
+        D += Q̅ * z3
+        # Hyer:1998, p. 445
+        Q̅11, Q̅12, Q̅16, Q̅22, Q̅26, Q̅66 = la.Q̅
+        αx, αy, αxy = la.α
+        Nt += np.array(
+            (
+                Q̅11 * αx + Q̅12 * αy + Q̅16 * αxy,
+                Q̅12 * αx + Q̅22 * αy + Q̅26 * αxy,
+                Q̅16 * αx + Q̅26 * αy + Q̅66 * αxy,
+            )
+        ) * t
+        # Barbero:2018, p. 181
+        H += np.array(la.Q̅s) * (5 / 4 * (t - 4 * z3 / thickness ** 2))
+        c3 = c3 + t / la.E3
+    A, D, Nt, H, c3 = mult * A, mult * D, mult * Nt, mult * H, mult * c3
+    if symmetric:
+        # B is 0, and only the A part of abd is used.
+        abd = npm.inv_stack(npm.clean_inplace(_symmetric3(A)))
+    else:
+        ABD = np.block(
+            [[_symmetric3(A), _symmetric3(B)], [_symmetric3(B), _symmetric3(D)]]
+        )
+        abd = npm.inv_stack(npm.clean_inplace(ABD))
+    a11, a12, a22, a33 = abd[:, 0, 0], abd[:, 0, 1], abd[:, 1, 1], abd[:, 2, 2]
+    return SimpleNamespace(
+        Ex=array("d", 1 / (a11 * thickness)),
+        Ey=array("d", 1 / (a22 * thickness)),
+        Gxy=array("d", 1 / (a33 * thickness)),
+        νxy=array("d", -abd[:, 1, 0] / a11),
+        νyx=array("d", -a12 / a22),
+        αx=array("d", np.einsum("nj,jn->n", abd[:, 0, :3], Nt)),
+        αy=array("d", np.einsum("nj,jn->n", abd[:, 1, :3], Nt)),
+        thickness=array("d", thickness),
+        weight=array(
+            "d", sum(la.fiber_weight + la.resin_weight for la in layers)
+        ),
+        Ez=array("d", thickness / c3),
+        Gxz=array("d", H[2] / thickness),
+        Gyz=array("d", H[0] / thickness),
+        ρ=array("d", sum(la.ρ * la.thickness for la in layers) / thickness),
+    )
+
+
+def _symmetric3(q):
+    """
+    Return the (N, 3, 3) stack of symmetric matrices from the (6, N) array q
+    of their components 11, 12, 16, 22, 26 and 66.
+    """
+    return q.T[:, (0, 1, 2, 1, 3, 4, 2, 4, 5)].reshape(-1, 3, 3)
+
+
+def _inputs(m):
+    """Return the names of the input properties of a fiber or resin."""
+    return _FIBER_INPUTS if isinstance(m, Fiber) else _RESIN_INPUTS
+
+
+def _distribution(spec, value):
+    """Convert a distribution specification to a tuple (kind, a, b)."""
+    if isinstance(spec, (int, float)):
+        return ("normal", value, abs(spec * value))
+    kind, a, b = spec
+    if kind not in ("normal", "uniform"):
+        raise ValueError(f"unknown distribution '{kind}'")
+    return (kind, float(a), float(b))
+
+
+def _sample(rng, distribution, prop):
+    """Draw a sample for the property prop from a distribution."""
+    kind, a, b = distribution
+    draw = rng.gauss if kind == "normal" else rng.uniform
+    while True:
+        v = draw(a, b)
+        if v > 0 or prop not in _POSITIVE:
+            return v
+
+
+def _statistics(values, percentiles):
+    """Return the mean, standard deviation, extremes and percentiles."""
+    n = len(values)
+    mean = math.fsum(values) / n
+    std = 0.0
+    if n > 1:
+        std = math.sqrt(math.fsum((v - mean) ** 2 for v in values) / (n - 1))
+    ordered = sorted(values)
+    rv = {}
+    for p in percentiles:
+        # Linear interpolation between the closest ranks.
+        x = (n - 1) * p / 100
+        lo = math.floor(x)
+        hi = min(lo + 1, n - 1)
+        rv[p] = ordered[lo] + (ordered[hi] - ordered[lo]) * (x - lo)
+    return SimpleNamespace(
+        mean=mean, std=std, min=ordered[0], max=ordered[-1], percentiles=rv
+    )
+
+
+def _columns(names=_PROPERTIES):
+    """Return a SimpleNamespace with an empty array for every name."""
+    return SimpleNamespace(**{n: array("d") for n in names})
+
+
+def _append(rv, lam):
+    """Append the properties of the laminate lam to the columns in rv."""
+    rv.Ex.append(lam.Ex)
+    rv.Ey.append(lam.Ey)
+    rv.Gxy.append(lam.Gxy)
+    rv.νxy.append(lam.νxy)
+    rv.αx.append(lam.αx)
+    rv.αy.append(lam.αy)
+    rv.thickness.append(lam.thickness)
+    rv.weight.append(lam.fiber_weight + lam.resin_weight)
+
+
+def _run(func, args, chunks, processes):
+    """
+    Yield func(args, chunk) for every chunk, in order.
+
+    With more than one process the chunks are evaluated in a pool, with at
+    most two chunks per process submitted at a time.
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes < 2:
+        for chunk in chunks:
+            yield func(args, chunk)
+        return
+    with multiprocessing.Pool(processes) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.apply_async(func, (args, chunk)))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
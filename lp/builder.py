@@ -0,0 +1,430 @@
+# file: builder.py
+# vim:fileencoding=utf-8:ft=python:fdm=marker
+#
+# Copyright © 2026 R.F. Smith <rsmith@xs4all.nl>. All rights reserved.
+# SPDX-License-Identifier: BSD-2-Clause
+# Created: 2026-10-18T13:05:41+0200
+# Last modified: 2026-10-18T14:21:07+0200
+"""
+Incremental construction of laminates.
+
+A LaminateBuilder keeps the sums over its plies that laminate() integrates;
+the ABD and H matrices, the thermal stress resultants, the 3D stiffness and
+the weights. Changing a ply only updates these sums, so it does not require
+integrating the whole stack again.
+
+The zones of a tapered part, where plies of a master stacking are dropped,
+are calculated by zones() from prefix sums over the master stacking.
+
+The moments of Q̅ are kept with respect to the bottom of the stack. That way
+adding or removing a ply at the top does not move the other plies. The
+moments with respect to the mid-plane follow from them when needed.
+"""
+
+from .core import lamina_cache, laminate
+import lp.core as core
+
+# The components of Q̅ and Q̅s whose zeroth, first and second moments are kept.
+_MOMENTS = ("Q̅11", "Q̅12", "Q̅16", "Q̅22", "Q̅26", "Q̅66", "Q̅s44", "Q̅s45", "Q̅s55")
+
+# Number of the other sums; see _values.
+_SUMS = 45
+
+# Entries of ABD and H smaller than _RESIDUE times the largest entry of their
+# block (scaled to the same dimension) are regarded as rounding errors from
+# updating the sums, and set to 0.
+_RESIDUE = 1e-12
+
+
+class _Sums:
+    """
+    Base class for stacks that calculate the laminate properties from the
+    sums over their plies.
+
+    Subclasses keep the moments of Q̅ and Q̅s in _m0, _m1 and _m2 (with
+    respect to the bottom of the stack) and the other sums in _sums. They
+    clear the calculated properties in _props when the sums change.
+    """
+
+    __slots__ = ("_m0", "_m1", "_m2", "_sums", "_props")
+
+    def __getattr__(self, name):
+        # Only called for names that are not in __slots__.
+        try:
+            group = _SUMS_GROUPS[name]
+        except KeyError:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            ) from None
+        props = self._props
+        if name not in props:
+            # An AttributeError keeps hasattr() and getattr() with a default
+            # working on an empty stack.
+            if not len(self):
+                raise AttributeError("no layers in the laminate")
+            group(self)
+        return props[name]
+
+    def _clear(self):
+        """Set all sums to 0."""
+        self._m0 = [0.0] * len(_MOMENTS)
+        self._m1 = [0.0] * len(_MOMENTS)
+        self._m2 = [0.0] * len(_MOMENTS)
+        self._sums = [0.0] * _SUMS
+        self._props = {}
+
+    def _midplane(self):
+        """
+        Return the zeroth, first and second moments of Q̅ and Q̅s with
+        respect to the mid-plane.
+        """
+        h = self._sums[0] / 2
+        m0, m1, m2 = self._m0, self._m1, self._m2
+        b = [m1[k] - h * m0[k] for k in range(len(m0))]
+        d = [m2[k] - 2 * h * m1[k] + h * h * m0[k] for k in range(len(m0))]
+        return m0, b, d
+
+    def _physical(self):
+        """Calculate thickness, weights and fractions."""
+        T, fw, rw, ρt, vft = self._sums[:5]
+        self._props.update(core._physical_properties(T, fw, rw, ρt, vft))
+
+    def _inplane(self):
+        """Calculate the ABD matrix, its inverse and the in-plane properties."""
+        T = self._sums[0]
+        a, b, d = self._midplane()
+        scale = _RESIDUE * max(abs(v) for v in a[:6])
+        A11, A12, A16, A22, A26, A66 = _residue(a[:6], scale)
+        B11, B12, B16, B22, B26, B66 = _residue(b[:6], scale * T)
+        D11, D12, D16, D22, D26, D66 = _residue(d[:6], scale * T * T)
+        lpm = core.lpm
+        ABD = lpm.clean(
+            [
+                [A11, A12, A16, B11, B12, B16],
+                [A12, A22, A26, B12, B22, B26],
+                [A16, A26, A66, B16, B26, B66],
+                [B11, B12, B16, D11, D12, D16],
+                [B12, B22, B26, D12, D22, D26],
+                [B16, B26, B66, D16, D26, D66],
+            ]
+        )
+        self._props.update(core._inplane_properties(ABD, lpm.inv_block(ABD), T))
+
+    def _transverse(self):
+        """Calculate the transverse shear stiffness H and Ez."""
+        T, c3 = self._sums[0], self._sums[5]
+        a, _, d = self._midplane()
+        # Derived from Barbero:2018, p. 181, see Laminate._transverse.
+        H44, H45, H55 = (5 / 4 * (a[k] - 4 * d[k] / T ** 2) for k in (6, 7, 8))
+        H44, H45, H55 = _residue((H44, H45, H55), _RESIDUE * max(H44, H55))
+        H = core.lpm.clean([[H44, H45], [H45, H55]])
+        self._props.update(core._transverse_properties(H, c3, T))
+
+    def _thermal(self):
+        """Calculate the thermal stress resultants and the CTEs."""
+        Nt = tuple(self._sums[6:9])
+        self._props.update(core._thermal_properties(Nt, self.abd))
+
+    def _stiffness(self):
+        """Calculate the 3D stiffness and compliance and derived properties."""
+        T, Ct = self._sums[0], self._sums[9:]
+        C = core.lpm.matrix([[c / T for c in Ct[r:r + 6]] for r in range(0, 36, 6)])
+        core.lpm.clean_inplace(C)
+        self._props.update(core._stiffness_properties(C))
+
+
+# Which method of _Sums calculates which (group of) properties.
+_SUMS_GROUPS = {}
+for _group, _names in (
+    (_Sums._physical, "thickness fiber_weight ρ vf resin_weight wf"),
+    (_Sums._stiffness, "C S tEx tEy tEz tGxy tGyz tGxz tνxy tνxz tνyz"),
+    (_Sums._inplane, "ABD abd Ex Ey Gxy νxy νyx"),
+    (_Sums._transverse, "H h Gyz Gxz Ez"),
+    (_Sums._thermal, "Nt αx αy"),
+):
+    _SUMS_GROUPS.update(dict.fromkeys(_names.split(), _group))
+del _group, _names
+
+
+class LaminateBuilder(_Sums):
+    """
+    Mutable stack of laminae with lazily calculated laminate properties.
+
+    Appending or removing the top ply, replacing a ply by one of the same
+    thickness and changing the angle of a ply take constant time. Operations
+    that change the thickness below other plies shift those plies, which
+    costs a few additions per shifted ply; no laminae are recalculated.
+
+    The properties of laminate() (apart from name, layers and symmetric) are
+    available as attributes. They are calculated in groups when first used
+    after a change. They are equal to those of laminate() within rounding
+    errors; use the laminate method to create the laminate itself.
+
+    Arguments:
+        layers: A sequence of lamina to start with.
+    """
+
+    __slots__ = ("_layers", "_z")
+
+    def __init__(self, layers=()):
+        self._layers = []
+        self._z = []
+        self.refresh(layers)
+
+    def __len__(self):
+        return len(self._layers)
+
+    def __getitem__(self, index):
+        return self._layers[index]
+
+    def __setitem__(self, index, la):
+        """Replace the ply at index by the lamina la."""
+        index = self._index(index)
+        old = self._layers[index]
+        z = self._z[index]
+        self._update(old, z, -1.0)
+        self._shift(index + 1, la.thickness - old.thickness)
+        self._layers[index] = la
+        self._update(la, z, 1.0)
+
+    @property
+    def layers(self):
+        """The current layers, as a tuple."""
+        return tuple(self._layers)
+
+    def append(self, la):
+        """Add the lamina la to the top of the stack."""
+        self._layers.append(la)
+        self._z.append(self._sums[0])
+        self._update(la, self._sums[0], 1.0)
+
+    def insert(self, index, la):
+        """Insert the lamina la before the ply at index."""
+        n = len(self._layers)
+        if index < 0:
+            index = max(n + index, 0)
+        if index >= n:
+            self.append(la)
+            return
+        z = self._z[index]
+        self._shift(index, la.thickness)
+        self._layers.insert(index, la)
+        self._z.insert(index, z)
+        self._update(la, z, 1.0)
+
+    def pop(self, index=-1):
+        """Remove the ply at index and return it."""
+        index = self._index(index)
+        la = self._layers.pop(index)
+        z = self._z.pop(index)
+        self._update(la, z, -1.0)
+        self._shift(index, -la.thickness)
+        return la
+
+    def swap(self, i, j):
+        """Exchange the plies at i and j."""
+        a, b = self._layers[i], self._layers[j]
+        self[i] = b
+        self[j] = a
+
+    def reangle(self, index, angle):
+        """Change the angle of the ply at index."""
+        la = self._layers[index]
+        self[index] = lamina_cache.lamina(
+            la.fiber, la.resin, la.fiber_weight, angle, la.vf
+        )
+
+    def refresh(self, layers=None):
+        """
+        Calculate the sums over the plies from scratch, discarding the
+        rounding errors accumulated by the updates.
+
+        Arguments:
+            layers: If given, replace the plies by these layers.
+        """
+        if layers is None:
+            layers = self._layers
+        layers = list(layers)
+        self._layers, self._z = [], []
+        self._clear()
+        for la in layers:
+            self.append(la)
+
+    def laminate(self, name, symmetric=None):
+        """Create a laminate from the current layers; see lp.core.laminate."""
+        return laminate(name, self._layers, symmetric)
+
+    def _index(self, index):
+        """Return index as a non-negative number, or raise IndexError."""
+        n = len(self._layers)
+        if not -n <= index < n:
+            raise IndexError("ply index out of range")
+        return index % n
+
+    def _update(self, la, z, sign):
+        """Add (sign 1) or subtract (sign -1) the ply la with its bottom at z."""
+        w0, w1, w2 = _weights(la.thickness, z)
+        w0, w1, w2 = sign * w0, sign * w1, sign * w2
+        m0, m1, m2 = self._m0, self._m1, self._m2
+        for k, name in enumerate(_MOMENTS):
+            q = getattr(la, name)
+            m0[k] += q * w0
+            m1[k] += q * w1
+            m2[k] += q * w2
+        sums = self._sums
+        for k, v in enumerate(_values(la)):
+            sums[k] += sign * v
+        self._props = {}
+
+    def _shift(self, start, dz):
+        """Move the plies from start upwards by dz."""
+        if not dz or start >= len(self._layers):
+            return
+        a0 = [0.0] * len(_MOMENTS)
+        a1 = [0.0] * len(_MOMENTS)
+        z = self._z
+        for j in range(start, len(self._layers)):
+            la = self._layers[j]
+            t = la.thickness
+            w1 = t * (z[j] + t / 2)
+            for k, name in enumerate(_MOMENTS):
+                q = getattr(la, name)
+                a0[k] += q * t
+                a1[k] += q * w1
+            z[j] += dz
+        _move(self._m1, self._m2, a0, a1, dz)
+
+
+class Zone(_Sums):
+    """
+    A zone of a tapered laminate; see zones().
+
+    The properties of laminate() (apart from name and symmetric) are
+    available as attributes, and are calculated in groups when first used.
+
+    Properties:
+        layers: The laminae in this zone, as a tuple.
+    """
+
+    __slots__ = ("layers",)
+
+    def __init__(self, layers):
+        self.layers = tuple(layers)
+        self._clear()
+
+    def __len__(self):
+        return len(self.layers)
+
+    def laminate(self, name, symmetric=None):
+        """Create a laminate from the layers; see lp.core.laminate."""
+        return laminate(name, self.layers, symmetric)
+
+
+def zones(master, drops):
+    """
+    Calculate the zones of a tapered laminate.
+
+    Every zone consists of the plies of the master stacking minus some
+    dropped plies. The contributions of the plies to the sums that
+    laminate() integrates are calculated once, and summed cumulatively over
+    the master stacking. The sums for a zone then follow from the
+    differences of those prefix sums between the dropped plies, with the
+    plies above a drop moved down by the dropped thickness. So the cost of a
+    zone depends on the number of dropped plies, not the number of plies.
+
+    Arguments:
+        master: A non-empty sequence of laminae; the full stacking.
+        drops: A sequence of drop patterns. Every pattern is an iterable of
+            indices into master of the plies that are absent in that zone.
+
+    Returns:
+        A list of Zone, one for every drop pattern.
+    """
+    master = tuple(master)
+    n = len(master)
+    if not n:
+        raise ValueError("no layers in the laminate")
+    nm = len(_MOMENTS)
+    # Prefix sums; p[j] is the sum over the plies before j.
+    p0, p1, p2, pv = [[0.0] * nm], [[0.0] * nm], [[0.0] * nm], [[0.0] * _SUMS]
+    z = 0.0
+    for la in master:
+        w0, w1, w2 = _weights(la.thickness, z)
+        q = [getattr(la, name) for name in _MOMENTS]
+        p0.append([s + c * w0 for s, c in zip(p0[-1], q)])
+        p1.append([s + c * w1 for s, c in zip(p1[-1], q)])
+        p2.append([s + c * w2 for s, c in zip(p2[-1], q)])
+        pv.append([s + v for s, v in zip(pv[-1], _values(la))])
+        z += la.thickness
+    rv = []
+    for pattern in drops:
+        dropped = sorted(set(pattern))
+        if dropped and (dropped[0] < 0 or dropped[-1] >= n):
+            raise ValueError("ply index out of range")
+        drop = set(dropped)
+        zone = Zone(la for j, la in enumerate(master) if j not in drop)
+        m0, m1, m2, sums = zone._m0, zone._m1, zone._m2, zone._sums
+        start, dz = 0, 0.0
+        for end in dropped + [n]:
+            if end > start:
+                a0 = [e - s for s, e in zip(p0[start], p0[end])]
+                a1 = [e - s for s, e in zip(p1[start], p1[end])]
+                for k in range(nm):
+                    m0[k] += a0[k]
+                    m1[k] += p1[end][k] - p1[start][k]
+                    m2[k] += p2[end][k] - p2[start][k]
+                _move(m1, m2, a0, a1, dz)
+                for k in range(_SUMS):
+                    sums[k] += pv[end][k] - pv[start][k]
+            if end < n:
+                dz -= master[end].thickness
+            start = end + 1
+        rv.append(zone)
+    return rv
+
+
+def _weights(t, z):
+    """Return ∫z⁰, ∫z¹ and ∫z² over a ply of thickness t with its bottom at z."""
+    ze = z + t
+    return t, (ze * ze - z * z) / 2, (ze * ze * ze - z * z * z) / 3
+
+
+def _values(la):
+    """
+    Return the contribution of the lamina la to the other sums: thickness,
+    fiber_weight, resin_weight, ρ·t, vf·t, t/E3, Nt (3) and C·t (36).
+    """
+    t = la.thickness
+    αx, αy, αxy = la.αx, la.αy, la.αxy
+    # Hyer:1998, p. 445
+    rv = [
+        t,
+        la.fiber_weight,
+        la.resin_weight,
+        la.ρ * t,
+        la.vf * t,
+        t / la.E3,
+        (la.Q̅11 * αx + la.Q̅12 * αy + la.Q̅16 * αxy) * t,
+        (la.Q̅12 * αx + la.Q̅22 * αy + la.Q̅26 * αxy) * t,
+        (la.Q̅16 * αx + la.Q̅26 * αy + la.Q̅66 * αxy) * t,
+    ]
+    rv.extend(c * t for row in la.C for c in row)
+    return rv
+
+
+def _move(m1, m2, a0, a1, dz):
+    """
+    Update the first and second moments m1 and m2 for moving plies with
+    zeroth and first moments a0 and a1 by dz.
+    """
+    if not dz:
+        return
+    # ∫(z+dz)ⁿ follows from ∫z⁰, ∫z¹ and ∫z².
+    for k in range(len(m1)):
+        m1[k] += dz * a0[k]
+        m2[k] += 2 * dz * a1[k] + dz * dz * a0[k]
+
+
+def _residue(values, limit):
+    """Return values with numbers smaller than abs(limit) set to 0."""
+    return [0.0 if abs(v) < limit else v for v in values]
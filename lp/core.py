@@ -82,13 +82,476 @@ The following references were used in coding this module:
   number =       {Reference Publication 1351}
 }
 """
+from array import array
+from collections import OrderedDict
 from types import SimpleNamespace
+import importlib
 import math
+import numbers
+import operator
 import lp.matrix as lpm
 
+# Available matrix backends, and the module implementing them.
+_BACKENDS = {"python": "lp.matrix", "numpy": "lp.npmatrix"}
+_backend = "python"
+# Memoized PlyMaterial instances, see ply_material().
+_plies = {}
+_PLIES_MAX = 1024
+
+
+def set_backend(name):
+    """Select the module used for matrix calculations.
+
+    Arguments:
+        name (str): Either "python" (the default, lp.matrix) or "numpy"
+            (lp.npmatrix, which requires NumPy).
+
+    Matrices in laminae and laminates that were created before the switch
+    keep the type of the backend they were created with.
+    """
+    global lpm, _backend
+    if name not in _BACKENDS:
+        raise ValueError(f"unknown backend '{name}'")
+    lpm = importlib.import_module(_BACKENDS[name])
+    _backend = name
+    _plies.clear()
+    lamina_cache.clear()
+
+
+def get_backend():
+    """Return the name of the current matrix backend."""
+    return _backend
+
+
+class _Record:
+    """
+    Base class for immutable records.
+
+    Subclasses list their properties in __slots__, and the names of the
+    properties that identify a record in _key. Equality and the hash are
+    based on those properties only; the others are derived from them.
+    """
+
+    __slots__ = ()
+    _key = ()
+
+    def __init__(self, **kwargs):
+        self._set(**kwargs)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return self._identity() == other._identity()
+
+    def __hash__(self):
+        return hash(self._identity())
+
+    def __repr__(self):
+        args = ", ".join(f"{n}={getattr(self, n)!r}" for n in self._key)
+        return f"{type(self).__name__}({args})"
+
+    def __reduce__(self):
+        state = {}
+        for n in self.__slots__:
+            try:
+                state[n] = object.__getattribute__(self, n)
+            except AttributeError:
+                pass
+        return (_restore, (type(self), state))
+
+    def _identity(self):
+        return tuple(getattr(self, n) for n in self._key)
+
+    def _set(self, **kwargs):
+        for name, value in kwargs.items():
+            object.__setattr__(self, name, value)
+
+
+def _restore(cls, state):
+    """Recreate a record when unpickling."""
+    return cls(**state)
+
+
+class Fiber(_Record):
+    """Fiber properties; see fiber()."""
+
+    __slots__ = ("E1", "ν12", "α1", "ρ", "name")
+    _key = __slots__
+
+
+class Resin(_Record):
+    """Resin properties; see resin()."""
+
+    __slots__ = ("E", "ν", "α", "ρ", "name")
+    _key = __slots__
+
+
+class Strength(_Record):
+    """Strengths of a unidirectional ply; see strength()."""
+
+    __slots__ = ("Xt", "Xc", "Yt", "Yc", "S", "name")
+    _key = __slots__
+
+
+class Lamina(_Record):
+    """Properties of a lamina; see lamina()."""
+
+    __slots__ = (
+        "fiber",
+        "resin",
+        "fiber_weight",
+        "angle",
+        "vf",
+        "thickness",
+        "resin_weight",
+        "E1",
+        "E2",
+        "E3",
+        "G12",
+        "G13",
+        "G23",
+        "ν12",
+        "ν13",
+        "ν23",
+        "αx",
+        "αy",
+        "αxy",
+        "Q̅11",
+        "Q̅12",
+        "Q̅16",
+        "Q̅22",
+        "Q̅26",
+        "Q̅66",
+        "Q̅s44",
+        "Q̅s55",
+        "Q̅s45",
+        "ρ",
+        "C",
+        "ply",
+    )
+    _key = ("fiber", "resin", "fiber_weight", "angle", "vf")
+
+
+class Laminate(_Record):
+    """
+    Properties of a laminate; see laminate().
+
+    Apart from the name and the layers, the properties are calculated in
+    groups when one of them is first used, and then kept.
+    """
+
+    __slots__ = (
+        "name",
+        "layers",
+        "symmetric",
+        "strengths",
+        "thickness",
+        "fiber_weight",
+        "ρ",
+        "vf",
+        "resin_weight",
+        "wf",
+        "ABD",
+        "abd",
+        "H",
+        "h",
+        "Ex",
+        "Ey",
+        "Ez",
+        "Gxy",
+        "Gyz",
+        "Gxz",
+        "νxy",
+        "νyx",
+        "Nt",
+        "αx",
+        "αy",
+        "C",
+        "S",
+        "tEx",
+        "tEy",
+        "tEz",
+        "tGxy",
+        "tGyz",
+        "tGxz",
+        "tνxy",
+        "tνxz",
+        "tνyz",
+        "_plies",
+        "_mult",
+        "_lz2",
+        "_lz3",
+    )
+    _key = ("name", "layers")
+
+    def __getattr__(self, name):
+        # Only called for properties that have not been set yet.
+        try:
+            group = _LAMINATE_GROUPS[name]
+        except KeyError:
+            raise AttributeError(
+                f"'Laminate' object has no attribute '{name}'"
+            ) from None
+        group(self)
+        return object.__getattribute__(self, name)
+
+    def _physical(self):
+        """Calculate thickness, weights and fractions."""
+        layers = self.layers
+        self._set(
+            **_physical_properties(
+                sum(la.thickness for la in layers),
+                sum(la.fiber_weight for la in layers),
+                sum(la.resin_weight for la in layers),
+                sum(la.ρ * la.thickness for la in layers),
+                sum(la.vf * la.thickness for la in layers),
+            )
+        )
+
+    def _zcoords(self):
+        """
+        Determine the plies to integrate over, and calculate their
+        z-integrals (z²/2 and z³/3).
+
+        For a symmetric laminate only the upper half of the stack is used,
+        starting at z=0, and the sums are doubled afterwards. A ply in the
+        middle of an odd number of plies then counts with half its thickness.
+        """
+        layers = self.layers
+        if self.symmetric:
+            n = len(layers)
+            half = layers[n // 2:]
+            ts = [la.thickness for la in half]
+            if n % 2:
+                ts[0] /= 2
+            plies, mult, zs = tuple(zip(half, ts)), 2.0, 0.0
+        else:
+            plies = tuple((la, la.thickness) for la in layers)
+            mult, zs = 1.0, -self.thickness / 2
+        lz2, lz3 = [], []
+        for la, t in plies:
+            ze = zs + t
+            lz2.append((ze * ze - zs * zs) / 2)
+            lz3.append((ze * ze * ze - zs * zs * zs) / 3)
+            zs = ze
+        self._set(_plies=plies, _mult=mult, _lz2=lz2, _lz3=lz3)
+
+    def _stiffness(self):
+        """Calculate the 3D stiffness and compliance and derived properties."""
+        thickness, mult = self.thickness, self._mult
+        C = lpm.zeros(6)
+        for la, t in self._plies:
+            lpm.axpy(mult * t / thickness, la.C, C)
+        lpm.clean_inplace(C)
+        self._set(**_stiffness_properties(C))
+
+    def _inplane(self):
+        """Calculate the ABD matrix, its inverse and the in-plane properties."""
+        if self.symmetric:
+            self._inplane_symmetric()
+            return
+        thickness = self.thickness
+        # Unique components of the A, B and D submatrices of ABD.
+        A11, A12, A16, A22, A26, A66 = 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+        B11, B12, B16, B22, B26, B66 = 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+        D11, D12, D16, D22, D26, D66 = 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+        for (la, t), z2, z3 in zip(self._plies, self._lz2, self._lz3):
+            # Hyer:1998, p. 290
+            A11 += la.Q̅11 * t
+            A12 += la.Q̅12 * t
+            A16 += la.Q̅16 * t
+            A22 += la.Q̅22 * t
+            A26 += la.Q̅26 * t
+            A66 += la.Q̅66 * t
+            B11 += la.Q̅11 * z2
+            B12 += la.Q̅12 * z2
+            B16 += la.Q̅16 * z2
+            B22 += la.Q̅22 * z2
+            B26 += la.Q̅26 * z2
+            B66 += la.Q̅66 * z2
+            D11 += la.Q̅11 * z3
+            D12 += la.Q̅12 * z3
+            D16 += la.Q̅16 * z3
+            D22 += la.Q̅22 * z3
+            D26 += la.Q̅26 * z3
+            D66 += la.Q̅66 * z3
+        # Finish the matrix, discarding very small numbers.
+        ABD = lpm.clean(
+            [
+                [A11, A12, A16, B11, B12, B16],
+                [A12, A22, A26, B12, B22, B26],
+                [A16, A26, A66, B16, B26, B66],
+                [B11, B12, B16, D11, D12, D16],
+                [B12, B22, B26, D12, D22, D26],
+                [B16, B26, B66, D16, D26, D66],
+            ]
+        )
+        self._set(**_inplane_properties(ABD, lpm.inv_block(ABD), thickness))
+
+    def _inplane_symmetric(self):
+        """
+        Calculate the ABD matrix, its inverse and the in-plane properties of
+        a symmetric laminate.
+
+        Since B is 0, the A and D submatrices are inverted separately.
+        """
+        thickness, mult = self.thickness, self._mult
+        A11, A12, A16, A22, A26, A66 = 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+        D11, D12, D16, D22, D26, D66 = 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+        for (la, t), z3 in zip(self._plies, self._lz3):
+            # Hyer:1998, p. 290
+            A11 += la.Q̅11 * t
+            A12 += la.Q̅12 * t
+            A16 += la.Q̅16 * t
+            A22 += la.Q̅22 * t
+            A26 += la.Q̅26 * t
+            A66 += la.Q̅66 * t
+            D11 += la.Q̅11 * z3
+            D12 += la.Q̅12 * z3
+            D16 += la.Q̅16 * z3
+            D22 += la.Q̅22 * z3
+            D26 += la.Q̅26 * z3
+            D66 += la.Q̅66 * z3
+        # Finish the matrices, discarding very small numbers.
+        A = lpm.mul([[A11, A12, A16], [A12, A22, A26], [A16, A26, A66]], mult)
+        lpm.clean_inplace(A)
+        D = lpm.mul([[D11, D12, D16], [D12, D22, D26], [D16, D26, D66]], mult)
+        lpm.clean_inplace(D)
+        Z = lpm.zeros(3)
+        ABD = lpm.block(A, Z, Z, D)
+        abd = lpm.block(lpm.inv(A), Z, Z, lpm.inv(D))
+        self._set(**_inplane_properties(ABD, abd, thickness))
+
+    def _transverse(self):
+        """Calculate the transverse shear stiffness H and Ez."""
+        thickness, mult = self.thickness, self._mult
+        H44, H45, H55 = 0.0, 0.0, 0.0
+        c3 = 0
+        for (la, t), z3 in zip(self._plies, self._lz3):
+            # Calculate H matrix (derived from Barbero:2018, p. 181)
+            sb = 5 / 4 * (t - 4 * z3 / thickness ** 2)
+            H44 += la.Q̅s44 * sb
+            H45 += la.Q̅s45 * sb
+            H55 += la.Q̅s55 * sb
+            # Calculate E3
+            c3 += t / la.E3
+        H44, H45, H55, c3 = mult * H44, mult * H45, mult * H55, mult * c3
+        H = lpm.clean([[H44, H45], [H45, H55]])
+        self._set(**_transverse_properties(H, c3, thickness))
+
+    def _thermal(self):
+        """Calculate the thermal stress resultants and the CTEs."""
+        Ntx, Nty, Ntxy = 0.0, 0.0, 0.0
+        for la, t in self._plies:
+            # Calculate unit thermal stress resultants.
+            # Hyer:1998, p. 445
+            Ntx += (la.Q̅11 * la.αx + la.Q̅12 * la.αy + la.Q̅16 * la.αxy) * t
+            Nty += (la.Q̅12 * la.αx + la.Q̅22 * la.αy + la.Q̅26 * la.αxy) * t
+            Ntxy += (la.Q̅16 * la.αx + la.Q̅26 * la.αy + la.Q̅66 * la.αxy) * t
+        mult = self._mult
+        Nt = (mult * Ntx, mult * Nty, mult * Ntxy)
+        self._set(**_thermal_properties(Nt, self.abd))
+
+
+# Which method of Laminate calculates which (group of) properties.
+_LAMINATE_GROUPS = {}
+for _group, _names in (
+    (Laminate._physical, "thickness fiber_weight ρ vf resin_weight wf"),
+    (Laminate._zcoords, "_plies _mult _lz2 _lz3"),
+    (Laminate._stiffness, "C S tEx tEy tEz tGxy tGyz tGxz tνxy tνxz tνyz"),
+    (Laminate._inplane, "ABD abd Ex Ey Gxy νxy νyx"),
+    (Laminate._transverse, "H h Gyz Gxz Ez"),
+    (Laminate._thermal, "Nt αx αy"),
+):
+    _LAMINATE_GROUPS.update(dict.fromkeys(_names.split(), _group))
+del _group, _names
+
+
+# The following functions calculate the properties of a laminate from the
+# sums over its plies. They return a dict of property names and values.
+
+
+def _physical_properties(thickness, fiber_weight, resin_weight, ρt, vft):
+    """Calculate the physical properties from the summed ply properties."""
+    return dict(
+        thickness=thickness,
+        fiber_weight=fiber_weight,
+        ρ=ρt / thickness,
+        vf=vft / thickness,
+        resin_weight=resin_weight,
+        wf=fiber_weight / (fiber_weight + resin_weight),
+    )
+
+
+def _stiffness_properties(C):
+    """Calculate the compliance and the tensor engineering properties."""
+    S = lpm.inv(C)
+    return dict(
+        C=C,
+        S=S,
+        tEx=1 / S[0][0],
+        tEy=1 / S[1][1],
+        tEz=1 / S[2][2],
+        tGxy=1 / S[5][5],
+        tGxz=1 / S[4][4],
+        tGyz=1 / S[3][3],
+        tνxy=-S[1][0] / S[0][0],
+        tνxz=-S[2][0] / S[0][0],
+        tνyz=-S[2][1] / S[1][1],
+    )
+
+
+def _inplane_properties(ABD, abd, thickness):
+    """Calculate the in-plane engineering properties from ABD and abd."""
+    # Nettles:1994, p. 34 e.v., with the determinant ratios written as
+    # elements of the inverse.
+    return dict(
+        ABD=ABD,
+        abd=abd,
+        Ex=1 / (abd[0][0] * thickness),
+        Ey=1 / (abd[1][1] * thickness),
+        Gxy=1 / (abd[2][2] * thickness),
+        νxy=-abd[1][0] / abd[0][0],
+        νyx=-abd[0][1] / abd[1][1],
+    )
+
+
+def _transverse_properties(H, c3, thickness):
+    """
+    Calculate the transverse properties from the transverse shear stiffness
+    H and the sum c3 of the ply thicknesses divided by E3.
+    """
+    return dict(
+        H=H,
+        h=lpm.inv(H),
+        # See Barbero:2018, p. 197
+        Gyz=H[0][0] / thickness,
+        Gxz=H[1][1] / thickness,
+        # All layers experience the same force in Z-direction.
+        Ez=thickness / c3,
+    )
+
+
+def _thermal_properties(Nt, abd):
+    """Calculate the CTEs from the unit thermal stress resultants Nt."""
+    Ntx, Nty, Ntxy = Nt
+    # *Technically* only valid for a symmetric laminate!
+    # Hyer:1998, p. 451, (11.86)
+    return dict(
+        Nt=Nt,
+        αx=abd[0][0] * Ntx + abd[0][1] * Nty + abd[0][2] * Ntxy,
+        αy=abd[1][0] * Ntx + abd[1][1] * Nty + abd[1][2] * Ntxy,
+    )
+
 
 def fiber(E1, ν12, α1, ρ, name):
-    """Create a fiber as a SimpleNamespace.
+    """Create a Fiber.
 
     The arguments with subscript "1" are in the length direction of the fiber.
 
@@ -110,11 +573,11 @@ def fiber(E1, ν12, α1, ρ, name):
         raise ValueError("fiber ρ must be > 0")
     if not isinstance(name, str) and not len(name) > 0:
         raise ValueError("fiber name must be a non-empty string")
-    return SimpleNamespace(E1=E1, ν12=ν12, α1=α1, ρ=ρ, name=name)
+    return Fiber(E1=E1, ν12=ν12, α1=α1, ρ=ρ, name=name)
 
 
 def resin(E, ν, α, ρ, name):
-    """Create a resin as a SimpleNamespace.
+    """Create a Resin.
 
     Arguments/properties of a Resin:
         E (float): Young's modulus in MPa. Must be >0.
@@ -135,53 +598,171 @@ def resin(E, ν, α, ρ, name):
         raise ValueError("resin ρ must be > 0")
     if not isinstance(name, str) and not len(name) > 0:
         raise ValueError("resin name must be a non-empty string")
-    return SimpleNamespace(E=E, ν=ν, α=α, ρ=ρ, name=name)
+    return Resin(E=E, ν=ν, α=α, ρ=ρ, name=name)
 
 
-def lamina(fiber, resin, fiber_weight, angle, vf):
-    """Create a lamina of unidirectional fibers in resin.
-    This can be considered as a transversely isotropic material.
+def strength(Xt, Xc, Yt, Yc, S, name):
+    """Create a Strength.
+
+    The strengths are those of a unidirectional ply, in its own coordinate
+    system. Compressive strengths are given as positive numbers.
 
     Arguments:
-        fiber: The Fiber used in the lamina
-        resin: The Resin binding the lamina
-        fiber_weight: The amount of Fibers in g/m². Must be >0.
-        angle: Orientation of the layer in degrees counterclockwise from the
-            x-axis.
-        vf: Fiber volume fraction.
+        Xt (float): Tensile strength in the fiber direction in MPa.
+        Xc (float): Compressive strength in the fiber direction in MPa.
+        Yt (float): Tensile strength transverse to the fibers in MPa.
+        Yc (float): Compressive strength transverse to the fibers in MPa.
+        S (float): In-plane shear strength in MPa.
+        name (str): Name of the fiber of the plies these strengths apply to.
 
-    Additional generated properties:
-        thickness: Thickness of the lamina in mm.
-        resin_weight: The amount of Resin in g/m².
-        E1: Young's modulus of the lamina in the fiber direction in MPa.
-        E2: Young's modulus of the lamina perpendicular to the fiber direction
-            in MPa.
-        G12: In-plane shear modulus in MPa.
-        ν12: in-plane Poisson's constant.
-        αx: CTE in x direction in K⁻¹.
-        αy: CTE in y direction in K⁻¹.
-        αxy: CTE in shear.
-        Q̅11: Transformed lamina stiffness matrix component.
-        Q̅12: Transformed lamina stiffness matrix component.
-        Q̅16: Transformed lamina stiffness matrix component.
-        Q̅22: Transformed lamina stiffness matrix component.
-        Q̅26: Transformed lamina stiffness matrix component.
-        Q̅66: Transformed lamina stiffness matrix component.
+    All strengths must be > 0.
+    """
+    values = tuple(float(v) for v in (Xt, Xc, Yt, Yc, S))
+    if min(values) <= 0:
+        raise ValueError("strengths must be > 0")
+    if not isinstance(name, str) or not name:
+        raise ValueError("strength name must be a non-empty string")
+    Xt, Xc, Yt, Yc, S = values
+    return Strength(Xt=Xt, Xc=Xc, Yt=Yt, Yc=Yc, S=S, name=name)
+
+
+class PlyMaterial:
+    """
+    Properties of a unidirectional lamina that do not depend on its angle.
+
+    These are calculated once for a combination of fiber, resin and fiber
+    volume fraction. Use ply_material() to get a memoized instance, and the
+    rotate method for the angle-dependent properties.
+
+    Properties:
+        fiber: The Fiber used in the lamina.
+        resin: The Resin binding the lamina.
+        vf: Fiber volume fraction, as a fraction.
+        vm: Resin volume fraction.
+        E1, E2, E3: Young's moduli in lamina coordinates in MPa.
+        G12, G23: Shear moduli in lamina coordinates in MPa.
+        ν12, ν13, ν23: Poisson's constants.
+        α1, α2: CTEs in and perpendicular to the fiber direction in K⁻¹.
+        Q11, Q12, Q22, Q66: Reduced stiffnesses in lamina coordinates.
+        Qs44, Qs55: Transverse shear stiffnesses in lamina coordinates.
         ρ: Specific gravity of the lamina in g/cm³.
-        S: 3D stiffness matrix for the lamina in global coordinates.
+        Cp: 3D stiffness matrix in lamina coordinates.
+    """
+
+    __slots__ = (
+        "fiber",
+        "resin",
+        "vf",
+        "vm",
+        "E1",
+        "E2",
+        "E3",
+        "G12",
+        "G23",
+        "ν12",
+        "ν13",
+        "ν23",
+        "α1",
+        "α2",
+        "Q11",
+        "Q12",
+        "Q22",
+        "Q66",
+        "Qs44",
+        "Qs55",
+        "ρ",
+        "Cp",
+    )
+
+    def __init__(self, fiber, resin, vf):
+        self.fiber = fiber
+        self.resin = resin
+        self.vf = vf
+        m = _micromechanics(fiber, resin, vf)
+        E1, E2, E3, G12, G23 = m.E1, m.E2, m.E3, m.G12, m.G23
+        ν12, ν13, ν23 = m.ν12, m.ν13, m.ν23
+        G13 = G12
+        # Calculate the 3D stiffness matrix for this lamina
+        # Note about terminology: in the literature, the stiffness matrix is
+        # generally named C, while its inverse the compliance matrix is called S.
+        # This is confusing IMO, but I will follow convention here for the sake of
+        # clarity.
+        # First, the compliance matrix in lamina coordinates
+        Sp = [
+            [1 / E1, -ν12 / E1, -ν13 / E1, 0, 0, 0],
+            [-ν12 / E1, 1 / E2, -ν23 / E2, 0, 0, 0],
+            [-ν13 / E1, -ν23 / E2, 1 / E3, 0, 0, 0],
+            [0, 0, 0, 1 / G23, 0, 0],
+            [0, 0, 0, 0, 1 / G13, 0],
+            [0, 0, 0, 0, 0, 1 / G12],
+        ]
+        # Invert it to the stiffness matrix in lamina coordinates
+        self.Cp = lpm.inv(Sp)
+        self.vm = m.vm
+        self.E1, self.E2, self.E3 = E1, E2, E3
+        self.G12, self.G23 = G12, G23
+        self.ν12, self.ν13, self.ν23 = ν12, ν13, ν23
+        self.α1, self.α2 = m.α1, m.α2
+        self.Q11, self.Q12, self.Q22, self.Q66 = m.Q11, m.Q12, m.Q22, m.Q66
+        self.Qs44, self.Qs55 = m.Qs44, m.Qs55
+        self.ρ = m.ρ
+
+    def rotate(self, angle):
+        """
+        Calculate the properties of a lamina of this material that depend on
+        its angle.
+
+        Arguments:
+            angle: Orientation of the layer in degrees counterclockwise from
+                the x-axis.
+
+        Returns:
+            A SimpleNamespace with the CTEs, Q̅ and Q̅s components and the 3D
+            stiffness matrix C in global coordinates.
+        """
+        a = math.radians(float(angle))
+        m, n = math.cos(a), math.sin(a)
+        # Convert to global coordinates.
+        C = rotate_stiffness(self.Cp, angle)
+        m2, n2 = m * m, n * n
+        αx, αy, αxy = _alphabar(self.α1, self.α2, m, n)
+        Q̅11, Q̅12, Q̅16, Q̅22, Q̅26, Q̅66 = _qbar(
+            self.Q11, self.Q12, self.Q22, self.Q66, m, n
+        )
+        # Qstar (Qs) according to Barbero:2018, p. 167
+        Q̅s44 = self.Qs44 * m2 + self.Qs55 * n2
+        Q̅s55 = self.Qs44 * n2 + self.Qs55 * m2
+        Q̅s45 = (Q̅s55 - Q̅s44) * n * m
+        return SimpleNamespace(
+            αx=αx,
+            αy=αy,
+            αxy=αxy,
+            Q̅11=Q̅11,
+            Q̅12=Q̅12,
+            Q̅16=Q̅16,
+            Q̅22=Q̅22,
+            Q̅26=Q̅26,
+            Q̅66=Q̅66,
+            Q̅s44=Q̅s44,
+            Q̅s45=Q̅s45,
+            Q̅s55=Q̅s55,
+            C=C,
+        )
+
+
+def _micromechanics(fiber, resin, vf):
+    """
+    Calculate the properties of a unidirectional ply from those of its fiber
+    and resin.
+
+    The properties of fiber and resin and vf can be numbers, or NumPy arrays
+    for evaluating many plies at once.
+
+    Returns:
+        A SimpleNamespace with vm, E1, E2, E3, G12, G23, ν12, ν13, ν23, α1, α2,
+        Q11, Q12, Q22, Q66, Qs44, Qs55 and ρ; see PlyMaterial.
     """
-    fiber_weight = float(fiber_weight)
-    if fiber_weight <= 0:
-        raise ValueError("fiber weight cannot be <=0!")
-    vf = float(vf)
-    if 1.0 < vf <= 100.0:
-        vf = vf / 100.0
-    elif not 0.0 <= vf <= 1.0:
-        raise ValueError("vf must be in the ranges 0.0-1.0 or 1.0-100.0")
     vm = 1.0 - vf
-    fiber_thickness = fiber_weight / (fiber.ρ * 1000)
-    thickness = fiber_thickness * (1 + vm / vf)
-    resin_weight = thickness * vm * resin.ρ * 1000  # Resin [g/m²]
     E1 = vf * fiber.E1 + resin.E * vm  # Hyer:1998, p. 115, (3.32)
     # As of version 2020-12-22, use the Halpin-Tsai formula for E2.
     ζ = 2  # Assume fibers with a round cross-section.
@@ -193,7 +774,6 @@ def lamina(fiber, resin, fiber_weight, angle, vf):
     # The matrix-dominated cylindrical assemblage model is used for G12.
     Gm = resin.E / (2 * (1 + resin.ν))
     G12 = Gm * (1 + vf) / (1 - vf)
-    G13 = G12
     ν21 = ν12 * E2 / E1  # Nettles:1994, p. 4
     # Calculate G23, necessary for Qs44.
     Kf = fiber.E1 / (3 * (1 - 2 * fiber.ν12))
@@ -201,98 +781,372 @@ def lamina(fiber, resin, fiber_weight, angle, vf):
     K = 1 / (vf / Kf + vm / Km)
     ν23 = 1 - ν21 - E2 / (3 * K)
     G23 = E2 / (2 * (1 + ν23))  # Barbero:2008, p. 23, Barbero:2018, p. 504
-    a = math.radians(float(angle))
-    m, n = math.cos(a), math.sin(a)
-    # Calculate the 3D stiffness matrix for this lamina
-    # Note about terminology: in the literature, the stiffness matrix is
-    # generally named C, while its inverse the compliance matrix is called S.
-    # This is confusing IMO, but I will follow convention here for the sake of
-    # clarity.
-    # First, the compliance matrix in lamina coordinates
-    Sp = [
-        [1 / E1, -ν12 / E1, -ν13 / E1, 0, 0, 0],
-        [-ν12 / E1, 1 / E2, -ν23 / E2, 0, 0, 0],
-        [-ν13 / E1, -ν23 / E2, 1 / E3, 0, 0, 0],
-        [0, 0, 0, 1 / G23, 0, 0],
-        [0, 0, 0, 0, 1 / G13, 0],
-        [0, 0, 0, 0, 0, 1 / G12],
-    ]
-    # Invert it to the stiffness matrix in lamina coordinates
-    Cp = lpm.inv(Sp)
-    # Convert to global coordinates.
-    Tbar = tbar(angle)
-    C = lpm.matmul(lpm.matmul(lpm.transp(Tbar), Cp), Tbar)
-    # The powers of the sine and cosine are often used later.
-    m2 = m * m
-    m3, m4 = m2 * m, m2 * m2
-    n2 = n * n
-    n3, n4 = n2 * n, n2 * n2
     α1 = (fiber.α1 * fiber.E1 * vf + resin.α * resin.E * vm) / E1
     α2 = resin.α  # This is not 100% accurate, but simple.
-    αx = α1 * m2 + α2 * n2
-    αy = α1 * n2 + α2 * m2
-    αxy = 2 * (α1 - α2) * m * n
     # Barbero:2018, p. 159
     denum = 1 - ν12 * ν21
     Q11, Q12 = E1 / denum, ν12 * E2 / denum
     Q22, Q66 = E2 / denum, G12
     Qs44 = G23
     Qs55 = G12  # Assuming transverse isotropy.
-    # Q̅ according to Hyer:1997, p. 182
-    Q̅11 = Q11 * m4 + 2 * (Q12 + 2 * Q66) * n2 * m2 + Q22 * n4
-    QA = Q11 - Q12 - 2 * Q66
-    QB = Q12 - Q22 + 2 * Q66
-    Q̅12 = (Q11 + Q22 - 4 * Q66) * n2 * m2 + Q12 * (n4 + m4)
-    Q̅16 = QA * n * m3 + QB * n3 * m
-    Q̅22 = Q11 * n4 + 2 * (Q12 + 2 * Q66) * n2 * m2 + Q22 * m4
-    Q̅26 = QA * n3 * m + QB * n * m3
-    Q̅66 = (Q11 + Q22 - 2 * Q12 - 2 * Q66) * n2 * m2 + Q66 * (n4 + m4)
-    # Qstar (Qs) according to Barbero:2018, p. 167
-    Q̅s44 = Qs44 * m2 + Qs55 * n2
-    Q̅s55 = Qs44 * n2 + Qs55 * m2
-    Q̅s45 = (Q̅s55 - Q̅s44) * n * m
     # Calculate density
     ρ = fiber.ρ * vf + resin.ρ * vm
     return SimpleNamespace(
-        fiber=fiber,
-        resin=resin,
-        fiber_weight=fiber_weight,
-        angle=angle,
-        vf=vf,
-        thickness=thickness,
-        resin_weight=resin_weight,
+        vm=vm,
         E1=E1,
         E2=E2,
         E3=E3,
         G12=G12,
-        G13=G12,
         G23=G23,
         ν12=ν12,
         ν13=ν13,
         ν23=ν23,
-        αx=αx,
-        αy=αy,
-        αxy=αxy,
-        Q̅11=Q̅11,
-        Q̅12=Q̅12,
-        Q̅16=Q̅16,
-        Q̅22=Q̅22,
-        Q̅26=Q̅26,
-        Q̅66=Q̅66,
-        Q̅s44=Q̅s44,
-        Q̅s55=Q̅s55,
-        Q̅s45=Q̅s45,
+        α1=α1,
+        α2=α2,
+        Q11=Q11,
+        Q12=Q12,
+        Q22=Q22,
+        Q66=Q66,
+        Qs44=Qs44,
+        Qs55=Qs55,
         ρ=ρ,
+    )
+
+
+def _ply_dvf(p):
+    """
+    Calculate the derivatives of Q11, Q12, Q22, Q66 and α1 of the
+    PlyMaterial p with respect to its fiber volume fraction.
+    """
+    fiber, resin, vf = p.fiber, p.resin, p.vf
+    # Differentiated versions of the formulas in PlyMaterial.__init__.
+    ζ = 2
+    η = (fiber.E1 / resin.E - 1) / (fiber.E1 / resin.E + ζ)
+    dE1 = fiber.E1 - resin.E
+    dE2 = resin.E * η * (1 + ζ) / (1 - η * vf) ** 2
+    dν12 = fiber.ν12 - resin.ν
+    Gm = resin.E / (2 * (1 + resin.ν))
+    dG12 = 2 * Gm / (1 - vf) ** 2
+    E1, E2, ν12 = p.E1, p.E2, p.ν12
+    ν21 = ν12 * E2 / E1
+    dν21 = (dν12 * E2 + ν12 * dE2) / E1 - ν12 * E2 * dE1 / E1 ** 2
+    denum = 1 - ν12 * ν21
+    ddenum = -(dν12 * ν21 + ν12 * dν21)
+    dQ11 = (dE1 * denum - E1 * ddenum) / denum ** 2
+    dQ12 = ((dν12 * E2 + ν12 * dE2) * denum - ν12 * E2 * ddenum) / denum ** 2
+    dQ22 = (dE2 * denum - E2 * ddenum) / denum ** 2
+    dα1 = (fiber.α1 * fiber.E1 - resin.α * resin.E - p.α1 * dE1) / E1
+    return dQ11, dQ12, dQ22, dG12, dα1
+
+
+def ply_material(fiber, resin, vf):
+    """Return the PlyMaterial for a fiber, resin and fiber volume fraction.
+
+    Instances are memoized by the values of the fiber and resin properties
+    and the fiber volume fraction, so plies of the same fabric at different
+    angles share the micromechanics and the 6×6 inversion.
+
+    Arguments:
+        fiber: The Fiber used in the lamina
+        resin: The Resin binding the lamina
+        vf: Fiber volume fraction, as a fraction or a percentage.
+    """
+    vf = _fraction(vf)
+    key = _materials_key(fiber, resin) + (vf,)
+    try:
+        return _plies[key]
+    except KeyError:
+        pass
+    if len(_plies) >= _PLIES_MAX:
+        # Cached laminae would otherwise no longer share their PlyMaterial
+        # with new laminae of the same material.
+        _plies.clear()
+        lamina_cache.clear()
+    rv = PlyMaterial(fiber, resin, vf)
+    _plies[key] = rv
+    return rv
+
+
+def lamina(fiber, resin, fiber_weight, angle, vf):
+    """Create a lamina of unidirectional fibers in resin.
+    This can be considered as a transversely isotropic material.
+
+    Arguments:
+        fiber: The Fiber used in the lamina
+        resin: The Resin binding the lamina
+        fiber_weight: The amount of Fibers in g/m². Must be >0.
+        angle: Orientation of the layer in degrees counterclockwise from the
+            x-axis.
+        vf: Fiber volume fraction.
+
+    Additional generated properties:
+        thickness: Thickness of the lamina in mm.
+        resin_weight: The amount of Resin in g/m².
+        E1: Young's modulus of the lamina in the fiber direction in MPa.
+        E2: Young's modulus of the lamina perpendicular to the fiber direction
+            in MPa.
+        G12: In-plane shear modulus in MPa.
+        ν12: in-plane Poisson's constant.
+        αx: CTE in x direction in K⁻¹.
+        αy: CTE in y direction in K⁻¹.
+        αxy: CTE in shear.
+        Q̅11: Transformed lamina stiffness matrix component.
+        Q̅12: Transformed lamina stiffness matrix component.
+        Q̅16: Transformed lamina stiffness matrix component.
+        Q̅22: Transformed lamina stiffness matrix component.
+        Q̅26: Transformed lamina stiffness matrix component.
+        Q̅66: Transformed lamina stiffness matrix component.
+        ρ: Specific gravity of the lamina in g/cm³.
+        S: 3D stiffness matrix for the lamina in global coordinates.
+    """
+    return _lamina(ply_material(fiber, resin, vf), fiber_weight, angle)
+
+
+def _lamina(p, fiber_weight, angle):
+    """Create a lamina from a PlyMaterial; see lamina()."""
+    fiber_weight = float(fiber_weight)
+    if fiber_weight <= 0:
+        raise ValueError("fiber weight cannot be <=0!")
+    fiber, resin, vf = p.fiber, p.resin, p.vf
+    fiber_thickness = fiber_weight / (fiber.ρ * 1000)
+    thickness = fiber_thickness * (1 + p.vm / vf)
+    resin_weight = thickness * p.vm * resin.ρ * 1000  # Resin [g/m²]
+    r = p.rotate(angle)
+    return Lamina(
+        fiber=fiber,
+        resin=resin,
+        fiber_weight=fiber_weight,
+        angle=angle,
+        vf=vf,
+        thickness=thickness,
+        resin_weight=resin_weight,
+        E1=p.E1,
+        E2=p.E2,
+        E3=p.E3,
+        G12=p.G12,
+        G13=p.G12,
+        G23=p.G23,
+        ν12=p.ν12,
+        ν13=p.ν13,
+        ν23=p.ν23,
+        αx=r.αx,
+        αy=r.αy,
+        αxy=r.αxy,
+        Q̅11=r.Q̅11,
+        Q̅12=r.Q̅12,
+        Q̅16=r.Q̅16,
+        Q̅22=r.Q̅22,
+        Q̅26=r.Q̅26,
+        Q̅66=r.Q̅66,
+        Q̅s44=r.Q̅s44,
+        Q̅s55=r.Q̅s55,
+        Q̅s45=r.Q̅s45,
+        ρ=p.ρ,
+        C=r.C,
+        ply=p,
+    )
+
+
+def lamina_batch(fiber, resin, fiber_weight, angles, vfs):
+    """Create many laminae of the same fiber and resin at once.
+
+    Arguments:
+        fiber: The Fiber used in the laminae.
+        resin: The Resin binding the laminae.
+        fiber_weight: Amount of fibers in g/m², a number or a sequence.
+        angles: Orientation(s) of the layers in degrees, a number or a sequence.
+        vfs: Fiber volume fraction(s), a number or a sequence.
+
+    The sequences must all have the same length; numbers are used for every
+    lamina. The micromechanics and the 3D stiffness matrix in lamina
+    coordinates are shared between laminae through ply_material(). With the
+    "numpy" backend the angle-dependent properties of all laminae are
+    calculated at once with the stack routines of lp.npmatrix.
+
+    Returns:
+        A SimpleNamespace with properties fiber, resin and size (the number
+        of laminae), the arrays fiber_weight, angle, vf, thickness,
+        resin_weight, E1, E2, G12, ν12, αx, αy, αxy, Q̅11, Q̅12, Q̅16, Q̅22,
+        Q̅26, Q̅66, Q̅s44, Q̅s45, Q̅s55 and ρ, and the tuple C of 3D stiffness
+        matrices in global coordinates. Element j of every array belongs to
+        the same lamina.
+    """
+    fiber_weight, angles, vfs = _broadcast(fiber_weight, angles, vfs)
+    fiber_weight = array("d", fiber_weight)
+    if any(fw <= 0 for fw in fiber_weight):
+        raise ValueError("fiber weight cannot be <=0!")
+    vfs = array("d", [_fraction(vf) for vf in vfs])
+    ps = [ply_material(fiber, resin, vf) for vf in vfs]
+    if _backend == "numpy":
+        rotated, C = _rotate_stack(ps, angles)
+    else:
+        rs = [p.rotate(angle) for p, angle in zip(ps, angles)]
+        rotated = {name: [getattr(r, name) for r in rs] for name in _ROTATED}
+        C = tuple(r.C for r in rs)
+    fρ = fiber.ρ * 1000
+    thickness = array(
+        "d", [fw / fρ * (1 + p.vm / vf) for fw, p, vf in zip(fiber_weight, ps, vfs)]
+    )
+    rv = SimpleNamespace(
+        fiber=fiber,
+        resin=resin,
+        size=len(vfs),
+        fiber_weight=fiber_weight,
+        angle=array("d", angles),
+        vf=vfs,
+        thickness=thickness,
+        resin_weight=array(
+            "d", [t * p.vm * resin.ρ * 1000 for t, p in zip(thickness, ps)]
+        ),
         C=C,
     )
+    for name in ("E1", "E2", "G12", "ν12", "ρ"):
+        setattr(rv, name, array("d", [getattr(p, name) for p in ps]))
+    for name in _ROTATED:
+        setattr(rv, name, array("d", rotated[name]))
+    return rv
+
+
+def _rotate_stack(ps, angles):
+    """
+    Calculate the angle-dependent properties of many laminae at once with the
+    stack routines of lp.npmatrix.
 
+    Arguments:
+        ps: Sequence of the PlyMaterial of every lamina.
+        angles: Sequence of the orientation of every lamina in degrees.
 
-def laminate(name, layers):
+    Returns:
+        A dict with an array for every name in _ROTATED, and the tuple of 3D
+        stiffness matrices in global coordinates.
+    """
+    np = lpm.np
+    θ = np.asarray(angles, dtype=float)
+    a = np.radians(θ)
+    m, n = np.cos(a), np.sin(a)
+    m2, n2 = m * m, n * n
+    Q11, Q12, Q22, Q66, Qs44, Qs55, α1, α2 = (
+        np.array([getattr(p, name) for p in ps])
+        for name in ("Q11", "Q12", "Q22", "Q66", "Qs44", "Qs55", "α1", "α2")
+    )
+    rv = dict(zip(_ROTATED[:3], _alphabar(α1, α2, m, n)))
+    rv.update(zip(_ROTATED[3:9], lpm.qbar_stack(Q11, Q12, Q22, Q66, θ)))
+    # Qstar (Qs) according to Barbero:2018, p. 167
+    Q̅s44 = Qs44 * m2 + Qs55 * n2
+    Q̅s55 = Qs44 * n2 + Qs55 * m2
+    rv.update(Q̅s44=Q̅s44, Q̅s45=(Q̅s55 - Q̅s44) * n * m, Q̅s55=Q̅s55)
+    # Laminae with the same fiber volume fraction share their PlyMaterial.
+    groups = {}
+    for j, p in enumerate(ps):
+        groups.setdefault(p, []).append(j)
+    C = [None] * len(ps)
+    for p, index in groups.items():
+        stack = lpm.clean_inplace(lpm.rotate_stack(p.Cp, θ[index]))
+        for j, c in zip(index, stack):
+            C[j] = c
+    return rv, tuple(C)
+
+
+class LaminaCache:
+    """
+    Bounded cache of laminae, with least-recently-used eviction.
+
+    Laminae are keyed by the values of the fiber and resin properties, the
+    fiber weight, the angle and the fiber volume fraction. So identical plies
+    in different laminates or files are only calculated once.
+
+    Properties:
+        maxsize: Maximum number of cached laminae. None means unbounded,
+            0 disables the cache.
+        hits: Number of lookups that were found in the cache.
+        misses: Number of lookups that had to create a lamina.
+    """
+
+    __slots__ = ("maxsize", "hits", "misses", "_data")
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def lamina(self, fiber, resin, fiber_weight, angle, vf):
+        """Return a cached lamina, creating it if necessary.
+
+        The arguments are the same as for lp.core.lamina.
+        """
+        key = _materials_key(fiber, resin) + (
+            float(fiber_weight),
+            float(angle),
+            _fraction(vf),
+        )
+        data = self._data
+        try:
+            rv = data[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            data.move_to_end(key)
+            return rv
+        self.misses += 1
+        rv = lamina(fiber, resin, fiber_weight, angle, vf)
+        if self.maxsize is None or self.maxsize > 0:
+            data[key] = rv
+            self._evict()
+        return rv
+
+    def resize(self, maxsize):
+        """Change the maximum size of the cache, evicting laminae if needed."""
+        self.maxsize = maxsize
+        self._evict()
+
+    def info(self):
+        """Return the statistics of the cache as a SimpleNamespace."""
+        return SimpleNamespace(
+            hits=self.hits,
+            misses=self.misses,
+            maxsize=self.maxsize,
+            currsize=len(self._data),
+        )
+
+    def clear(self):
+        """Remove all laminae and reset the statistics."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def _evict(self):
+        """Remove the least recently used laminae above maxsize."""
+        if self.maxsize is None:
+            return
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+# The cache used by the parser.
+lamina_cache = LaminaCache()
+
+
+def laminate(name, layers, symmetric=None, strengths=None):
     """Create a laminate.
 
     Arguments/properties of a laminate:
         name: A non-empty string containing the name of the laminate
         layers: A non-empty sequence of lamina (will be converted into a tuple).
+        symmetric: Whether the stacking is symmetric around the mid-plane.
+            If None (the default), this is determined from the layers. If
+            True, the layers must be symmetric. A symmetric laminate is
+            integrated over half the stack, and A and D are inverted
+            separately because B is 0.
+        strengths: Strengths of the plies; either a Strength for all
+            layers, a dict of Strength keyed by fiber name, or a sequence
+            with a Strength (or None) for every layer. Only used for failure
+            analysis, see lp.failure. Stored as a tuple with a Strength or
+            None for every layer, or None if not given.
 
     Additional properties:
         thickness: Thickness of the laminate in mm.
@@ -311,7 +1165,11 @@ def laminate(name, layers):
         αx: CTE in x-direction.
         αy: CTE in y-direction.
         wf: Fiber weight fraction.
+        Nt: Unit thermal stress resultants (Ntx, Nty, Ntxy).
         C: 3D Stiffness matrix for the laminate in global coordinates.
+
+    The additional properties are calculated in groups (physical, ABD and
+    in-plane, transverse, 3D stiffness and thermal) when they are first used.
     """
     if not layers:
         raise ValueError("no layers in the laminate")
@@ -320,153 +1178,291 @@ def laminate(name, layers):
     if len(name) == 0:
         raise ValueError("the length of the name of a laminate must be >0")
     layers = tuple(layers)
-    thickness = sum(la.thickness for la in layers)
-    fiber_weight = sum(la.fiber_weight for la in layers)
-    ρ = sum(la.ρ * la.thickness for la in layers) / thickness
-    vf = sum(la.vf * la.thickness for la in layers) / thickness
-    resin_weight = sum(la.resin_weight for la in layers)
-    wf = fiber_weight / (fiber_weight + resin_weight)
-    # Set z-values for lamina.
-    zs = -thickness / 2
-    lz2, lz3 = [], []
-    C = lpm.zeros(6)
-    for la in layers:
-        ze = zs + la.thickness
-        lz2.append((ze * ze - zs * zs) / 2)
-        lz3.append((ze * ze * ze - zs * zs * zs) / 3)
-        zs = ze
-        C = lpm.add(C, lpm.mul(la.C, la.thickness / thickness))
-    C = lpm.clean(C)
-    S = lpm.inv(C)
-    Ntx, Nty, Ntxy = 0.0, 0.0, 0.0
-    ABD = lpm.zeros(6)
-    H = lpm.zeros(2)
-    c3 = 0
-    for la, z2, z3 in zip(layers, lz2, lz3):
-        # first row
-        ABD[0][0] += la.Q̅11 * la.thickness  # Hyer:1998, p. 290
-        ABD[0][1] += la.Q̅12 * la.thickness
-        ABD[0][2] += la.Q̅16 * la.thickness
-        ABD[0][3] += la.Q̅11 * z2
-        ABD[0][4] += la.Q̅12 * z2
-        ABD[0][5] += la.Q̅16 * z2
-        # second row
-        ABD[1][0] += la.Q̅12 * la.thickness
-        ABD[1][1] += la.Q̅22 * la.thickness
-        ABD[1][2] += la.Q̅26 * la.thickness
-        ABD[1][3] += la.Q̅12 * z2
-        ABD[1][4] += la.Q̅22 * z2
-        ABD[1][5] += la.Q̅26 * z2
-        # third row
-        ABD[2][0] += la.Q̅16 * la.thickness
-        ABD[2][1] += la.Q̅26 * la.thickness
-        ABD[2][2] += la.Q̅66 * la.thickness
-        ABD[2][3] += la.Q̅16 * z2
-        ABD[2][4] += la.Q̅26 * z2
-        ABD[2][5] += la.Q̅66 * z2
-        # fourth row
-        ABD[3][0] += la.Q̅11 * z2
-        ABD[3][1] += la.Q̅12 * z2
-        ABD[3][2] += la.Q̅16 * z2
-        ABD[3][3] += la.Q̅11 * z3
-        ABD[3][4] += la.Q̅12 * z3
-        ABD[3][5] += la.Q̅16 * z3
-        # fifth row
-        ABD[4][0] += la.Q̅12 * z2
-        ABD[4][1] += la.Q̅22 * z2
-        ABD[4][2] += la.Q̅26 * z2
-        ABD[4][3] += la.Q̅12 * z3
-        ABD[4][4] += la.Q̅22 * z3
-        ABD[4][5] += la.Q̅26 * z3
-        # sixth row
-        ABD[5][0] += la.Q̅16 * z2
-        ABD[5][1] += la.Q̅26 * z2
-        ABD[5][2] += la.Q̅66 * z2
-        ABD[5][3] += la.Q̅16 * z3
-        ABD[5][4] += la.Q̅26 * z3
-        ABD[5][5] += la.Q̅66 * z3
-        # Calculate unit thermal stress resultants.
-        # Hyer:1998, p. 445
-        Ntx += (la.Q̅11 * la.αx + la.Q̅12 * la.αy + la.Q̅16 * la.αxy) * la.thickness
-        Nty += (la.Q̅12 * la.αx + la.Q̅22 * la.αy + la.Q̅26 * la.αxy) * la.thickness
-        Ntxy += (la.Q̅16 * la.αx + la.Q̅26 * la.αy + la.Q̅66 * la.αxy) * la.thickness
-        # Calculate H matrix (derived from Barbero:2018, p. 181)
-        sb = 5 / 4 * (la.thickness - 4 * z3 / thickness ** 2)
-        H[0][0] += la.Q̅s44 * sb
-        H[0][1] += la.Q̅s45 * sb
-        H[1][0] += la.Q̅s45 * sb
-        H[1][1] += la.Q̅s55 * sb
-        # Calculate E3
-        c3 += la.thickness / la.E3
-    # Finish the matrices, discarding very small numbers in ABD and H.
-    ABD = lpm.clean(ABD)
-    H = lpm.clean(H)
-    abd = lpm.inv(ABD)
-    h = lpm.inv(H)
-    # Calculate the engineering properties.
-    # Nettles:1994, p. 34 e.v.
-    dABD = lpm.det(ABD)
-    dt1 = lpm.det(lpm.delete(ABD, 0, 0))
-    Ex = dABD / (dt1 * thickness)
-    dt2 = lpm.det(lpm.delete(ABD, 1, 1))
-    Ey = dABD / (dt2 * thickness)
-    dt3 = lpm.det(lpm.delete(ABD, 2, 2))
-    Gxy = dABD / (dt3 * thickness)
-    dt4 = lpm.det(lpm.delete(ABD, 0, 1))
-    dt5 = lpm.det(lpm.delete(ABD, 1, 0))
-    νxy = dt4 / dt1
-    νyx = dt5 / dt2
-    # See Barbero:2018, p. 197
-    Gyz = H[0][0] / thickness
-    Gxz = H[1][1] / thickness
-    # All layers experience the same force in Z-direction.
-    Ez = thickness / c3
-    # Calculate the coefficients of thermal expansion.
-    # *Technically* only valid for a symmetric laminate!
-    # Hyer:1998, p. 451, (11.86)
-    αx = abd[0][0] * Ntx + abd[0][1] * Nty + abd[0][2] * Ntxy
-    αy = abd[1][0] * Ntx + abd[1][1] * Nty + abd[1][2] * Ntxy
-    # Calculate tensor engineering properties
-    tEx, tEy, tEz = 1 / S[0][0], 1 / S[1][1], 1 / S[2][2]
-    tGxy, tGxz, tGyz = 1 / S[5][5], 1 / S[4][4], 1 / S[3][3]
-    tνxy, tνxz, tνyz = -S[1][0] / S[0][0], -S[2][0] / S[0][0], -S[2][1] / S[1][1]
-    return SimpleNamespace(
+    if symmetric is None:
+        symmetric = layers == layers[::-1]
+    elif symmetric and layers != layers[::-1]:
+        raise ValueError("the layers of a symmetric laminate must be symmetric")
+    return Laminate(
         name=name,
         layers=layers,
-        thickness=thickness,
-        fiber_weight=fiber_weight,
-        ρ=ρ,
-        vf=vf,
-        resin_weight=resin_weight,
-        ABD=ABD,
-        abd=abd,
-        H=H,
-        h=h,
-        Ex=Ex,
-        Ey=Ey,
-        Ez=Ez,
-        Gxy=Gxy,
-        Gyz=Gyz,
-        Gxz=Gxz,
-        νxy=νxy,
-        νyx=νyx,
-        αx=αx,
-        αy=αy,
-        wf=wf,
-        C=C,
-        S=S,
-        tEx=tEx,
-        tEy=tEy,
-        tEz=tEz,
-        tGxy=tGxy,
-        tGyz=tGyz,
-        tGxz=tGxz,
-        tνxy=tνxy,
-        tνxz=tνxz,
-        tνyz=tνyz,
+        symmetric=bool(symmetric),
+        strengths=_strengths(layers, strengths),
+    )
+
+
+def rotate_laminate(lam, degrees):
+    """Rotate a laminate around the z-axis.
+
+    The ABD matrix, its inverse, the thermal stress resultants and the 3D
+    stiffness of lam are transformed; they are not integrated again.
+
+    Arguments:
+        lam: The laminate to rotate.
+        degrees: Rotation angle in degrees counterclockwise.
+
+    Returns:
+        A new laminate with every layer rotated by degrees. The layers come
+        from lamina_cache, so their micromechanics are not repeated. The
+        transverse shear stiffness H is integrated over the rotated layers
+        when it is first used, because Q̅s45 of the layers is not the tensor
+        rotation of Q̅s44 and Q̅s55.
+    """
+    T, Ti = tbar(degrees), tbar(-degrees)
+    # ABD' = Mᵀ·ABD·M, so abd' = M⁻¹·abd·M⁻ᵀ, with M⁻¹ the opposite rotation.
+    Z = lpm.zeros(3)
+    M = lpm.block(_tbar3(T), Z, Z, _tbar3(T))
+    Mi = lpm.block(_tbar3(Ti), Z, Z, _tbar3(Ti))
+    ABD = lpm.clean(lpm.matmul(lpm.transp(M), lpm.matmul(lam.ABD, M)))
+    abd = lpm.clean(lpm.matmul(Mi, lpm.matmul(lam.abd, lpm.transp(Mi))))
+    C = lpm.clean(lpm.matmul(lpm.transp(T), lpm.matmul(lam.C, T)))
+    layers = tuple(
+        lamina_cache.lamina(
+            la.fiber, la.resin, la.fiber_weight, la.angle + degrees, la.vf
+        )
+        for la in lam.layers
+    )
+    rv = Laminate(
+        name=lam.name,
+        layers=layers,
+        symmetric=lam.symmetric,
+        strengths=lam.strengths,
+    )
+    thickness = lam.thickness
+    rv._set(
+        **{n: getattr(lam, n) for n in _PHYSICAL},
+        **_inplane_properties(ABD, abd, thickness),
+        **_thermal_properties(_rotate_nt(lam.Nt, T), abd),
+        **_stiffness_properties(C),
+    )
+    return rv
+
+
+def rotate_laminate_many(lam, angles):
+    """Calculate the in-plane properties of a laminate rotated to several
+    angles around the z-axis.
+
+    Only the A part of abd and the thermal stress resultants are transformed
+    for every angle; no laminae or laminates are created. With the "numpy"
+    backend all angles are transformed at once.
+
+    Arguments:
+        lam: The laminate to rotate.
+        angles: Sequence of rotation angles in degrees counterclockwise.
+
+    Returns:
+        A SimpleNamespace with the arrays angle, Ex, Ey, Gxy, νxy, νyx, αx and
+        αy. Element j of every array belongs to angle j.
+    """
+    thickness, abd, Nt = lam.thickness, lam.abd, lam.Nt
+    a = [[abd[i][j] for j in range(3)] for i in range(3)]
+    rv = SimpleNamespace(angle=array("d", angles))
+    columns = ("Ex", "Ey", "Gxy", "νxy", "νyx", "αx", "αy")
+    if _backend == "numpy":
+        values = _rotate_many_stack(a, Nt, thickness, rv.angle)
+        for name, v in zip(columns, values):
+            setattr(rv, name, array("d", v))
+        return rv
+    for name in columns:
+        setattr(rv, name, array("d"))
+    for degrees in rv.angle:
+        P = _tbar3(tbar(-degrees))
+        # The A part of abd' = P·a·Pᵀ.
+        Pa = [[sum(p[k] * a[k][j] for k in range(3)) for j in range(3)] for p in P]
+        r = [[sum(x * y for x, y in zip(pa, p)) for p in P] for pa in Pa]
+        Ntx, Nty, Ntxy = _rotate_nt(Nt, tbar(degrees))
+        values = (
+            1 / (r[0][0] * thickness),
+            1 / (r[1][1] * thickness),
+            1 / (r[2][2] * thickness),
+            -r[1][0] / r[0][0],
+            -r[0][1] / r[1][1],
+            r[0][0] * Ntx + r[0][1] * Nty + r[0][2] * Ntxy,
+            r[1][0] * Ntx + r[1][1] * Nty + r[1][2] * Ntxy,
+        )
+        for name, v in zip(columns, values):
+            getattr(rv, name).append(v)
+    return rv
+
+
+def _rotate_many_stack(a, Nt, thickness, angles):
+    """
+    Calculate the columns of rotate_laminate_many for all angles at once with
+    the stack routines of lp.npmatrix.
+
+    Arguments:
+        a: The A part of abd.
+        Nt: The thermal stress resultants.
+        thickness: Thickness of the laminate.
+        angles: Sequence of rotation angles in degrees counterclockwise.
+
+    Returns:
+        A tuple of the arrays Ex, Ey, Gxy, νxy, νyx, αx and αy.
+    """
+    np = lpm.np
+    θ = np.asarray(angles, dtype=float)
+    # The in-plane (11, 22, 12) parts of the rotation matrices.
+    index = np.ix_(range(len(θ)), (0, 1, 5), (0, 1, 5))
+    P = lpm.tbar_stack(-θ)[index]
+    T = lpm.tbar_stack(θ)[index]
+    # The A part of abd' = P·a·Pᵀ.
+    r = P @ lpm.matrix(a) @ np.transpose(P, (0, 2, 1))
+    Ntx, Nty, Ntxy = np.einsum("nji,j->in", T, np.asarray(Nt, dtype=float))
+    r00, r01, r02 = r[:, 0, 0], r[:, 0, 1], r[:, 0, 2]
+    r10, r11, r12 = r[:, 1, 0], r[:, 1, 1], r[:, 1, 2]
+    return (
+        1 / (r00 * thickness),
+        1 / (r11 * thickness),
+        1 / (r[:, 2, 2] * thickness),
+        -r10 / r00,
+        -r01 / r11,
+        r00 * Ntx + r01 * Nty + r02 * Ntxy,
+        r10 * Ntx + r11 * Nty + r12 * Ntxy,
     )
 
 
+def polar(lam, n):
+    """Calculate the in-plane properties of a laminate in n directions,
+    evenly spaced over a full circle.
+
+    Arguments:
+        lam: The laminate.
+        n: The number of directions; must be > 0.
+
+    Returns:
+        A SimpleNamespace like rotate_laminate_many. Element j of the arrays
+        gives the properties in the direction angle[j], measured in degrees
+        counterclockwise from the x-axis of lam. So Ex[j] is the Young's
+        modulus in that direction.
+    """
+    if n < 1:
+        raise ValueError("the number of directions must be >0")
+    angles = [360 * j / n for j in range(n)]
+    # The x-axis of a laminate rotated by -θ points in direction θ of lam.
+    rv = rotate_laminate_many(lam, [-a for a in angles])
+    rv.angle = array("d", angles)
+    return rv
+
+
+def sensitivities(lam):
+    """
+    Calculate the derivatives of the in-plane laminate properties with
+    respect to the angle, fiber volume fraction and fiber weight of every ply.
+
+    The derivatives of the Q̅ and CTEs of the plies are calculated
+    analytically, and so are the shifts of the plies when a thickness
+    changes. The derivatives of abd follow from d(abd) = -abd·d(ABD)·abd.
+
+    Arguments:
+        lam: The laminate.
+
+    Returns:
+        A SimpleNamespace with the members angle, vf and fiber_weight. Each
+        of those is a SimpleNamespace with the lists Ex, Ey, Gxy, νxy, νyx, αx,
+        αy and ABD. Element j of those lists is the derivative with respect
+        to the parameter of ply j. Derivatives with respect to the angle are
+        per degree, those with respect to vf per unit of volume fraction and
+        those with respect to the fiber weight per g/m². The ABD elements are
+        6×6 matrices.
+    """
+    layers = lam.layers
+    T, abd, Nt = lam.thickness, lam.abd, lam.Nt
+    n = len(layers)
+    # Per ply: Q̅, Q̅·ᾱ, the z-coordinate of the top of the ply with respect
+    # to the bottom of the stack, and the moments of Q̅ with respect to the
+    # bottom.
+    qs, nts, tops, m0, m1 = [], [], [], [], []
+    zs = 0.0
+    for la in layers:
+        t = la.thickness
+        ze = zs + t
+        q = (la.Q̅11, la.Q̅12, la.Q̅16, la.Q̅22, la.Q̅26, la.Q̅66)
+        qs.append(q)
+        nts.append(_qalpha(q, (la.αx, la.αy, la.αxy)))
+        tops.append(ze)
+        m0.append([c * t for c in q])
+        m1.append([c * (ze * ze - zs * zs) / 2 for c in q])
+        zs = ze
+    A = [sum(m[k] for m in m0) for k in range(6)]
+    M1 = [sum(m[k] for m in m1) for k in range(6)]
+    # Sums of the moments of the plies above ply j.
+    above0, above1 = [None] * n, [None] * n
+    s0, s1 = [0.0] * 6, [0.0] * 6
+    for j in reversed(range(n)):
+        above0[j], above1[j] = s0, s1
+        s0 = [a + b for a, b in zip(s0, m0[j])]
+        s1 = [a + b for a, b in zip(s1, m1[j])]
+    # Rows 0-2 of abd.
+    rows = [[abd[i][k] for k in range(6)] for i in range(3)]
+
+    def thicker(j):
+        """Derivatives of A, B, D and Nt for a unit thickness increase."""
+        q, ze = qs[j], tops[j]
+        # Ply j gets thicker, and the plies above it move up.
+        dM1 = [c * ze + a for c, a in zip(q, above0[j])]
+        dM2 = [c * ze * ze + 2 * a for c, a in zip(q, above1[j])]
+        dB = [d - a / 2 - T / 2 * c for d, a, c in zip(dM1, A, q)]
+        dD = [
+            d2 - m - T * d1 + T / 2 * a + T * T / 4 * c
+            for d2, m, d1, a, c in zip(dM2, M1, dM1, A, q)
+        ]
+        return list(q), dB, dD, nts[j]
+
+    rv = SimpleNamespace()
+    names = ("Ex", "Ey", "Gxy", "νxy", "νyx", "αx", "αy", "ABD")
+    for kind in ("angle", "vf", "fiber_weight"):
+        setattr(rv, kind, SimpleNamespace(**{name: [] for name in names}))
+    zs = -T / 2
+    for j, la in enumerate(layers):
+        t = la.thickness
+        ze = zs + t
+        # Weights of Q̅ of ply j in A, B and D.
+        w = (t, (ze * ze - zs * zs) / 2, (ze * ze * ze - zs * zs * zs) / 3)
+        zs = ze
+        p, q = la.ply, qs[j]
+        a = math.radians(float(la.angle))
+        m, s = math.cos(a), math.sin(a)
+        α = (la.αx, la.αy, la.αxy)
+        # Angle; d/dθ of the Q̅ and ᾱ formulas, in invariant form.
+        U2 = (p.Q11 - p.Q22) / 2
+        U3 = (p.Q11 + p.Q22 - 2 * p.Q12 - 4 * p.Q66) / 8
+        c2, s2 = m * m - s * s, 2 * m * s
+        c4, s4 = c2 * c2 - s2 * s2, 2 * s2 * c2
+        r = math.pi / 180
+        dq = tuple(
+            v * r
+            for v in (
+                -2 * U2 * s2 - 4 * U3 * s4,
+                4 * U3 * s4,
+                U2 * c2 + 4 * U3 * c4,
+                2 * U2 * s2 - 4 * U3 * s4,
+                U2 * c2 - 4 * U3 * c4,
+                4 * U3 * s4,
+            )
+        )
+        dα = tuple(v * r * (p.α1 - p.α2) for v in (-s2, s2, 2 * c2))
+        dnt = [(x + y) * t for x, y in zip(_qalpha(dq, α), _qalpha(q, dα))]
+        _sensitivity(rv.angle, lam, rows, Nt, *_ply_change(dq, w), dnt, 0.0)
+        # Fiber volume fraction; at constant thickness, plus the thickness
+        # change dt/dvf = -t/vf.
+        dQ11, dQ12, dQ22, dQ66, dα1 = _ply_dvf(p)
+        dq = _qbar(dQ11, dQ12, dQ22, dQ66, m, s)
+        dα = _alphabar(dα1, 0.0, m, s)
+        dnt = [(x + y) * t for x, y in zip(_qalpha(dq, α), _qalpha(q, dα))]
+        dA, dB, dD = _ply_change(dq, w)
+        tA, tB, tD, tN = thicker(j)
+        dt = -t / p.vf
+        dA = [x + dt * y for x, y in zip(dA, tA)]
+        dB = [x + dt * y for x, y in zip(dB, tB)]
+        dD = [x + dt * y for x, y in zip(dD, tD)]
+        dnt = [x + dt * y for x, y in zip(dnt, tN)]
+        _sensitivity(rv.vf, lam, rows, Nt, dA, dB, dD, dnt, dt)
+        # Fiber weight; only the thickness changes, dt/dfw = t/fw.
+        dt = t / la.fiber_weight
+        tA, tB, tD, tN = ([dt * y for y in v] for v in (tA, tB, tD, tN))
+        _sensitivity(rv.fiber_weight, lam, rows, Nt, tA, tB, tD, tN, dt)
+    return rv
+
+
 def tbar(degrees):
     """Matrix for rotating lamina coordinates around the z-axis."""
     θ = math.radians(degrees)
@@ -480,7 +1476,75 @@ def tbar(degrees):
         [0, 0, 0, s, c, 0],
         [-2 * c * s, 2 * c * s, 0, 0, 0, c * c - s * s],
     ]
-    return Tbar
+    return lpm.matrix(Tbar)
+
+
+def rotate_stiffness(Cp, degrees):
+    """
+    Rotate an orthotropic stiffness matrix around the z-axis.
+
+    This gives the same result as Tbarᵀ·Cp·Tbar with Tbar = tbar(degrees),
+    but only the non-zero terms are calculated.
+
+    Arguments:
+        Cp: 6×6 stiffness matrix in lamina coordinates. Only the orthotropic
+            components (C11, C12, C13, C22, C23, C33, C44, C55, C66) are used.
+        degrees: Rotation angle in degrees counterclockwise.
+    """
+    return rotate_stiffness_many(Cp, (degrees,))[0]
+
+
+def rotate_stiffness_many(Cp, angles):
+    """
+    Rotate an orthotropic stiffness matrix to several angles.
+
+    Arguments:
+        Cp: 6×6 stiffness matrix in lamina coordinates. Only the orthotropic
+            components are used.
+        angles: Sequence of rotation angles in degrees counterclockwise.
+
+    Returns:
+        A list of 6×6 stiffness matrices in global coordinates.
+    """
+    C11, C12, C13 = Cp[0][0], Cp[0][1], Cp[0][2]
+    C22, C23, C33 = Cp[1][1], Cp[1][2], Cp[2][2]
+    C44, C55, C66 = Cp[3][3], Cp[4][4], Cp[5][5]
+    rv = []
+    for degrees in angles:
+        θ = math.radians(degrees)
+        c, s = math.cos(θ), math.sin(θ)
+        c2, s2, cs = c * c, s * s, c * s
+        d = c2 - s2
+        # The in-plane columns of Tbar (for 11, 22 and 12; 33 is unchanged)
+        # are multiplied by Cp first. The shear rows 23 and 13 decouple.
+        k0 = (C11 * c2 + C12 * s2, C12 * c2 + C22 * s2, -2 * cs * C66)
+        k1 = (C11 * s2 + C12 * c2, C12 * s2 + C22 * c2, 2 * cs * C66)
+        k5 = ((C11 - C12) * cs, (C12 - C22) * cs, d * C66)
+        r00 = c2 * k0[0] + s2 * k0[1] - 2 * cs * k0[2]
+        r01 = c2 * k1[0] + s2 * k1[1] - 2 * cs * k1[2]
+        r02 = c2 * C13 + s2 * C23
+        r05 = c2 * k5[0] + s2 * k5[1] - 2 * cs * k5[2]
+        r11 = s2 * k1[0] + c2 * k1[1] + 2 * cs * k1[2]
+        r12 = s2 * C13 + c2 * C23
+        r15 = s2 * k5[0] + c2 * k5[1] + 2 * cs * k5[2]
+        r25 = (C13 - C23) * cs
+        r55 = cs * (k5[0] - k5[1]) + d * k5[2]
+        r33 = c2 * C44 + s2 * C55
+        r34 = cs * (C55 - C44)
+        r44 = s2 * C44 + c2 * C55
+        rv.append(
+            lpm.matrix(
+                [
+                    [r00, r01, r02, 0.0, 0.0, r05],
+                    [r01, r11, r12, 0.0, 0.0, r15],
+                    [r02, r12, C33, 0.0, 0.0, r25],
+                    [0.0, 0.0, 0.0, r33, r34, 0.0],
+                    [0.0, 0.0, 0.0, r34, r44, 0.0],
+                    [r05, r15, r25, 0.0, 0.0, r55],
+                ]
+            )
+        )
+    return rv
 
 
 def isortho(C):
@@ -543,3 +1607,165 @@ def toabaqusi(C):
     D[3][3] = C[5][5]*1e6
     D[5][5] = C[3][3]*1e6
     return D
+
+
+# Angle-dependent lamina properties, apart from C.
+_ROTATED = (
+    "αx",
+    "αy",
+    "αxy",
+    "Q̅11",
+    "Q̅12",
+    "Q̅16",
+    "Q̅22",
+    "Q̅26",
+    "Q̅66",
+    "Q̅s44",
+    "Q̅s45",
+    "Q̅s55",
+)
+
+
+# Physical properties of a laminate, which do not change when it is rotated.
+_PHYSICAL = ("thickness", "fiber_weight", "ρ", "vf", "resin_weight", "wf")
+
+
+def _tbar3(T):
+    """Return the in-plane (11, 22, 12) part of the 6×6 rotation matrix T."""
+    return [[T[i][j] for j in (0, 1, 5)] for i in (0, 1, 5)]
+
+
+def _rotate_nt(Nt, T):
+    """Rotate the thermal stress resultants Nt with the 6×6 matrix T."""
+    T3 = _tbar3(T)
+    return tuple(sum(T3[j][i] * Nt[j] for j in range(3)) for i in range(3))
+
+
+def _qbar(Q11, Q12, Q22, Q66, m, n):
+    """
+    Calculate the transformed reduced stiffnesses (Q̅11, Q̅12, Q̅16, Q̅22, Q̅26,
+    Q̅66) for m = cos θ and n = sin θ. These are linear in Q11, Q12, Q22 and Q66.
+    """
+    # The powers of the sine and cosine are often used.
+    m2 = m * m
+    m3, m4 = m2 * m, m2 * m2
+    n2 = n * n
+    n3, n4 = n2 * n, n2 * n2
+    # Q̅ according to Hyer:1997, p. 182
+    Q̅11 = Q11 * m4 + 2 * (Q12 + 2 * Q66) * n2 * m2 + Q22 * n4
+    QA = Q11 - Q12 - 2 * Q66
+    QB = Q12 - Q22 + 2 * Q66
+    Q̅12 = (Q11 + Q22 - 4 * Q66) * n2 * m2 + Q12 * (n4 + m4)
+    Q̅16 = QA * n * m3 + QB * n3 * m
+    Q̅22 = Q11 * n4 + 2 * (Q12 + 2 * Q66) * n2 * m2 + Q22 * m4
+    Q̅26 = QA * n3 * m + QB * n * m3
+    Q̅66 = (Q11 + Q22 - 2 * Q12 - 2 * Q66) * n2 * m2 + Q66 * (n4 + m4)
+    return Q̅11, Q̅12, Q̅16, Q̅22, Q̅26, Q̅66
+
+
+def _alphabar(α1, α2, m, n):
+    """Calculate the CTEs (αx, αy, αxy) for m = cos θ and n = sin θ."""
+    m2, n2 = m * m, n * n
+    return α1 * m2 + α2 * n2, α1 * n2 + α2 * m2, 2 * (α1 - α2) * m * n
+
+
+def _qalpha(q, α):
+    """Return Q̅·ᾱ for q = (Q̅11, Q̅12, Q̅16, Q̅22, Q̅26, Q̅66) and α = (αx, αy, αxy).
+    """
+    Q̅11, Q̅12, Q̅16, Q̅22, Q̅26, Q̅66 = q
+    αx, αy, αxy = α
+    # Hyer:1998, p. 445
+    return (
+        Q̅11 * αx + Q̅12 * αy + Q̅16 * αxy,
+        Q̅12 * αx + Q̅22 * αy + Q̅26 * αxy,
+        Q̅16 * αx + Q̅26 * αy + Q̅66 * αxy,
+    )
+
+
+def _ply_change(dq, w):
+    """Return the changes of A, B and D for a change dq of the Q̅ of a ply."""
+    return tuple([c * wk for c in dq] for wk in w)
+
+
+def _sensitivity(rv, lam, rows, Nt, dA, dB, dD, dNt, dT):
+    """
+    Append the derivatives of the in-plane properties of lam for given
+    derivatives of (the unique components of) A, B, D, Nt and the thickness
+    to the lists in rv.
+    """
+    dABD = _abd6(dA, dB, dD)
+    rv.ABD.append(lpm.matrix(dABD))
+    # Rows and columns 0-2 of d(abd) = -abd·d(ABD)·abd. Since d(ABD) and abd
+    # are symmetric, their rows can be used as columns.
+    rd = [[sum(map(operator.mul, r, c)) for c in dABD] for r in rows]
+    da = [[-sum(map(operator.mul, r, c)) for c in rows] for r in rd]
+    a = [r[:3] for r in rows]
+    T = lam.thickness
+    rv.Ex.append(-lam.Ex * (da[0][0] / a[0][0] + dT / T))
+    rv.Ey.append(-lam.Ey * (da[1][1] / a[1][1] + dT / T))
+    rv.Gxy.append(-lam.Gxy * (da[2][2] / a[2][2] + dT / T))
+    rv.νxy.append(-(da[1][0] * a[0][0] - a[1][0] * da[0][0]) / a[0][0] ** 2)
+    rv.νyx.append(-(da[0][1] * a[1][1] - a[0][1] * da[1][1]) / a[1][1] ** 2)
+    rv.αx.append(sum(da[0][k] * Nt[k] + a[0][k] * dNt[k] for k in range(3)))
+    rv.αy.append(sum(da[1][k] * Nt[k] + a[1][k] * dNt[k] for k in range(3)))
+
+
+def _abd6(a, b, d):
+    """Assemble the 6×6 ABD matrix from the unique components of A, B and D."""
+    A11, A12, A16, A22, A26, A66 = a
+    B11, B12, B16, B22, B26, B66 = b
+    D11, D12, D16, D22, D26, D66 = d
+    return [
+        [A11, A12, A16, B11, B12, B16],
+        [A12, A22, A26, B12, B22, B26],
+        [A16, A26, A66, B16, B26, B66],
+        [B11, B12, B16, D11, D12, D16],
+        [B12, B22, B26, D12, D22, D26],
+        [B16, B26, B66, D16, D26, D66],
+    ]
+
+
+def _strengths(layers, strengths):
+    """Convert the strengths argument of laminate() to a tuple per layer."""
+    if strengths is None:
+        return None
+    if isinstance(strengths, Strength):
+        return (strengths,) * len(layers)
+    if isinstance(strengths, dict):
+        return tuple(strengths.get(la.fiber.name) for la in layers)
+    strengths = tuple(strengths)
+    if len(strengths) != len(layers):
+        raise ValueError("strengths needs an entry for every layer")
+    if any(s is not None and not isinstance(s, Strength) for s in strengths):
+        raise ValueError("strengths must be Strength or None")
+    return strengths
+
+
+def _materials_key(fiber, resin):
+    """Return a hashable key for the property values of a fiber and resin."""
+    return (
+        (fiber.E1, fiber.ν12, fiber.α1, fiber.ρ, fiber.name),
+        (resin.E, resin.ν, resin.α, resin.ρ, resin.name),
+    )
+
+
+def _fraction(vf):
+    """Convert a fiber volume fraction given as a fraction or percentage."""
+    vf = float(vf)
+    if 1.0 < vf <= 100.0:
+        vf = vf / 100.0
+    elif not 0.0 <= vf <= 1.0:
+        raise ValueError("vf must be in the ranges 0.0-1.0 or 1.0-100.0")
+    return vf
+
+
+def _broadcast(*args):
+    """
+    Convert numbers and sequences to lists of the same length.
+    Numbers are repeated; all sequences must have the same length.
+    """
+    lengths = {len(a) for a in args if not isinstance(a, numbers.Real)}
+    if len(lengths) > 1:
+        raise ValueError("sequences must have the same length")
+    n = lengths.pop() if lengths else 1
+    return [[a] * n if isinstance(a, numbers.Real) else list(a) for a in args]
@@ -0,0 +1,533 @@
+# file: failure.py
+# vim:fileencoding=utf-8:ft=python:fdm=marker
+#
+# Copyright © 2026 R.F. Smith <rsmith@xs4all.nl>. All rights reserved.
+# SPDX-License-Identifier: BSD-2-Clause
+# Created: 2026-10-18T17:52:06+0200
+# Last modified: 2026-10-18T17:52:06+0200
+"""
+First-ply failure of laminates.
+
+The reserve factor R of a load is the factor by which the load can be
+multiplied before the first ply fails. Stresses from a temperature difference
+are not scaled. Failure is checked at the bottom and top of every ply; both
+criteria are convex in the stresses, which vary linearly through a ply, so the
+lowest reserve factor is always found at one of the faces.
+
+The ply stresses in ply coordinates for unit loads are calculated once per
+laminate. The stresses for a load are then linear combinations of those.
+
+The Tsai-Wu criterion uses F12 = -½·√(F11·F22); see Tsai:1992.
+
+Progressive failure uses the ply discount method. A ply that fails in the
+matrix keeps only a fraction of Q12, Q22 and Q66; after fiber failure that
+fraction applies to all its stiffnesses. Since Q̅ is linear in Q, the change
+of a ply's Q̅ gives the change of ABD and of the thermal resultants directly,
+without integrating over the other plies again.
+"""
+
+from array import array
+from types import SimpleNamespace
+import math
+import operator
+import lp.core as core
+from .analysis import ply_stresses, thermal_moments
+
+# Names of the load components, in the order used by ply_stresses.
+LOADS = ("Nx", "Ny", "Nxy", "Mx", "My", "Mxy")
+
+
+def reserve_factors(lam, loads, ΔT=0.0, criterion="tsai-wu"):
+    """
+    Calculate the first-ply failure reserve factors for load cases.
+
+    Arguments:
+        lam: The laminate. All its plies must have strengths; see the
+            strengths argument of laminate().
+        loads: A sequence of load cases. Every load case is a sequence
+            (Nx, Ny, Nxy, Mx, My, Mxy) of forces in N/mm and moments in N.
+        ΔT: Temperature difference in K with respect to the stress-free
+            temperature, for all load cases.
+        criterion: Either "tsai-wu" or "max-stress".
+
+    Returns:
+        A SimpleNamespace with the arrays rf (the reserve factors) and ply
+        (the index of the ply that fails first), with an entry for every
+        load case. A load that causes no stresses has reserve factor inf and
+        ply -1. If the thermal stresses alone already cause failure, the
+        reserve factor is 0.
+    """
+    loads = [tuple(float(v) for v in load) for load in loads]
+    if any(len(load) != 6 for load in loads):
+        raise ValueError("a load case must have 6 components")
+    check, coefficients = _criterion(criterion)
+    points = _points(lam, range(6), ΔT, coefficients)
+    rv = SimpleNamespace(rf=array("d"), ply=array("l"))
+    for load in loads:
+        r, j = _first_ply(points, load, check)
+        rv.rf.append(r)
+        rv.ply.append(j)
+    return rv
+
+
+def envelope(lam, x="Nx", y="Ny", n=3600, ΔT=0.0, criterion="tsai-wu"):
+    """
+    Calculate a first-ply failure envelope in the plane of two load
+    components.
+
+    With the "numpy" backend, all directions are evaluated as arrays.
+
+    Arguments:
+        lam: The laminate. All its plies must have strengths.
+        x, y: Names of the load components; Nx, Ny, Nxy, Mx, My or Mxy.
+        n: Number of load directions, evenly spread over 360°.
+        ΔT: Temperature difference in K with respect to the stress-free
+            temperature.
+        criterion: Either "tsai-wu" or "max-stress".
+
+    Returns:
+        A SimpleNamespace with the arrays angle (the direction in degrees,
+        counterclockwise from the x component), x and y (the load
+        components at first-ply failure) and ply (the index of the ply that
+        fails first).
+    """
+    if x not in LOADS or y not in LOADS or x == y:
+        raise ValueError(f"x and y must be two different items of {LOADS}")
+    if n < 1:
+        raise ValueError("the number of directions must be >0")
+    check, coefficients = _criterion(criterion)
+    points = _points(lam, (LOADS.index(x), LOADS.index(y)), ΔT, coefficients)
+    if core.get_backend() == "numpy":
+        return _envelope_stack(points, n, _STACKS[check])
+    rv = SimpleNamespace(
+        angle=array("d"), x=array("d"), y=array("d"), ply=array("l")
+    )
+    for j in range(n):
+        angle = 360 * j / n
+        a = math.radians(angle)
+        c, s = math.cos(a), math.sin(a)
+        r, ply = _first_ply(points, (c, s), check)
+        rv.angle.append(angle)
+        rv.x.append(r * c)
+        rv.y.append(r * s)
+        rv.ply.append(ply)
+    return rv
+
+
+def progressive(lam, loads, ΔT=0.0, criterion="tsai-wu", factor=0.01):
+    """
+    Follow the failure of the plies of a laminate up to last-ply failure,
+    for proportional load paths.
+
+    After every ply failure the failed ply is degraded, and the load factor
+    at which the next ply fails is determined. A load factor never decreases;
+    a ply that fails at a lower factor in the degraded laminate fails at the
+    current load. Last-ply failure is reached when every ply has failed in
+    the fibers, or when the stiffness of the laminate along the load path has
+    dropped below 10·factor times its initial value, so that it can no
+    longer carry the load.
+
+    Arguments:
+        lam: The laminate. All its plies must have strengths.
+        loads: A sequence of load paths. Every load path is a sequence
+            (Nx, Ny, Nxy, Mx, My, Mxy) that is multiplied by the load factor.
+        ΔT: Temperature difference in K with respect to the stress-free
+            temperature, for all load paths.
+        criterion: Either "tsai-wu" or "max-stress". Plies that have failed
+            in the matrix can only fail further in the fiber direction,
+            according to the maximum stress criterion.
+        factor: Fraction of the stiffnesses that a failed ply keeps.
+
+    Returns:
+        A SimpleNamespace with the arrays first (the first-ply failure load
+        factor) and ultimate (the last-ply failure load factor) for every
+        load path, and the arrays path, load, ply and mode (1 for matrix
+        failure, 2 for fiber failure) with an entry for every failure.
+    """
+    loads = [tuple(float(v) for v in load) for load in loads]
+    if any(len(load) != 6 for load in loads):
+        raise ValueError("a load case must have 6 components")
+    if not 0 < factor < 1:
+        raise ValueError("factor must be between 0 and 1")
+    check, coefficients = _criterion(criterion)
+    strengths = _strengths(lam)
+    ABD = [[float(v) for v in row] for row in lam.ABD]
+    resultants = list(lam.Nt) + list(thermal_moments(lam))
+    plies = []
+    zb = -lam.thickness / 2
+    for la, s in zip(lam.layers, strengths):
+        p, zt = la.ply, zb + la.thickness
+        a = math.radians(float(la.angle))
+        m, n = math.cos(a), math.sin(a)
+        plies.append(
+            (
+                (m, n),
+                # Transformation of strains to ply coordinates.
+                (m * m, n * n, m * n, 2 * m * n, m * m - n * n),
+                (zb, zt),
+                (la.thickness, (zt * zt - zb * zb) / 2, (zt ** 3 - zb ** 3) / 3),
+                (la.αx, la.αy, la.αxy),
+                (p.Q11, p.Q12, p.Q22, p.Q66),
+                s,
+                coefficients(s),
+            )
+        )
+        zb = zt
+    rv = SimpleNamespace(
+        first=array("d"),
+        ultimate=array("d"),
+        path=array("l"),
+        load=array("d"),
+        ply=array("l"),
+        mode=array("l"),
+    )
+    for index, load in enumerate(loads):
+        events = _progressive(ABD, resultants, plies, load, ΔT, check, factor)
+        for r, j, mode in events:
+            rv.path.append(index)
+            rv.load.append(r)
+            rv.ply.append(j)
+            rv.mode.append(mode)
+        rv.first.append(events[0][0] if events else math.inf)
+        rv.ultimate.append(events[-1][0] if events else math.inf)
+    return rv
+
+
+def _progressive(ABD, resultants, plies, load, ΔT, check, factor):
+    """
+    Follow the failure of the plies along one load path.
+
+    Arguments:
+        ABD: Stiffness matrix of the undamaged laminate as a list of lists.
+        resultants: Unit thermal force and moment resultants of the
+            undamaged laminate.
+        plies: Tuples with the data of every ply; see progressive().
+        load: The load path.
+        ΔT: Temperature difference in K.
+        check: Criterion function.
+        factor: Fraction of the stiffnesses that a failed ply keeps.
+
+    Returns:
+        A list of tuples (load factor, ply index, mode).
+    """
+    ABD = [row[:] for row in ABD]
+    resultants = resultants[:]
+    Qs = [p[5] for p in plies]
+    status = [0] * len(plies)
+    events, level, compliance = [], 0.0, None
+    while True:
+        # Only abd·load and abd·resultants are needed, not abd itself.
+        lu = core.lpm.LU(ABD)
+        g = lu.solve(load)
+        gt = [ΔT * v for v in lu.solve(resultants)]
+        # The compliance along the load path, load·abd·load.
+        current = sum(map(operator.mul, load, g))
+        if compliance is None:
+            compliance = current
+        rf, ply = math.inf, -1
+        for j, (_, T, faces, _, (αx, αy, αxy), _, s, c) in enumerate(plies):
+            if status[j] == 2:
+                continue
+            for z in faces:
+                ε = (g[0] + z * g[3], g[1] + z * g[4], g[2] + z * g[5])
+                εt = (
+                    gt[0] + z * gt[3] - ΔT * αx,
+                    gt[1] + z * gt[4] - ΔT * αy,
+                    gt[2] + z * gt[5] - ΔT * αxy,
+                )
+                σ = _ply_stress(ε, T, Qs[j])
+                σt = _ply_stress(εt, T, Qs[j])
+                if status[j]:
+                    r = _max_stress(σ, σt, ((s.Xt, -s.Xc),) + _NO_LIMITS)
+                else:
+                    r = check(σ, σt, c)
+                if r < rf:
+                    rf, ply = r, j
+                    failed = [rf * a + b for a, b in zip(σ, σt)]
+        if ply < 0:
+            return events
+        # Plies that fail at the current load still do so in a laminate that
+        # has collapsed, but the load cannot increase any further.
+        if rf > level and current * _COLLAPSE * factor > compliance:
+            return events
+        level = max(level, rf)
+        (m, n), _, _, (t, z2, z3), α, Q, s, _ = plies[ply]
+        mode = 2 if status[ply] else _mode(failed, s)
+        events.append((level, ply, mode))
+        # Degrade the ply, and update ABD and the thermal resultants.
+        old = Qs[ply]
+        if mode == 2:
+            new = [v * factor for v in Q]
+        else:
+            new = [old[0], old[1] * factor, old[2] * factor, old[3] * factor]
+        Qs[ply], status[ply] = tuple(new), mode
+        dQ̅ = core._qbar(*(a - b for a, b in zip(new, old)), m, n)
+        dQ̅11, dQ̅12, dQ̅16, dQ̅22, dQ̅26, dQ̅66 = dQ̅
+        dQ = ((dQ̅11, dQ̅12, dQ̅16), (dQ̅12, dQ̅22, dQ̅26), (dQ̅16, dQ̅26, dQ̅66))
+        for i, row in enumerate(dQ):
+            for k, v in enumerate(row):
+                ABD[i][k] += v * t
+                ABD[i][k + 3] += v * z2
+                ABD[i + 3][k] += v * z2
+                ABD[i + 3][k + 3] += v * z3
+        for k, v in enumerate(core._qalpha(dQ̅, α)):
+            resultants[k] += v * t
+            resultants[k + 3] += v * z2
+        if all(v == 2 for v in status):
+            return events
+
+
+def _ply_stress(ε, T, Q):
+    """
+    Return the stresses (σ1, σ2, τ12) in ply coordinates for the strains
+    (εx, εy, γxy) of a ply. T is (m², n², mn, 2mn, m²-n²) for m = cos θ and
+    n = sin θ, and Q = (Q11, Q12, Q22, Q66) the reduced stiffnesses.
+    """
+    εx, εy, γxy = ε
+    m2, n2, mn, mn2, d = T
+    Q11, Q12, Q22, Q66 = Q
+    # Hyer:1998, p. 112
+    ε1 = m2 * εx + n2 * εy + mn * γxy
+    ε2 = n2 * εx + m2 * εy - mn * γxy
+    γ12 = mn2 * (εy - εx) + d * γxy
+    return (Q11 * ε1 + Q12 * ε2, Q12 * ε1 + Q22 * ε2, Q66 * γ12)
+
+
+def _mode(σ, s):
+    """Return 2 if the stresses σ are governed by the fiber strength, else 1."""
+    σ1, σ2, τ12 = σ
+    r1 = σ1 / s.Xt if σ1 > 0 else -σ1 / s.Xc
+    r2 = σ2 / s.Yt if σ2 > 0 else -σ2 / s.Yc
+    return 2 if r1 >= max(r2, abs(τ12) / s.S) else 1
+
+
+def _strengths(lam):
+    """Return the strengths of the plies of lam, which must all be known."""
+    strengths = lam.strengths
+    if strengths is None or None in strengths:
+        raise ValueError("all plies need strengths")
+    return strengths
+
+
+def _criterion(name):
+    """
+    Return the function that calculates a reserve factor, and the function
+    that calculates its coefficients for a Strength.
+    """
+    try:
+        return _CRITERIA[name]
+    except KeyError:
+        raise ValueError(
+            f"unknown criterion '{name}'; use one of {tuple(_CRITERIA)}"
+        ) from None
+
+
+def _points(lam, columns, ΔT, coefficients):
+    """
+    Gather the data to check the faces of all plies.
+
+    Arguments:
+        lam: The laminate.
+        columns: Indices of the load components that can be non-zero.
+        ΔT: Temperature difference in K.
+        coefficients: Function that returns the coefficients of the
+            criterion for a Strength.
+
+    Returns:
+        A list of tuples (ply index, m, t, coefficients). Here m contains
+        for σ1, σ2 and τ12 the stresses caused by unit loads in the columns,
+        t the thermal stresses and coefficients the data of the criterion
+        for the strength of the ply.
+    """
+    strengths = _strengths(lam)
+    units = [tuple(float(k == c) for k in range(6)) for c in columns]
+    cases = len(units)
+    rs = ply_stresses(lam, units + [(0.0,) * 6], [0.0] * cases + [ΔT])
+    plies = len(lam.layers)
+    σ = rs.stress12
+
+    def at(case, j, p):
+        base = ((case * plies + j) * 3 + p) * 3
+        return tuple(σ[base:base + 3])
+
+    rv = []
+    for j, s in enumerate(strengths):
+        c = coefficients(s)
+        for p in (0, 2):
+            m = tuple(zip(*(at(case, j, p) for case in range(cases))))
+            rv.append((j, m, at(cases, j, p), c))
+    return rv
+
+
+def _first_ply(points, load, check):
+    """Return the lowest reserve factor and its ply for a load."""
+    mul = operator.mul
+    rf, ply = math.inf, -1
+    for j, (m1, m2, m6), t, c in points:
+        m = (
+            sum(map(mul, m1, load)),
+            sum(map(mul, m2, load)),
+            sum(map(mul, m6, load)),
+        )
+        r = check(m, t, c)
+        if r < rf:
+            rf, ply = r, j
+    return rf, ply
+
+
+def _envelope_stack(points, n, check):
+    """
+    Calculate the results of envelope() for all n directions at once with
+    NumPy.
+
+    Arguments:
+        points: The data of the ply faces; see _points.
+        n: Number of load directions.
+        check: Function that calculates the reserve factors of all faces for
+            all directions; see _tsai_wu_stack.
+    """
+    np = core.lpm.np
+    angle = 360 * np.arange(n) / n
+    a = np.radians(angle)
+    c, s = np.cos(a), np.sin(a)
+    mx, my = np.moveaxis(np.array([p[1] for p in points]), 2, 0)
+    t = np.array([p[2] for p in points])
+    coefficients = np.array([p[3] for p in points], dtype=float)
+    r, first = np.empty(n), np.empty(n, dtype=int)
+    # Limit the size of the temporary arrays.
+    step = max(1, _BLOCK // len(points))
+    for k in range(0, n, step):
+        cs, ss = c[k:k + step, None, None], s[k:k + step, None, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rf = check(cs * mx + ss * my, t, coefficients)
+        # The first face with the lowest reserve factor, as in _first_ply.
+        first[k:k + step] = np.argmin(rf, axis=1)
+        r[k:k + step] = rf[np.arange(len(rf)), first[k:k + step]]
+    ply = np.where(r < math.inf, np.array([p[0] for p in points])[first], -1)
+    return SimpleNamespace(
+        angle=array("d", angle),
+        x=array("d", r * c),
+        y=array("d", r * s),
+        ply=array("l", ply),
+    )
+
+
+def _tsai_wu(m, t, F):
+    """
+    Reserve factor according to Tsai-Wu, for the stresses R·m + t.
+
+    Solves a·R² + b·R + c = 0 for the positive root.
+    """
+    m1, m2, m6 = m
+    t1, t2, t6 = t
+    F1, F2, F11, F22, F66, F12 = F
+    a = F11 * m1 * m1 + F22 * m2 * m2 + F66 * m6 * m6 + 2 * F12 * m1 * m2
+    b = F1 * m1 + F2 * m2 + 2 * (F11 * m1 * t1 + F22 * m2 * t2 + F66 * m6 * t6)
+    b += 2 * F12 * (m1 * t2 + m2 * t1)
+    c = F1 * t1 + F2 * t2 + F11 * t1 * t1 + F22 * t2 * t2 + F66 * t6 * t6
+    c += 2 * F12 * t1 * t2 - 1
+    if c >= 0:
+        return 0.0
+    if a <= 0:
+        return math.inf
+    # Numerically stable roots; since c/a < 0 one of them is positive.
+    q = -(b + math.copysign(math.sqrt(b * b - 4 * a * c), b)) / 2
+    return max(q / a, c / q)
+
+
+def _tsai_wu_stack(m, t, F):
+    """
+    Reserve factors according to Tsai-Wu for arrays of stresses; see
+    _tsai_wu.
+
+    Arguments:
+        m: (directions, faces, 3) array of the stresses per unit load.
+        t: (faces, 3) array of the thermal stresses.
+        F: (faces, 6) array of the coefficients.
+
+    Returns:
+        A (directions, faces) array of reserve factors.
+    """
+    np = core.lpm.np
+    m1, m2, m6 = m[..., 0], m[..., 1], m[..., 2]
+    t1, t2, t6 = t.T
+    F1, F2, F11, F22, F66, F12 = F.T
+    a = F11 * m1 * m1 + F22 * m2 * m2 + F66 * m6 * m6 + 2 * F12 * m1 * m2
+    b = F1 * m1 + F2 * m2 + 2 * (F11 * m1 * t1 + F22 * m2 * t2 + F66 * m6 * t6)
+    b += 2 * F12 * (m1 * t2 + m2 * t1)
+    c = F1 * t1 + F2 * t2 + F11 * t1 * t1 + F22 * t2 * t2 + F66 * t6 * t6
+    c += 2 * F12 * t1 * t2 - 1
+    q = -(b + np.copysign(np.sqrt(b * b - 4 * a * c), b)) / 2
+    rv = np.maximum(q / a, c / q)
+    rv[a <= 0] = math.inf
+    rv[:, c >= 0] = 0.0
+    return rv
+
+
+def _tsai_wu_coefficients(s):
+    """Return (F1, F2, F11, F22, F66, F12) for a Strength."""
+    F11 = 1 / (s.Xt * s.Xc)
+    F22 = 1 / (s.Yt * s.Yc)
+    return (
+        1 / s.Xt - 1 / s.Xc,
+        1 / s.Yt - 1 / s.Yc,
+        F11,
+        F22,
+        1 / (s.S * s.S),
+        -math.sqrt(F11 * F22) / 2,
+    )
+
+
+def _max_stress(m, t, limits):
+    """Reserve factor according to the maximum stress criterion."""
+    rf = math.inf
+    for mk, tk, (high, low) in zip(m, t, limits):
+        if tk > high or tk < low:
+            return 0.0
+        if mk > 0:
+            r = (high - tk) / mk
+        elif mk < 0:
+            r = (low - tk) / mk
+        else:
+            continue
+        if r < rf:
+            rf = r
+    return rf
+
+
+def _max_stress_stack(m, t, limits):
+    """
+    Reserve factors according to the maximum stress criterion for arrays of
+    stresses; see _max_stress and _tsai_wu_stack.
+    """
+    np = core.lpm.np
+    high, low = limits[..., 0], limits[..., 1]
+    r = np.where(m > 0, (high - t) / m, np.where(m < 0, (low - t) / m, math.inf))
+    rv = r.min(axis=2)
+    rv[:, ((t > high) | (t < low)).any(axis=1)] = 0.0
+    return rv
+
+
+def _max_stress_coefficients(s):
+    """Return the limits of σ1, σ2 and τ12 for a Strength."""
+    return ((s.Xt, -s.Xc), (s.Yt, -s.Yc), (s.S, -s.S))
+
+
+# A laminate has collapsed when its stiffness along a load path is less than
+# _COLLAPSE·factor times the initial stiffness.
+_COLLAPSE = 10
+
+# Number of combinations of a direction and a ply face that _envelope_stack
+# evaluates at once.
+_BLOCK = 1 << 16
+
+# Limits of the maximum stress criterion that are never reached.
+_NO_LIMITS = ((math.inf, -math.inf), (math.inf, -math.inf))
+
+_CRITERIA = {
+    "tsai-wu": (_tsai_wu, _tsai_wu_coefficients),
+    "max-stress": (_max_stress, _max_stress_coefficients),
+}
+
+# The versions of the criteria that work on arrays, for the numpy backend.
+_STACKS = {_tsai_wu: _tsai_wu_stack, _max_stress: _max_stress_stack}
@@ -0,0 +1,119 @@
+# file: lampar.py
+# vim:fileencoding=utf-8:ft=python:fdm=marker
+#
+# Copyright © 2026 R.F. Smith <rsmith@xs4all.nl>. All rights reserved.
+# SPDX-License-Identifier: BSD-2-Clause
+# Created: 2026-10-18T12:02:19+0200
+# Last modified: 2026-10-18T12:02:19+0200
+"""
+Stiffness invariants and lamination parameters.
+
+For plies of a single material, the transformed reduced stiffnesses are
+linear in cos 2θ, sin 2θ, cos 4θ and sin 4θ, with the five invariants U1–U5
+as coefficients. Integrating those trigonometric terms through the thickness
+yields twelve lamination parameters; four each for A, B and D. The ABD matrix
+then follows from the invariants and the lamination parameters without any
+per-ply transformations.
+
+See Tsai:1992 and Hyer:1997, chapters 6 and 7 for the derivation.
+"""
+
+import math
+import lp.core as core
+
+
+def invariants(ply):
+    """Calculate the stiffness invariants of a ply material.
+
+    Arguments:
+        ply: A PlyMaterial, or a lamina (of which the PlyMaterial is used).
+
+    Returns:
+        A 5-tuple (U1, U2, U3, U4, U5) in MPa.
+    """
+    ply = getattr(ply, "ply", ply)
+    Q11, Q12, Q22, Q66 = ply.Q11, ply.Q12, ply.Q22, ply.Q66
+    U1 = (3 * Q11 + 3 * Q22 + 2 * Q12 + 4 * Q66) / 8
+    U2 = (Q11 - Q22) / 2
+    U3 = (Q11 + Q22 - 2 * Q12 - 4 * Q66) / 8
+    U4 = (Q11 + Q22 + 6 * Q12 - 4 * Q66) / 8
+    U5 = (Q11 + Q22 - 2 * Q12 + 4 * Q66) / 8
+    return U1, U2, U3, U4, U5
+
+
+def lamination_parameters(lam):
+    """Calculate the lamination parameters of a laminate.
+
+    All layers must be made of the same ply material; their thicknesses may
+    differ.
+
+    Arguments:
+        lam: A laminate.
+
+    Returns:
+        A 12-tuple (ξ1A, ξ2A, ξ3A, ξ4A, ξ1B, ξ2B, ξ3B, ξ4B, ξ1D, ξ2D, ξ3D, ξ4D).
+        The numbers 1–4 refer to cos 2θ, sin 2θ, cos 4θ and sin 4θ. The A,
+        B and D parameters are normalized with h, h²/4 and h³/12 respectively,
+        so they all lie between -1 and 1.
+    """
+    _material(lam.layers)
+    h = lam.thickness
+    rv = [0.0] * 12
+    zs = -h / 2
+    for la in lam.layers:
+        ze = zs + la.thickness
+        w = (ze - zs, (ze * ze - zs * zs) / 2, (ze * ze * ze - zs * zs * zs) / 3)
+        θ = math.radians(float(la.angle))
+        trig = (math.cos(2 * θ), math.sin(2 * θ), math.cos(4 * θ), math.sin(4 * θ))
+        for k, wk in enumerate(w):
+            for j, t in enumerate(trig):
+                rv[4 * k + j] += wk * t
+        zs = ze
+    for j, norm in enumerate((1 / h, 4 / h ** 2, 12 / h ** 3)):
+        for k in range(4 * j, 4 * j + 4):
+            rv[k] *= norm
+    return tuple(rv)
+
+
+def abd_from_lamination_parameters(U, ξ, thickness):
+    """Calculate the ABD matrix from invariants and lamination parameters.
+
+    Arguments:
+        U: Stiffness invariants (U1, U2, U3, U4, U5), see invariants().
+        ξ: The 12 lamination parameters, see lamination_parameters().
+        thickness: Thickness of the laminate in mm.
+
+    Returns:
+        The 6×6 ABD matrix.
+    """
+    U1, U2, U3, U4, U5 = U
+    h = thickness
+    A = _submatrix(U1, U2, U3, U4, U5, ξ[0:4], h)
+    # The U1, U4 and U5 terms vanish for B, since ∫z dz over the thickness is 0.
+    B = _submatrix(0.0, U2, U3, 0.0, 0.0, ξ[4:8], h * h / 4)
+    D = _submatrix(U1, U2, U3, U4, U5, ξ[8:12], h ** 3 / 12)
+    return core.lpm.clean(core.lpm.block(A, B, B, D))
+
+
+def _submatrix(U1, U2, U3, U4, U5, ξ, factor):
+    """Return factor times the 3×3 stiffness for four lamination parameters."""
+    ξ1, ξ2, ξ3, ξ4 = ξ
+    # Hyer:1997, p. 182 written in terms of the invariants.
+    X11 = (U1 + ξ1 * U2 + ξ3 * U3) * factor
+    X12 = (U4 - ξ3 * U3) * factor
+    X22 = (U1 - ξ1 * U2 + ξ3 * U3) * factor
+    X66 = (U5 - ξ3 * U3) * factor
+    X16 = (ξ2 * U2 / 2 + ξ4 * U3) * factor
+    X26 = (ξ2 * U2 / 2 - ξ4 * U3) * factor
+    return core.lpm.matrix([[X11, X12, X16], [X12, X22, X26], [X16, X26, X66]])
+
+
+def _material(layers):
+    """Check that all layers have the same reduced stiffnesses."""
+    first = layers[0].ply
+    ref = (first.Q11, first.Q12, first.Q22, first.Q66)
+    for la in layers[1:]:
+        p = la.ply
+        if p is not first and (p.Q11, p.Q12, p.Q22, p.Q66) != ref:
+            raise ValueError("lamination parameters require plies of one material")
+    return first
@@ -7,150 +7,420 @@
 # Created: 2018-12-28T23:06:35+0100
 # Last modified: 2020-12-29T11:49:38+0100
 
-from copy import deepcopy
+from array import array
+import math
+import operator
 
 _LIMIT = 1e-10  # Numbers smaller than abs(_LIMIT) are set to 0.
+# The 5×5 and 6×6 kernels use pivoting elimination when the determinant of
+# their top-left block is smaller than _SINGULAR times Hadamard's bound, so
+# when that block is (nearly) singular or badly conditioned.
+_SINGULAR = 1e-2
+
+
+class Matrix:
+    """
+    Square matrix of floats, stored row-major in a flat array('d').
+
+    Indexing with m[i] returns a writable view of row i, so elements can be
+    read and written as m[i][j]. Iterating over a matrix yields its rows.
+
+    Properties:
+        size: The number of rows (and columns).
+        data: The elements in row-major order.
+    """
+
+    __slots__ = ("size", "data")
+
+    def __init__(self, size, data=None):
+        self.size = size
+        if data is None:
+            self.data = array("d", bytes(8 * size * size))
+        else:
+            self.data = array("d", data)
+            if len(self.data) != size * size:
+                raise ValueError("invalid number of elements")
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, i):
+        n = self.size
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("row index out of range")
+        return memoryview(self.data)[i * n:(i + 1) * n]
+
+    def __iter__(self):
+        n = self.size
+        view = memoryview(self.data)
+        return (view[k:k + n] for k in range(0, n * n, n))
+
+    def __eq__(self, other):
+        if isinstance(other, Matrix):
+            return self.size == other.size and self.data == other.data
+        try:
+            if len(other) != self.size:
+                return False
+            return all(list(a) == list(b) for a, b in zip(self, other))
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"Matrix({self.tolist()})"
+
+    def __reduce__(self):
+        return (self.__class__, (self.size, self.data))
+
+    def tolist(self):
+        """Return the matrix as a list of lists."""
+        return [list(row) for row in self]
+
+
+def matrix(m):
+    """
+    Return m as a Matrix.
+
+    Arguments:
+        m: A Matrix (which is returned unchanged) or a square sequence of rows.
+    """
+    if isinstance(m, Matrix):
+        return m
+    size = _square_size(m)
+    return Matrix(size, [v for row in m for v in row])
 
 
 def ident(num):
     """Create num×num identity matrix."""
-    matrix = []
-    for i in range(num):
-        row = [1.0 if i == j else 0.0 for j in range(num)]
-        matrix.append(row)
-    return matrix
+    rv = Matrix(num)
+    for j in range(0, num * num, num + 1):
+        rv.data[j] = 1.0
+    return rv
 
 
 def zeros(num):
     """Create a num×num 0-filled matrix."""
-    matrix = []
-    for i in range(num):
-        row = [0.0 for j in range(num)]
-        matrix.append(row)
-    return matrix
+    return Matrix(num)
 
 
 def det(m):
     """Calculate the determinant of a matrix."""
-    tr, _ = _topright(m)
-    d = _diag(tr)
-    rv = 1
-    for j in d:
-        rv *= j
-    return rv
+    size, d = _flat(m)
+    if size in _DET:
+        return _DET[size](d, size)
+    return _det_ge(d, size)
 
 
-def inv(m):
+def inv(m, out=None):
     """Calculate the inverse of a matrix"""
-    size = _square_size(m)
-    # Empty left-bottom triangle
-    copy, rv = _topright(m)
-    # Empty top-right triangle.
-    for k in range(size - 1, -1, -1):
-        for p in range(k - 1, -1, -1):
-            fact = copy[p][k] / copy[k][k]
-            for j in range(size):
-                copy[p][j] -= fact * copy[k][j]
-                if abs(copy[p][j]) < _LIMIT:
-                    copy[p][j] = 0.0
-                rv[p][j] -= fact * rv[k][j]
-    # Divide by the diagonals.
-    for r in range(size):
-        for k in range(size):
-            rv[r][k] /= copy[r][r]
-    # Discard small numbers.
-    return clean(rv)
+    size, d = _flat(m)
+    if size in _INV:
+        return _store(out, size, _INV[size](d, size))
+    return _store(out, size, _inv_gj(d, size))
 
 
-def add(a, b):
+def add(a, b, out=None):
     """Return the sum of square matrices a and b."""
-    s, sb = _square_size(a), _square_size(b)
+    s, da = _flat(a)
+    sb, db = _flat(b)
     if s != sb:
         raise ValueError("matrices cannot be multiplied")
-    res = zeros(s)
-    for i in range(s):
-        for j in range(s):
-            res[i][j] = a[i][j] + b[i][j]
-    return res
+    return _store(out, s, [x + y for x, y in zip(da, db)])
 
 
-def matmul(a, b):
+def matmul(a, b, out=None):
     """Returns the matrix product of square matrices a and b."""
-    s, sb = _square_size(a), _square_size(b)
+    s, da = _flat(a)
+    sb, db = _flat(b)
     if s != sb:
         raise ValueError("matrices cannot be multiplied")
-    res = zeros(s)
-    for i in range(s):
-        for j in range(s):
-            for k in range(s):
-                res[i][j] += a[i][k] * b[k][j]
-    return res
+    if s == 6:
+        return _store(out, 6, _matmul6(da, db))
+    cols = [db[j::s] for j in range(s)]
+    return _store(
+        out,
+        s,
+        [
+            sum(x * y for x, y in zip(da[i:i + s], col))
+            for i in range(0, s * s, s)
+            for col in cols
+        ],
+    )
 
 
-def mul(m, sc):
+def mul(m, sc, out=None):
     """Multiply matrix m by scalar sc."""
-    s = _square_size(m)
-    res = zeros(s)
-    for i in range(s):
-        for j in range(s):
-            res[i][j] = m[i][j] * sc
-    return res
+    s, d = _flat(m)
+    return _store(out, s, [v * sc for v in d])
 
 
-def transp(m):
+def transp(m, out=None):
     """Return the transpose of m."""
-    s = len(m)
-    r = zeros(s)
-    for i in range(s):
-        for j in range(s):
-            r[i][j] = m[j][i]
-    return r
+    s, d = _flat(m)
+    return _store(out, s, [v for j in range(s) for v in d[j::s]])
 
 
 def delete(m, r, k):
     """Delete row r and column r from matrix m."""
-    size = _square_size(m)
+    size, d = _flat(m)
     if r < 0 or r > size - 1:
         raise ValueError("invalid row")
     if k < 0 or k > size - 1:
         raise ValueError("invalid column")
-    rv = deepcopy(m)
-    rv.pop(r)
-    for r in rv:
-        r.pop(k)
-    return rv
+    return Matrix(
+        size - 1,
+        [
+            d[i * size + j]
+            for i in range(size)
+            if i != r
+            for j in range(size)
+            if j != k
+        ],
+    )
 
 
-def clean(m):
+def clean(m, out=None):
     """Set matrix numbers < _LIMIT with 0."""
-    rv = deepcopy(m)
-    sz = len(rv)
-    for i in range(sz):
-        for j in range(sz):
-            if abs(rv[i][j]) < _LIMIT:
-                rv[i][j] = 0.0
-    return rv
+    s, d = _flat(m)
+    return _store(out, s, [0.0 if abs(v) < _LIMIT else v for v in d])
+
+
+# In-place operations
+# These modify their first Matrix argument and return it. They are meant for
+# accumulation loops, where creating a new matrix every iteration is wasteful.
+
+
+def iadd(a, b):
+    """Add matrix b to Matrix a, in place."""
+    d = _target(a)
+    s, db = _flat(b)
+    if s != a.size:
+        raise ValueError("matrices cannot be added")
+    for j, v in enumerate(db):
+        d[j] += v
+    return a
+
+
+def imul(m, sc):
+    """Multiply Matrix m by the scalar sc, in place."""
+    d = _target(m)
+    for j in range(len(d)):
+        d[j] *= sc
+    return m
+
+
+def axpy(a, x, y):
+    """Accumulate the scalar a times matrix x into Matrix y; y += a·x."""
+    d = _target(y)
+    s, dx = _flat(x)
+    if s != y.size:
+        raise ValueError("matrices cannot be added")
+    for j, v in enumerate(dx):
+        d[j] += a * v
+    return y
+
+
+def clean_inplace(m):
+    """Set numbers < _LIMIT in Matrix m to 0, in place."""
+    d = _target(m)
+    for j, v in enumerate(d):
+        if abs(v) < _LIMIT:
+            d[j] = 0.0
+    return m
+
+
+def block(a, b, c, d):
+    """Assemble a matrix from four equal-sized square blocks [[a, b], [c, d]]."""
+    s, da = _flat(a)
+    db, dc, dd = _flat(b)[1], _flat(c)[1], _flat(d)[1]
+    if not len(da) == len(db) == len(dc) == len(dd):
+        raise ValueError("blocks must have the same size")
+    rv = []
+    for left, right in ((da, db), (dc, dd)):
+        for k in range(0, s * s, s):
+            rv.extend(left[k:k + s])
+            rv.extend(right[k:k + s])
+    return Matrix(2 * s, rv)
+
+
+def split(m):
+    """
+    Split a matrix with an even size into four equal square blocks.
+
+    Returns:
+        A 4-tuple (a, b, c, d) for m = [[a, b], [c, d]].
+    """
+    size, d = _flat(m)
+    if size % 2:
+        raise ValueError("matrix size must be even")
+    h = size // 2
+    rows = [d[k:k + size] for k in range(0, size * size, size)]
+    return tuple(
+        Matrix(h, [v for row in rows[r:r + h] for v in row[c:c + h]])
+        for r, c in ((0, 0), (0, h), (h, 0), (h, h))
+    )
+
+
+def inv_block(m):
+    """
+    Calculate the inverse of a matrix with an even size from its four square
+    blocks [[a, b], [c, d]], using the Schur complement s = d - c·a⁻¹·b.
+
+    The top-left block must be invertible. For the 6×6 ABD matrix this
+    requires only two 3×3 inversions.
+    """
+    a, b, c, d = split(m)
+    ai = inv(a)
+    cai = matmul(c, ai)
+    si = inv(add(d, mul(matmul(cai, b), -1.0)))
+    aib = matmul(ai, b)
+    # Top-right and bottom-left blocks of the inverse.
+    tr = mul(matmul(aib, si), -1.0)
+    bl = mul(matmul(si, cai), -1.0)
+    tl = add(ai, mul(matmul(tr, cai), -1.0))
+    return clean(block(tl, tr, bl, si))
+
+
+class LU:
+    """
+    LU factorization with partial pivoting of a square matrix.
+
+    The matrix is factored once on creation. The determinant, the inverse
+    and the minors are all derived from that single factorization.
+
+    Properties:
+        size: The size of the matrix.
+        lu: Combined factors as a Matrix; L below the diagonal (with implicit
+            unit diagonal), U on and above it.
+        perm: Row permutation; row j of lu comes from row perm[j] of m.
+        sign: Sign of the permutation, 1 or -1.
+    """
+
+    __slots__ = ("size", "lu", "perm", "sign", "_det", "_inv")
+
+    def __init__(self, m):
+        size, d = _flat(m)
+        a = _rows(d, size)
+        perm = list(range(size))
+        sign = 1
+        for k in range(size):
+            p = max(range(k, size), key=lambda r: abs(a[r][k]))
+            if p != k:
+                a[k], a[p] = a[p], a[k]
+                perm[k], perm[p] = perm[p], perm[k]
+                sign = -sign
+            rk = a[k]
+            pivot = rk[k]
+            if pivot == 0.0:
+                continue
+            for r in range(k + 1, size):
+                row = a[r]
+                f = row[k] / pivot
+                if f != 0.0:
+                    for j in range(k + 1, size):
+                        row[j] -= f * rk[j]
+                row[k] = f
+        self.size = size
+        self.lu = Matrix(size, [v for row in a for v in row])
+        self.perm = perm
+        self.sign = sign
+        self._det = None
+        self._inv = None
+
+    def det(self):
+        """Return the determinant of the factored matrix."""
+        if self._det is None:
+            rv = float(self.sign)
+            for v in self.lu.data[:: self.size + 1]:
+                rv *= v
+            self._det = rv
+        return self._det
 
+    def solve(self, b):
+        """Return x so that m·x = b for the vector b."""
+        size, lu = self.size, self.lu.data
+        # Forward substitution with L.
+        y = [float(b[p]) for p in self.perm]
+        for i in range(1, size):
+            o = i * size
+            y[i] -= sum(lu[o + j] * y[j] for j in range(i))
+        # Backward substitution with U.
+        for i in range(size - 1, -1, -1):
+            o = i * size
+            if lu[o + i] == 0.0:
+                raise ValueError("matrix is singular")
+            s = sum(lu[o + j] * y[j] for j in range(i + 1, size))
+            y[i] = (y[i] - s) / lu[o + i]
+        return y
 
-def _topright(m):
-    """Return the top-right triangular matrix."""
+    def inv(self):
+        """Return the inverse of the factored matrix."""
+        if self._inv is None:
+            size = self.size
+            cols = [
+                self.solve([1.0 if i == j else 0.0 for i in range(size)])
+                for j in range(size)
+            ]
+            self._inv = clean(Matrix(size, [v for row in zip(*cols) for v in row]))
+        return self._inv
+
+    def minor(self, r, k):
+        """
+        Return the determinant of the factored matrix with row r and
+        column k deleted.
+
+        Since the inverse is the transposed cofactor matrix divided by the
+        determinant, this follows from inv()[k][r] without another
+        elimination.
+        """
+        if r < 0 or r > self.size - 1:
+            raise ValueError("invalid row")
+        if k < 0 or k > self.size - 1:
+            raise ValueError("invalid column")
+        sign = -1 if (r + k) % 2 else 1
+        return sign * self.det() * self.inv().data[k * self.size + r]
+
+
+def _flat(m):
+    """
+    Return the size and the row-major elements of a matrix.
+    Nested sequences are checked to be square.
+    """
+    if isinstance(m, Matrix):
+        return m.size, m.data
     size = _square_size(m)
-    copy = deepcopy(m)
-    rv = ident(size)
-    for k in range(size):
-        for p in range(k + 1, size):
-            fact = copy[p][k] / copy[k][k]
-            for j in range(size):
-                copy[p][j] -= fact * copy[k][j]
-                if abs(copy[p][j]) < 1e-7:
-                    copy[p][j] = 0
-                rv[p][j] -= fact * rv[k][j]
-    return copy, rv
+    return size, [v for row in m for v in row]
+
 
+def _target(m):
+    """Return the data of m, which must be a Matrix to be modified in place."""
+    if not isinstance(m, Matrix):
+        raise TypeError("in-place operations require a Matrix")
+    return m.data
 
-def _diag(m):
-    """Return the diagonal of a matrix."""
-    return [m[j][j] for j in range(len(m))]
+
+def _store(out, size, values):
+    """
+    Return values as a new Matrix, or copy them into the Matrix out.
+    All values are computed before out is written, so out may be an argument
+    of the operation as well.
+    """
+    if out is None:
+        return Matrix(size, values)
+    d = _target(out)
+    if out.size != size:
+        raise ValueError("invalid size of output matrix")
+    for j, v in enumerate(values):
+        d[j] = v
+    return out
+
+
+def _rows(d, size):
+    """Return row-major data d as a list of lists of floats."""
+    return [[float(v) for v in d[k:k + size]] for k in range(0, size * size, size)]
 
 
 def _square_size(m):
@@ -163,3 +433,230 @@ def _square_size(m):
         if len(row) != size:
             raise ValueError("invalid row length")
     return size
+
+
+# Kernels
+# These work on row-major sequences of elements and return lists.
+# Almost all matrices in lamprop are 6×6 (C, S, ABD), 5×5 (minors of ABD) or
+# 2×2 (H). Those sizes, and 3×3, have dedicated routines.
+
+
+def _det2(d, size):
+    """Determinant of a 2×2 matrix."""
+    return d[0] * d[3] - d[1] * d[2]
+
+
+def _inv2(d, size):
+    """Inverse of a 2×2 matrix."""
+    return _cleaned(_adj2(d))
+
+
+def _adj2(d):
+    """Inverse of a 2×2 matrix from its adjugate, without cleaning."""
+    dt = d[0] * d[3] - d[1] * d[2]
+    if dt == 0.0:
+        raise ValueError("matrix is singular")
+    return [d[3] / dt, -d[1] / dt, -d[2] / dt, d[0] / dt]
+
+
+def _det3(m, size):
+    """Determinant of a 3×3 matrix, by cofactor expansion of the first row."""
+    a, b, c, d, e, f, g, h, i = m
+    return a * (e * i - f * h) - b * (d * i - f * g) + c * (d * h - e * g)
+
+
+def _inv3(m, size):
+    """Inverse of a 3×3 matrix, using the adjugate."""
+    return _cleaned(_adj3(m))
+
+
+def _adj3(m):
+    """Inverse of a 3×3 matrix from its adjugate, without cleaning."""
+    a, b, c, d, e, f, g, h, i = m
+    A, B, C = e * i - f * h, f * g - d * i, d * h - e * g
+    dt = a * A + b * B + c * C
+    if dt == 0.0:
+        raise ValueError("matrix is singular")
+    return [
+        A / dt,
+        (c * h - b * i) / dt,
+        (b * f - c * e) / dt,
+        B / dt,
+        (a * i - c * g) / dt,
+        (c * d - a * f) / dt,
+        C / dt,
+        (b * g - a * h) / dt,
+        (a * e - b * d) / dt,
+    ]
+
+
+def _det_block(d, size):
+    """
+    Determinant of a 5×5 or 6×6 matrix [[a, b], [c, e]] with a 3×3 block e,
+    as det(a)·det(e - c·a⁻¹·b).
+    """
+    blocks = _schur(d, size)
+    if blocks is None:
+        return _det_ge(d, size)
+    a, ai, ca, b, s = blocks
+    return _DET[size - 3](a, size - 3) * _det3(s, 3)
+
+
+def _inv_block(d, size):
+    """
+    Inverse of a 5×5 or 6×6 matrix [[a, b], [c, e]] with a 3×3 block e,
+    from the inverses of a and of the Schur complement s = e - c·a⁻¹·b.
+    """
+    blocks = _schur(d, size)
+    if blocks is None:
+        return _inv_gj(d, size)
+    a, ai, ca, b, s = blocks
+    h = size - 3
+    si = _adj3(s)
+    # Top-right and bottom-left blocks of the inverse.
+    tr = [-v for v in _mul(_mul(ai, b, h, h, 3), si, h, 3, 3)]
+    bl = [-v for v in _mul(si, ca, 3, 3, h)]
+    tl = [x - y for x, y in zip(ai, _mul(tr, ca, h, 3, h))]
+    rv = []
+    for r in range(h):
+        rv += tl[r * h:r * h + h]
+        rv += tr[r * 3:r * 3 + 3]
+    for r in range(3):
+        rv += bl[r * h:r * h + h]
+        rv += si[r * 3:r * 3 + 3]
+    return _cleaned(rv)
+
+
+def _schur(d, size):
+    """
+    Split a 5×5 or 6×6 matrix into [[a, b], [c, e]], where e is 3×3 and a is
+    2×2 or 3×3, and calculate the Schur complement s = e - c·a⁻¹·b.
+
+    Returns:
+        A tuple (a, a⁻¹, c·a⁻¹, b, s) of row-major sequences, or None when a
+        is too close to singular to do without pivoting.
+    """
+    h = size - 3
+    geta, getb, getc, gete = _BLOCKS[size]
+    a = geta(d)
+    # Hadamard's bound on det(a) is the product of the norms of its rows.
+    bound = 1.0
+    for k in range(0, h * h, h):
+        bound *= math.sqrt(sum(v * v for v in a[k:k + h]))
+    if abs(_DET[h](a, h)) <= _SINGULAR * bound:
+        return None
+    b = getb(d)
+    ai = _adj3(a) if h == 3 else _adj2(a)
+    ca = _mul(getc(d), ai, 3, h, h)
+    s = [x - y for x, y in zip(gete(d), _mul(ca, b, 3, h, 3))]
+    return a, ai, ca, b, s
+
+
+def _blocks(size, h):
+    """
+    Return functions that take the blocks a (h×h), b, c and e out of the
+    row-major elements of a matrix [[a, b], [c, e]].
+    """
+    head, tail = range(h), range(h, size)
+    return tuple(
+        operator.itemgetter(*[r * size + k for r in rows for k in cols])
+        for rows, cols in ((head, head), (head, tail), (tail, head), (tail, tail))
+    )
+
+
+def _mul(x, y, n, m, p):
+    """Product of an n×m and an m×p matrix, both row-major."""
+    if n == m == p == 3:
+        x0, x1, x2, x3, x4, x5, x6, x7, x8 = x
+        y0, y1, y2, y3, y4, y5, y6, y7, y8 = y
+        return [
+            x0 * y0 + x1 * y3 + x2 * y6,
+            x0 * y1 + x1 * y4 + x2 * y7,
+            x0 * y2 + x1 * y5 + x2 * y8,
+            x3 * y0 + x4 * y3 + x5 * y6,
+            x3 * y1 + x4 * y4 + x5 * y7,
+            x3 * y2 + x4 * y5 + x5 * y8,
+            x6 * y0 + x7 * y3 + x8 * y6,
+            x6 * y1 + x7 * y4 + x8 * y7,
+            x6 * y2 + x7 * y5 + x8 * y8,
+        ]
+    mul = operator.mul
+    cols = [y[k::p] for k in range(p)]
+    return [
+        sum(map(mul, x[r:r + m], col)) for r in range(0, n * m, m) for col in cols
+    ]
+
+
+def _det_ge(d, size):
+    """
+    Determinant of a matrix by Gaussian elimination with partial pivoting.
+    Only the rows below the pivot are updated.
+    """
+    a = _rows(d, size)
+    rv = 1.0
+    for k in range(size):
+        p = max(range(k, size), key=lambda r: abs(a[r][k]))
+        if p != k:
+            a[k], a[p] = a[p], a[k]
+            rv = -rv
+        rk = a[k]
+        pivot = rk[k]
+        if pivot == 0.0:
+            return 0.0
+        rv *= pivot
+        for r in range(k + 1, size):
+            row = a[r]
+            f = row[k] / pivot
+            if f != 0.0:
+                a[r] = [x - f * y for x, y in zip(row, rk)]
+    return rv
+
+
+def _inv_gj(d, size):
+    """Inverse of a matrix by Gauss-Jordan elimination with partial
+    pivoting on the augmented matrix [m|I]."""
+    a = [
+        row + [1.0 if i == j else 0.0 for j in range(size)]
+        for i, row in enumerate(_rows(d, size))
+    ]
+    for k in range(size):
+        p = max(range(k, size), key=lambda r: abs(a[r][k]))
+        if p != k:
+            a[k], a[p] = a[p], a[k]
+        pivot = a[k][k]
+        if pivot == 0.0:
+            raise ValueError("matrix is singular")
+        rk = [v / pivot for v in a[k]]
+        a[k] = rk
+        for r in range(size):
+            if r == k:
+                continue
+            row = a[r]
+            f = row[k]
+            if f != 0.0:
+                a[r] = [x - f * y for x, y in zip(row, rk)]
+    return _cleaned([v for row in a for v in row[size:]])
+
+
+def _matmul6(a, b):
+    """Product of two 6×6 matrices, with the inner loop unrolled."""
+    return [
+        r0 * c0 + r1 * c1 + r2 * c2 + r3 * c3 + r4 * c4 + r5 * c5
+        for r0, r1, r2, r3, r4, r5 in zip(*[iter(a)] * 6)
+        for c0, c1, c2, c3, c4, c5 in zip(
+            b[0:6], b[6:12], b[12:18], b[18:24], b[24:30], b[30:36]
+        )
+    ]
+
+
+def _cleaned(d):
+    """Set numbers < _LIMIT to 0 in a freshly created list, in place."""
+    for j, v in enumerate(d):
+        if abs(v) < _LIMIT:
+            d[j] = 0.0
+    return d
+
+
+_DET = {2: _det2, 3: _det3, 5: _det_block, 6: _det_block}
+_INV = {2: _inv2, 3: _inv3, 5: _inv_block, 6: _inv_block}
+_BLOCKS = {5: _blocks(5, 2), 6: _blocks(6, 3)}
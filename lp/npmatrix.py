@@ -0,0 +1,267 @@
+# file: npmatrix.py
+# vim:fileencoding=utf-8:ft=python:fdm=marker
+# NumPy backend for square matrices.
+#
+# Copyright © 2026 R.F. Smith <rsmith@xs4all.nl>. All rights reserved.
+# SPDX-License-Identifier: BSD-2-Clause
+# Created: 2026-10-18T10:12:40+0200
+# Last modified: 2026-10-18T10:12:40+0200
+"""
+Matrix routines with the same interface as lp.matrix, implemented with
+NumPy ndarrays.
+
+This module is only imported when the "numpy" backend is selected with
+lp.set_backend, so lamprop itself keeps working without NumPy. Next to the
+lp.matrix interface, it contains routines that work on stacks of matrices
+with shape (N, n, n) and on arrays of ply angles.
+"""
+
+import numpy as np
+
+_LIMIT = 1e-10  # Numbers smaller than abs(_LIMIT) are set to 0.
+
+
+def matrix(m):
+    """Return m as a 2D float ndarray."""
+    rv = np.asarray(m, dtype=float)
+    if rv.ndim != 2 or rv.shape[0] != rv.shape[1]:
+        raise ValueError("invalid row length")
+    return rv
+
+
+def ident(num):
+    """Create num×num identity matrix."""
+    return np.eye(num)
+
+
+def zeros(num):
+    """Create a num×num 0-filled matrix."""
+    return np.zeros((num, num))
+
+
+def det(m):
+    """Calculate the determinant of a matrix."""
+    return float(np.linalg.det(matrix(m)))
+
+
+def inv(m, out=None):
+    """Calculate the inverse of a matrix"""
+    return _store(out, clean_inplace(np.linalg.inv(matrix(m))))
+
+
+def add(a, b, out=None):
+    """Return the sum of square matrices a and b."""
+    a, b = matrix(a), matrix(b)
+    if a.shape != b.shape:
+        raise ValueError("matrices cannot be multiplied")
+    return _store(out, a + b)
+
+
+def matmul(a, b, out=None):
+    """Returns the matrix product of square matrices a and b."""
+    a, b = matrix(a), matrix(b)
+    if a.shape != b.shape:
+        raise ValueError("matrices cannot be multiplied")
+    return _store(out, a @ b)
+
+
+def mul(m, sc, out=None):
+    """Multiply matrix m by scalar sc."""
+    return _store(out, matrix(m) * sc)
+
+
+def transp(m, out=None):
+    """Return the transpose of m."""
+    return _store(out, matrix(m).T.copy())
+
+
+def delete(m, r, k):
+    """Delete row r and column r from matrix m."""
+    m = matrix(m)
+    size = m.shape[0]
+    if r < 0 or r > size - 1:
+        raise ValueError("invalid row")
+    if k < 0 or k > size - 1:
+        raise ValueError("invalid column")
+    return np.delete(np.delete(m, r, axis=0), k, axis=1)
+
+
+def clean(m, out=None):
+    """Set matrix numbers < _LIMIT with 0."""
+    return _store(out, clean_inplace(matrix(m).copy()))
+
+
+def iadd(a, b):
+    """Add matrix b to a, in place."""
+    a += matrix(b)
+    return a
+
+
+def imul(m, sc):
+    """Multiply matrix m by the scalar sc, in place."""
+    m *= sc
+    return m
+
+
+def axpy(a, x, y):
+    """Accumulate the scalar a times matrix x into y; y += a·x."""
+    y += a * matrix(x)
+    return y
+
+
+def clean_inplace(m):
+    """Set numbers < _LIMIT in m to 0, in place. Works on stacks as well."""
+    m[np.abs(m) < _LIMIT] = 0.0
+    return m
+
+
+def block(a, b, c, d):
+    """Assemble a matrix from four equal-sized square blocks [[a, b], [c, d]]."""
+    a, b, c, d = matrix(a), matrix(b), matrix(c), matrix(d)
+    if not a.shape == b.shape == c.shape == d.shape:
+        raise ValueError("blocks must have the same size")
+    return np.block([[a, b], [c, d]])
+
+
+def split(m):
+    """
+    Split a matrix with an even size into four equal square blocks.
+
+    Returns:
+        A 4-tuple (a, b, c, d) for m = [[a, b], [c, d]].
+    """
+    m = matrix(m)
+    size = m.shape[0]
+    if size % 2:
+        raise ValueError("matrix size must be even")
+    h = size // 2
+    return m[:h, :h].copy(), m[:h, h:].copy(), m[h:, :h].copy(), m[h:, h:].copy()
+
+
+def inv_block(m):
+    """
+    Calculate the inverse of a matrix with an even size from its four square
+    blocks [[a, b], [c, d]], using the Schur complement s = d - c·a⁻¹·b.
+    """
+    a, b, c, d = split(m)
+    ai = np.linalg.inv(a)
+    cai = c @ ai
+    si = np.linalg.inv(d - cai @ b)
+    tr = -(ai @ b @ si)
+    bl = -(si @ cai)
+    return clean_inplace(np.block([[ai - tr @ cai, tr], [bl, si]]))
+
+
+class LU:
+    """
+    Factorization of a square matrix, with the interface of lp.matrix.LU.
+
+    NumPy's LAPACK routines do the actual work; the inverse is computed once
+    and the determinant and minors are derived from it.
+    """
+
+    __slots__ = ("size", "m", "_det", "_inv")
+
+    def __init__(self, m):
+        self.m = matrix(m)
+        self.size = self.m.shape[0]
+        self._det = None
+        self._inv = None
+
+    def det(self):
+        """Return the determinant of the factored matrix."""
+        if self._det is None:
+            self._det = float(np.linalg.det(self.m))
+        return self._det
+
+    def solve(self, b):
+        """Return x so that m·x = b for the vector b."""
+        return np.linalg.solve(self.m, np.asarray(b, dtype=float))
+
+    def inv(self):
+        """Return the inverse of the factored matrix."""
+        if self._inv is None:
+            self._inv = clean_inplace(np.linalg.inv(self.m))
+        return self._inv
+
+    def minor(self, r, k):
+        """
+        Return the determinant of the factored matrix with row r and
+        column k deleted.
+        """
+        if r < 0 or r > self.size - 1:
+            raise ValueError("invalid row")
+        if k < 0 or k > self.size - 1:
+            raise ValueError("invalid column")
+        sign = -1 if (r + k) % 2 else 1
+        return sign * self.det() * float(self.inv()[k, r])
+
+
+# Stacks of matrices
+
+
+def inv_stack(m):
+    """Invert every matrix in a (N, n, n) stack."""
+    return clean_inplace(np.linalg.inv(np.asarray(m, dtype=float)))
+
+
+def tbar_stack(degrees):
+    """
+    Return a (N, 6, 6) stack of matrices for rotating lamina coordinates
+    around the z-axis, one for every angle in degrees.
+    """
+    θ = np.radians(np.atleast_1d(np.asarray(degrees, dtype=float)))
+    c, s = np.cos(θ), np.sin(θ)
+    rv = np.zeros((θ.size, 6, 6))
+    # Barbero:2008 p. 12 & 15
+    rv[:, 0, 0], rv[:, 0, 1], rv[:, 0, 5] = c * c, s * s, c * s
+    rv[:, 1, 0], rv[:, 1, 1], rv[:, 1, 5] = s * s, c * c, -c * s
+    rv[:, 2, 2] = 1.0
+    rv[:, 3, 3], rv[:, 3, 4] = c, -s
+    rv[:, 4, 3], rv[:, 4, 4] = s, c
+    rv[:, 5, 0], rv[:, 5, 1], rv[:, 5, 5] = -2 * c * s, 2 * c * s, c * c - s * s
+    return rv
+
+
+def rotate_stack(Cp, degrees):
+    """
+    Rotate the 6×6 stiffness matrix Cp in lamina coordinates to every angle
+    in degrees. Returns a (N, 6, 6) stack Tbarᵀ·Cp·Tbar.
+    """
+    T = tbar_stack(degrees)
+    return np.transpose(T, (0, 2, 1)) @ matrix(Cp) @ T
+
+
+def qbar_stack(Q11, Q12, Q22, Q66, degrees):
+    """
+    Calculate the transformed reduced stiffnesses for arrays of lamina
+    properties and angles. The arguments are broadcast against each other.
+
+    Returns:
+        A 6-tuple of arrays (Q̅11, Q̅12, Q̅16, Q̅22, Q̅26, Q̅66).
+    """
+    a = np.radians(np.asarray(degrees, dtype=float))
+    m, n = np.cos(a), np.sin(a)
+    m2, n2 = m * m, n * n
+    m3, m4 = m2 * m, m2 * m2
+    n3, n4 = n2 * n, n2 * n2
+    # Hyer:1997, p. 182
+    Q̅11 = Q11 * m4 + 2 * (Q12 + 2 * Q66) * n2 * m2 + Q22 * n4
+    QA = Q11 - Q12 - 2 * Q66
+    QB = Q12 - Q22 + 2 * Q66
+    Q̅12 = (Q11 + Q22 - 4 * Q66) * n2 * m2 + Q12 * (n4 + m4)
+    Q̅16 = QA * n * m3 + QB * n3 * m
+    Q̅22 = Q11 * n4 + 2 * (Q12 + 2 * Q66) * n2 * m2 + Q22 * m4
+    Q̅26 = QA * n3 * m + QB * n * m3
+    Q̅66 = (Q11 + Q22 - 2 * Q12 - 2 * Q66) * n2 * m2 + Q66 * (n4 + m4)
+    return Q̅11, Q̅12, Q̅16, Q̅22, Q̅26, Q̅66
+
+
+def _store(out, values):
+    """Return values, or copy them into out."""
+    if out is None:
+        return values
+    if out.shape != values.shape:
+        raise ValueError("invalid size of output matrix")
+    out[...] = values
+    return out
@@ -7,7 +7,7 @@
 """Parser for lamprop files."""
 
 import logging
-from .core import fiber, resin, lamina, laminate
+from .core import fiber, resin, strength, laminate, lamina_cache
 
 msg = logging.getLogger("parser")
 
@@ -23,7 +23,7 @@ def parse(filename):
         A list of types.laminate.
     """
     try:
-        rd, fd, ld = _directives(filename)
+        rd, fd, ld, xd = _directives(filename)
     except IOError:
         msg.warning("cannot read '{}'.".format(filename))
         return []
@@ -31,13 +31,15 @@ def parse(filename):
     msg.info("found {} fibers in '{}'".format(len(fdict), filename))
     rdict = _get_components(rd, resin)
     msg.info("found {} resins in '{}'".format(len(rdict), filename))
+    sdict = _get_strengths(xd, fdict)
+    msg.info("found {} strengths in '{}'".format(len(sdict), filename))
     boundaries = [j for j in range(len(ld)) if ld[j][1][0] == "t"] + [len(ld)]
     bpairs = [(a, b) for a, b in zip(boundaries[:-1], boundaries[1:])]
     msg.info("found {} possible laminates in '{}'".format(len(bpairs), filename))
     laminates = []
     for a, b in bpairs:
         current = ld[a:b]
-        lam = _laminate(current, rdict, fdict)
+        lam = _laminate(current, rdict, fdict, sdict)
         if lam:
             laminates.append(lam)
     msg.info("found {} laminates in '{}'".format(len(laminates), filename))
@@ -52,7 +54,8 @@ def _directives(filename):
         filename: The name of the file to parse.
 
     Returns:
-        A 3-tuple (resin directives, fiber directives, laminate directives)
+        A 4-tuple (resin directives, fiber directives, laminate directives,
+        strength directives)
     """
     with open(filename, encoding="utf-8") as df:
         data = [ln.strip() for ln in df]
@@ -60,13 +63,14 @@ def _directives(filename):
     directives = [
         (num, ln)
         for num, ln in enumerate(data, start=1)
-        if len(ln) > 1 and ln[1] == ":" and ln[0] in "tmlsfr"
+        if len(ln) > 1 and ln[1] == ":" and ln[0] in "tmlsfrx"
     ]
     msg.info("found {} directives in '{}'".format(len(directives), filename))
     rd = [(num, ln) for num, ln in directives if ln[0] == "r"]
     fd = [(num, ln) for num, ln in directives if ln[0] == "f"]
     ld = [(num, ln) for num, ln in directives if ln[0] in "tmls"]
-    return rd, fd, ld
+    xd = [(num, ln) for num, ln in directives if ln[0] == "x"]
+    return rd, fd, ld, xd
 
 
 def _get_numbers(directive):
@@ -90,7 +94,7 @@ def _get_numbers(directive):
     return tuple(numbers), remain
 
 
-def _laminate(ld, resins, fibers):
+def _laminate(ld, resins, fibers, strengths=None):
     """
     Parse a laminate definition.
 
@@ -101,6 +105,7 @@ def _laminate(ld, resins, fibers):
         ld: A sequence of (number, line) tuples describing a laminate.
         resins: A dictionary of resins, keyed by their names.
         fibers: A dictionary of fibers, keyed by their names.
+        strengths: A dictionary of ply strengths, keyed by fiber name.
 
     Returns:
         A laminate dictionary, or None.
@@ -136,7 +141,7 @@ def _laminate(ld, resins, fibers):
     if sym:
         msg.info("laminate '{}' is symmetric".format(lname))
         llist = llist + list(reversed(llist))
-    return laminate(lname, llist)
+    return laminate(lname, llist, True if sym else None, strengths or None)
 
 
 def _get_components(directives, tp):
@@ -181,6 +186,42 @@ def _get_components(directives, tp):
     return {comp.name: comp for comp in rv}
 
 
+def _get_strengths(directives, fibers):
+    """
+    Parse strength lines.
+
+    Arguments:
+        directives: A sequence of (number, line) tuples describing strengths.
+        fibers: A dictionary of fibers, keyed by their names.
+
+    Returns:
+        A dictionary of Strength, keyed by fiber name.
+    """
+    rv = {}
+    w1 = "expected 5 numbers for a strength on line {}, found {}; skipping."
+    w2 = 'duplicate strength for "{}" on line {} ignored.'
+    w3 = "unknown fiber '{}' on line {}; skipping."
+    w4 = "strengths must be >0 on line {}; skipping."
+    for directive in directives:
+        ln = directive[0]
+        numbers, name = _get_numbers(directive)
+        count = len(numbers)
+        if count != 5:
+            msg.warning(w1.format(ln, count))
+            continue
+        if name in rv:
+            msg.warning(w2.format(name, ln))
+            continue
+        if name not in fibers:
+            msg.warning(w3.format(name, ln))
+            continue
+        if min(numbers) <= 0:
+            msg.warning(w4.format(ln))
+            continue
+        rv[name] = strength(*numbers, name)
+    return rv
+
+
 def _get_lamina(directive, fibers, resin, vf):
     """
     Parse a lamina line.
@@ -208,4 +249,4 @@ def _get_lamina(directive, fibers, resin, vf):
     if fname not in fibers:
         msg.warning(w2.format(fname, ln))
         return None
-    return lamina(fibers[fname], resin, *numbers)
+    return lamina_cache.lamina(fibers[fname], resin, *numbers)
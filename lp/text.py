@@ -58,6 +58,20 @@ def out(lam, eng, mat, fea):  # {{{1
     return lines
 
 
+def polar(lam, n):  # {{{1
+    """Return the in-plane properties in n directions as a list of lines."""
+    p = core.polar(lam, n)
+    lines = [
+        f"# in-plane properties of {lam.name} in {n} directions",
+        "# angle [°]   E_x [MPa]   E_y [MPa]  G_xy [MPa]    ν_xy    α_x [K⁻¹]    α_y [K⁻¹]",
+    ]
+    s = "{0:11.6g} {1:11.0f} {2:11.0f} {3:11.0f} {4:7.5f} {5:12.4g} {6:12.4g}"
+    for row in zip(p.angle, p.Ex, p.Ey, p.Gxy, p.νxy, p.αx, p.αy):
+        lines.append(s.format(*row))
+    lines.append("")
+    return lines
+
+
 def _engprop(l):  # {{{1
     """Return the engineering properties as a plain text table in the form of
     a list of lines."""
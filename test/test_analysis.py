@@ -0,0 +1,173 @@
+# file: test_analysis.py
+# vim:fileencoding=utf-8:ft=python:fdm=marker
+#
+# Author: R.F. Smith <rsmith@xs4all.nl>
+# Created: 2026-10-18T17:10:52+0200
+# Last modified: 2026-10-18T17:10:52+0200
+"""Tests for the stress and strain analysis of laminates."""
+
+import sys
+import math
+import pytest
+# Inserting the path is needed to make sure that the module here is loaded,
+# not an installed version!
+sys.path.insert(1, '.')
+
+import lp.core as core  # noqa
+from lp.core import fiber, resin, lamina, laminate  # noqa
+from lp.analysis import ply_stresses, profile  # noqa
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+
+
+def resultants(lam, rv, case):  # {{{1
+    """Integrate the stresses through the thickness with Simpson's rule,
+    which is exact for stresses that are linear in z."""
+    N, M = [0.0] * 3, [0.0] * 3
+    plies = rv.shape[1]
+    for j, la in enumerate(lam.layers):
+        z = rv.z[3 * j:3 * j + 3]
+        for p, w in enumerate((1, 4, 1)):
+            base = ((case * plies + j) * 3 + p) * 3
+            for k in range(3):
+                s = rv.stress[base + k] * w * la.thickness / 6
+                N[k] += s
+                M[k] += s * z[p]
+    return N + M
+
+
+def test_ud():  # {{{1
+    la = lamina(hf, hr, 100, 0, 0.5)
+    ud = laminate('ud', [la, la, la, la])
+    rv = ply_stresses(ud, [(100, 0, 0, 0, 0, 0)])
+    assert rv.shape == (1, 4, 3, 3)
+    assert len(rv.stress) == 36
+    assert math.isclose(rv.z[0], -ud.thickness / 2)
+    assert math.isclose(rv.z[-1], ud.thickness / 2)
+    for j in range(0, 36, 3):
+        assert math.isclose(rv.stress[j], 100 / ud.thickness)
+        assert math.isclose(rv.stress12[j], 100 / ud.thickness)
+        assert math.isclose(rv.strain[j], 100 / (ud.Ex * ud.thickness))
+        assert abs(rv.stress[j + 1]) < 1e-9
+    # Free thermal expansion of a UD laminate is stress free.
+    rv = ply_stresses(ud, [(0, 0, 0, 0, 0, 0)], -100)
+    assert max(abs(v) for v in rv.stress) < 1e-9
+
+
+def test_equilibrium():  # {{{1
+    A = lamina(hf, hr, 100, 0, 0.5)
+    B = lamina(hf, hr, 200, 30, 0.5)
+    C = lamina(hf, hr, 100, 90, 0.5)
+    lam = laminate('unsymmetric', [A, B, C])
+    loads = [
+        (100, 0, 0, 0, 0, 0),
+        (0, -50, 20, 3, 0, 0),
+        (10, 20, 30, 4, -5, 6),
+    ]
+    rv = ply_stresses(lam, loads, (0, 0, -120))
+    assert rv.shape == (3, 3, 3, 3)
+    for case, load in enumerate(loads):
+        for a, b in zip(resultants(lam, rv, case), load):
+            assert abs(a - b) < 1e-6 * max(1, abs(b))
+    # Stresses in ply coordinates.
+    for case in range(3):
+        for p in range(3):
+            base = ((case * 3 + 1) * 3 + p) * 3
+            σx, σy, τxy = rv.stress[base:base + 3]
+            σ1, σ2, τ12 = rv.stress12[base:base + 3]
+            assert math.isclose(σ1 + σ2, σx + σy, abs_tol=1e-9)
+            m, n = math.cos(math.radians(30)), math.sin(math.radians(30))
+            expected = m * m * σx + n * n * σy + 2 * m * n * τxy
+            assert math.isclose(σ1, expected, abs_tol=1e-9)
+
+
+def test_errors():  # {{{1
+    la = lamina(hf, hr, 100, 0, 0.5)
+    ud = laminate('ud', [la, la])
+    with pytest.raises(ValueError):
+        ply_stresses(ud, [(1, 2, 3)])
+    with pytest.raises(ValueError):
+        ply_stresses(ud, [(0,) * 6, (0,) * 6], (1, 2, 3))
+
+
+def test_numpy():  # {{{1
+    pytest.importorskip("numpy")
+    layers = [lamina(hf, hr, 100 + 50 * (a == 90), a, 0.5)
+              for a in (0, 45, -45, 90, 30)]
+    loads = [(100, -50, 20, 5, -10, 2), (0, 0, 0, 0, 0, 0), (10, 20, 0, 0, 0, 3)]
+    ref = ply_stresses(laminate('ps', layers), loads, (-20, 0, 30))
+    core.set_backend("numpy")
+    try:
+        rv = ply_stresses(laminate('ps', layers), loads, (-20, 0, 30))
+    finally:
+        core.set_backend("python")
+    assert rv.shape == ref.shape and rv.z == ref.z
+    for name in ("strain", "stress", "strain12", "stress12"):
+        a, b = getattr(rv, name), getattr(ref, name)
+        assert len(a) == len(b)
+        for x, y in zip(a, b):
+            assert math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def test_profile():  # {{{1
+    A = lamina(hf, hr, 100, 0, 0.5)
+    B = lamina(hf, hr, 200, 30, 0.5)
+    C = lamina(hf, hr, 100, 90, 0.5)
+    lam = laminate('unsymmetric', [A, B, C])
+    load = (10, 20, 30, 4, -5, 6)
+    rv = profile(lam, load, (3, -2), -50, samples=5)
+    assert rv.shape == (15, len(rv.columns))
+    assert len(rv.data) == 15 * len(rv.columns)
+    assert list(rv.ply) == [0] * 5 + [1] * 5 + [2] * 5
+    rows = [rv.data[k:k + rv.shape[1]] for k in range(0, len(rv.data), rv.shape[1])]
+    # The in-plane stresses agree with ply_stresses.
+    ps = ply_stresses(lam, [load], -50)
+    for j in range(3):
+        for p, row in ((0, rows[5 * j]), (1, rows[5 * j + 2]), (2, rows[5 * j + 4])):
+            base = (j * 3 + p) * 3
+            assert math.isclose(row[0], ps.z[3 * j + p], abs_tol=1e-12)
+            for a, b in zip(row[4:7], ps.stress[base:base + 3]):
+                assert math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    # Interlaminar shear is 0 at the faces, and sums to the shear forces.
+    τxz, τyz = rv.columns.index('τxz'), rv.columns.index('τyz')
+    for k in (τxz, τyz):
+        assert abs(rows[0][k]) < 1e-12 and abs(rows[-1][k]) < 1e-9
+    Q = [0.0, 0.0]
+    for j in range(3):
+        r = rows[5 * j:5 * j + 5]
+        h = (r[4][0] - r[0][0]) / 4
+        for n, k in enumerate((τxz, τyz)):
+            simpson = r[0][k] + 4 * r[1][k] + 2 * r[2][k] + 4 * r[3][k] + r[4][k]
+            Q[n] += h / 3 * simpson
+    assert math.isclose(Q[0], 3, rel_tol=1e-9)
+    assert math.isclose(Q[1], -2, rel_tol=1e-9)
+
+
+def test_profile_numpy():  # {{{1
+    pytest.importorskip("numpy")
+    layers = [lamina(hf, hr, 100 + 50 * (a == 90), a, 0.5)
+              for a in (0, 45, -45, 90, 30)]
+    args = ((100, -50, 20, 5, -10, 2), (3, -2), -20, 7)
+    ref = profile(laminate('p', layers), *args)
+    core.set_backend("numpy")
+    try:
+        rv = profile(laminate('p', layers), *args)
+    finally:
+        core.set_backend("python")
+    assert rv.shape == ref.shape and rv.ply == ref.ply
+    assert len(rv.data) == len(ref.data)
+    for x, y in zip(rv.data, ref.data):
+        assert math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-12)
+
+
+def test_profile_ud():  # {{{1
+    la = lamina(hf, hr, 100, 0, 0.5)
+    ud = laminate('ud', [la] * 4)
+    rv = profile(ud, (0,) * 6, (10, 0), samples=3)
+    τxz = rv.columns.index('τxz')
+    # The parabolic distribution of a homogeneous beam.
+    middle = rv.data[(5 * rv.shape[1]) + τxz]
+    assert math.isclose(middle, 1.5 * 10 / ud.thickness, rel_tol=1e-9)
+    with pytest.raises(ValueError):
+        profile(ud, (0,) * 6, samples=1)
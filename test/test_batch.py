@@ -0,0 +1,102 @@
+# file: test_batch.py
+# vim:fileencoding=utf-8:ft=python:fdm=marker
+#
+# Author: R.F. Smith <rsmith@xs4all.nl>
+# Created: 2026-10-18T15:31:18+0200
+# Last modified: 2026-10-18T16:02:45+0200
+"""Test for evaluating many laminates"""
+
+import sys
+import math
+import pytest
+# Inserting the path is needed to make sure that the module here is loaded,
+# not an installed version!
+sys.path.insert(1, '.')
+
+import lp.core as core  # noqa
+from lp.core import fiber, resin, lamina, laminate, lamina_cache  # noqa
+from lp.batch import sweep, montecarlo  # noqa
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+template = laminate('t', [lamina(hf, hr, 200, a, 0.5) for a in (0, 45, -45, 90)])
+
+
+def test_sweep():  # {{{1
+    vfs, fws, stackings = (0.4, 0.5, 0.6), (100, 300), ((0, 30, -30, 90), (0, 0, 90, 90))
+    chunks = list(sweep(template, vf=vfs, angles=stackings, fiber_weight=fws,
+                        repeat=(1, 2), processes=1, chunksize=5))
+    assert [len(c.Ex) for c in chunks] == [5, 5, 5, 5, 4]
+    j = 0
+    for c in chunks:
+        for n in range(len(c.Ex)):
+            assert c.index[n] == j
+            j += 1
+            stacking = stackings[c.angles[n]]
+            layers = [lamina(hf, hr, c.fiber_weight[n], a, c.vf[n]) for a in stacking]
+            lam = laminate('ref', layers * c.repeat[n])
+            for name in ('Ex', 'Ey', 'Gxy', 'νxy', 'αx', 'αy', 'thickness'):
+                assert math.isclose(getattr(c, name)[n], getattr(lam, name))
+            assert math.isclose(c.weight[n], lam.fiber_weight + lam.resin_weight)
+    assert j == 3 * 2 * 2 * 2
+
+
+def test_template():  # {{{1
+    (c,) = sweep(template, processes=1)
+    assert list(c.angles) == [-1] and math.isnan(c.vf[0])
+    assert c.Ex[0] == template.Ex
+    with pytest.raises(ValueError):
+        sweep(template, angles=[(0, 90)])
+
+
+def test_processes():  # {{{1
+    kw = dict(vf=(0.4, 0.5, 0.6), repeat=(1, 2, 3), chunksize=2)
+    serial = [x for c in sweep(template, processes=1, **kw) for x in c.Ex]
+    pooled = [x for c in sweep(template, processes=2, **kw) for x in c.Ex]
+    assert serial == pooled
+
+
+def test_montecarlo():  # {{{1
+    spread = {("Hyer's carbon fiber", 'E1'): 0.05,
+              ("Hyer's resin", 'E'): ('uniform', 4000, 5000),
+              ("Hyer's resin", 'α'): ('normal', 41.4e-6, 4e-6)}
+    r = montecarlo(template, spread, 200, seed=12, processes=1, chunksize=64)
+    assert r.n == 200
+    assert r.Ex.min <= r.Ex.percentiles[5] <= r.Ex.percentiles[50]
+    assert r.Ex.percentiles[50] <= r.Ex.percentiles[95] <= r.Ex.max
+    assert math.isclose(r.Ex.mean, template.Ex, rel_tol=0.05)
+    assert r.thickness.std == 0.0
+    again = montecarlo(template, spread, 200, seed=12, processes=2, chunksize=50)
+    assert again.Ex == r.Ex and again.αy == r.αy
+    fixed = montecarlo(template, {("Hyer's resin", 'ν'): 0.0}, 3, processes=1)
+    assert math.isclose(fixed.Gxy.max, template.Gxy)
+    assert math.isclose(fixed.Gxy.min, template.Gxy)
+    with pytest.raises(ValueError):
+        montecarlo(template, {('T300', 'E1'): 0.05}, 10)
+    # The shared caches are left alone.
+    before = (len(core._plies), len(lamina_cache), lamina_cache.info().misses)
+    montecarlo(template, spread, 50, seed=1, processes=1)
+    assert (len(core._plies), len(lamina_cache), lamina_cache.info().misses) == before
+    with pytest.raises(ValueError):
+        montecarlo(template, {("Hyer's resin", 'E1'): 0.05}, 10)
+
+
+def test_montecarlo_numpy():  # {{{1
+    pytest.importorskip("numpy")
+    spread = {("Hyer's carbon fiber", 'E1'): 0.05,
+              ("Hyer's carbon fiber", 'ρ'): 0.02,
+              ("Hyer's resin", 'E'): ('uniform', 4000, 5000),
+              ("Hyer's resin", 'α'): ('normal', 41.4e-6, 4e-6)}
+    unsym = [lamina(hf, hr, 100 + 100 * (a == 90), a, 0.5) for a in (0, 30, 90)]
+    for t in (template, laminate('s', unsym + unsym[::-1]), unsym):
+        r = montecarlo(t, spread, 100, seed=5, chunksize=40)
+        core.set_backend("numpy")
+        try:
+            n = montecarlo(t, spread, 100, seed=5, chunksize=40)
+        finally:
+            core.set_backend("python")
+        for name in ("Ex", "Ey", "Ez", "Gxy", "Gxz", "Gyz", "νxy", "νyx",
+                     "αx", "αy", "ρ", "thickness", "weight"):
+            a, b = getattr(r, name), getattr(n, name)
+            for x, y in ((a.mean, b.mean), (a.min, b.min), (a.max, b.max)):
+                assert math.isclose(x, y, rel_tol=1e-9)
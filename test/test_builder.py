@@ -0,0 +1,90 @@
+# file: test_builder.py
+# vim:fileencoding=utf-8:ft=python:fdm=marker
+#
+# Author: R.F. Smith <rsmith@xs4all.nl>
+# Created: 2026-10-18T13:40:12+0200
+# Last modified: 2026-10-18T14:35:50+0200
+"""Test for the incremental laminate builder"""
+
+import sys
+import math
+import pytest
+# Inserting the path is needed to make sure that the module here is loaded,
+# not an installed version!
+sys.path.insert(1, '.')
+
+from lp.core import fiber, resin, lamina, laminate  # noqa
+from lp.builder import LaminateBuilder, zones  # noqa
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+
+names = ('thickness', 'fiber_weight', 'ρ', 'vf', 'resin_weight', 'wf', 'Ex',
+         'Ey', 'Ez', 'Gxy', 'Gyz', 'Gxz', 'νxy', 'νyx', 'αx', 'αy', 'tEx',
+         'tGxy', 'tνxy')
+
+
+def same(b, lam):
+    for n in names:
+        assert math.isclose(getattr(b, n), getattr(lam, n), rel_tol=1e-11)
+    for M in ('ABD', 'abd', 'H', 'C'):
+        for r1, r2 in zip(getattr(b, M), getattr(lam, M)):
+            for x, y in zip(r1, r2):
+                assert math.isclose(x, y, rel_tol=1e-11, abs_tol=1e-12)
+                assert (x == 0) == (y == 0)
+
+
+def test_append():  # {{{1
+    A = lamina(hf, hr, 100, 0, 0.5)
+    B = lamina(hf, hr, 200, 45, 0.5)
+    b = LaminateBuilder()
+    assert len(b) == 0
+    with pytest.raises(AttributeError):
+        b.Ex
+    assert not hasattr(b, "Ex")
+    assert getattr(b, "Ex", None) is None
+    for la in (A, B, B, A):
+        b.append(la)
+    assert b.layers == (A, B, B, A)
+    same(b, laminate('sym', [A, B, B, A]))
+    assert b.ABD[0][3] == 0.0
+    b.append(B)
+    same(b, laminate('unsym', [A, B, B, A, B]))
+    assert b.pop() == B
+    same(b, laminate('sym', [A, B, B, A]))
+
+
+def test_edit():  # {{{1
+    A = lamina(hf, hr, 100, 0, 0.5)
+    B = lamina(hf, hr, 200, 45, 0.55)
+    C = lamina(hf, hr, 300, 90, 0.5)
+    b = LaminateBuilder([A, B, C])
+    b.insert(1, C)
+    same(b, laminate('l', [A, C, B, C]))
+    b.pop(0)
+    same(b, laminate('l', [C, B, C]))
+    b[1] = A
+    same(b, laminate('l', [C, A, C]))
+    b.swap(0, 1)
+    same(b, laminate('l', [A, C, C]))
+    b.reangle(2, -30)
+    assert b[2].angle == -30
+    same(b, laminate('l', [A, C, b[2]]))
+    with pytest.raises(IndexError):
+        b.pop(3)
+    b.refresh()
+    same(b, laminate('l', b.layers))
+    assert b.laminate('l') == laminate('l', b.layers)
+
+
+def test_zones():  # {{{1
+    angles = (0, 45, -45, 90, 0, 30, 90, -45, 45, 0)
+    master = [lamina(hf, hr, 100 + 100 * (n % 3 == 0), a, 0.5)
+              for n, a in enumerate(angles)]
+    drops = ([], [3], [0, 9], [4, 5, 6], [1, 2, 7, 8], range(1, 10))
+    for pattern, zone in zip(drops, zones(master, drops)):
+        layers = [la for n, la in enumerate(master) if n not in pattern]
+        assert zone.layers == tuple(layers)
+        same(zone, laminate('zone', layers))
+    with pytest.raises(ValueError):
+        zones(master, [[10]])
@@ -0,0 +1,22 @@
+# file: test_console.py
+# vim:fileencoding=utf-8:ft=python:fdm=marker
+#
+# Author: R.F. Smith <rsmith@xs4all.nl>
+# Created: 2026-10-18T17:10:52+0200
+# Last modified: 2026-10-18T17:10:52+0200
+"""Test for the lamprop command-line options."""
+
+import argparse
+import sys
+import pytest
+
+sys.path.insert(1, '.')
+
+from console import positive_int  # noqa
+
+
+def test_positive_int():  # {{{1
+    assert positive_int("12") == 12
+    for text in ("0", "-3", "two"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            positive_int(text)
@@ -8,11 +8,17 @@
 
 import sys
 import math
+import pickle
+import pytest
 # Inserting the path is needed to make sure that the module here is loaded,
 # not an installed version!
 sys.path.insert(1, '.')
 
-from lp.core import fiber, resin, lamina, laminate  # noqa
+import lp.matrix as lpm  # noqa
+from lp.core import (fiber, resin, lamina, laminate, lamina_batch,  # noqa
+                     ply_material, LaminaCache, lamina_cache, tbar,
+                     rotate_stiffness, rotate_stiffness_many, rotate_laminate,
+                     rotate_laminate_many, polar, sensitivities, set_backend)
 
 hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
 hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
@@ -152,3 +158,231 @@ def test_qi():  # {{{1
     assert math.isclose(qi.tνxy, 0.32977, rel_tol=0.01)
     assert math.isclose(qi.tνxz, 0.28244, rel_tol=0.01)
     assert math.isclose(qi.tνyz, 0.28244, rel_tol=0.01)
+
+
+def test_lamina_batch():  # {{{1
+    angles = [0, 90, 45, -45, 30]
+    vfs = [0.5, 0.5, 0.55, 55, 0.6]
+    b = lamina_batch(hf, hr, 100, angles, vfs)
+    assert b.size == 5
+    assert b.vf[3] == 0.55
+    for j, (a, vf) in enumerate(zip(angles, vfs)):
+        la = lamina(hf, hr, 100, a, vf)
+        for name in ("thickness", "E1", "E2", "G12", "ν12", "αx", "αy", "αxy",
+                     "Q̅11", "Q̅16", "Q̅66", "Q̅s44", "Q̅s45", "ρ"):
+            assert getattr(b, name)[j] == getattr(la, name)
+        assert b.C[j] == la.C
+
+
+def test_lamina_batch_numpy():  # {{{1
+    pytest.importorskip("numpy")
+    angles = [0, 90, 45, -45, 30, 45]
+    vfs = [0.5, 0.5, 0.55, 0.55, 0.6, 0.5]
+    b = lamina_batch(hf, hr, 100, angles, vfs)
+    set_backend("numpy")
+    try:
+        n = lamina_batch(hf, hr, 100, angles, vfs)
+    finally:
+        set_backend("python")
+    for name in ("αx", "αy", "αxy", "Q̅11", "Q̅12", "Q̅16", "Q̅22", "Q̅26",
+                 "Q̅66", "Q̅s44", "Q̅s45", "Q̅s55"):
+        for x, y in zip(getattr(n, name), getattr(b, name)):
+            assert math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-9)
+    for cn, cb in zip(n.C, b.C):
+        for rn, rb in zip(cn, cb):
+            for x, y in zip(rn, rb):
+                assert math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def test_ply_material():  # {{{1
+    p = ply_material(hf, hr, 0.5)
+    assert ply_material(hf, hr, 50) is p
+    A = lamina(hf, hr, 100, 30, 0.5)
+    assert A.ply is p
+    r = p.rotate(30)
+    assert (r.Q̅11, r.Q̅16, r.αxy) == (A.Q̅11, A.Q̅16, A.αxy)
+    assert r.C == A.C
+
+
+def test_lamina_cache():  # {{{1
+    cache = LaminaCache(maxsize=2)
+    A = cache.lamina(hf, hr, 100, 0, 0.5)
+    assert cache.lamina(hf, hr, 100.0, 0.0, 50) is A
+    B = cache.lamina(hf, hr, 100, 90, 0.5)
+    cache.lamina(hf, hr, 100, 0, 0.5)
+    cache.lamina(hf, hr, 100, 45, 0.5)  # Evicts B.
+    assert cache.lamina(hf, hr, 100, 90, 0.5) is not B
+    info = cache.info()
+    assert (info.hits, info.misses, info.currsize) == (2, 4, 2)
+    cache.resize(1)
+    assert len(cache) == 1
+    cache.clear()
+    assert cache.info().hits == 0 and len(cache) == 0
+
+
+def test_module_lamina_cache():  # {{{1
+    lamina_cache.clear()
+    A = lamina_cache.lamina(hf, hr, 100, 0, 0.5)
+    assert lamina_cache.info().misses == 1
+    # A different material must not empty the cache.
+    B = lamina_cache.lamina(hf, hr, 100, 0, 0.6)
+    assert lamina_cache.lamina(hf, hr, 100, 0, 0.5) is A
+    assert lamina_cache.lamina(hf, hr, 100, 0, 0.6) is B
+    info = lamina_cache.info()
+    assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+
+
+def test_records():  # {{{1
+    A = lamina(hf, hr, 100, 0, 0.5)
+    assert A == lamina(hf, hr, 100.0, 0.0, 0.5)
+    assert hash(A) == hash(lamina(hf, hr, 100.0, 0.0, 0.5))
+    assert A != lamina(hf, hr, 100, 90, 0.5)
+    assert fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber") == hf
+    ud = laminate('ud', [A, A])
+    assert len({ud, laminate('ud', [A, A])}) == 1
+    with pytest.raises(AttributeError):
+        A.angle = 45
+    with pytest.raises(AttributeError):
+        ud.foo = 1
+    ud2 = pickle.loads(pickle.dumps(ud))
+    assert ud2 == ud and ud2.Ex == ud.Ex and ud2.ABD == ud.ABD
+
+
+def test_lazy_laminate():  # {{{1
+    A = lamina(hf, hr, 100, 0, 0.5)
+    B = lamina(hf, hr, 100, 90, 0.5)
+    lam = laminate('lazy', [A, B, B, A])
+    assert math.isclose(lam.thickness, 0.4545, rel_tol=0.01)
+    with pytest.raises(AttributeError):
+        object.__getattribute__(lam, 'ABD')
+    assert math.isclose(lam.αx, 6.427e-06, rel_tol=0.01)
+    assert object.__getattribute__(lam, 'ABD') is lam.ABD
+    with pytest.raises(AttributeError):
+        object.__getattribute__(lam, 'C')
+    with pytest.raises(AttributeError):
+        lam.foo
+
+
+def test_symmetric():  # {{{1
+    A = lamina(hf, hr, 100, 0, 0.5)
+    B = lamina(hf, hr, 100, 45, 0.5)
+    C = lamina(hf, hr, 200, 90, 0.5)
+    for layers in ([A, B, B, A], [A, B, C, B, A]):
+        s = laminate('sym', layers)
+        g = laminate('sym', layers, symmetric=False)
+        assert s.symmetric and not g.symmetric
+        assert all(s.ABD[i][j] == 0.0 for i in range(3) for j in range(3, 6))
+        for name in ('Ex', 'Ey', 'Gxy', 'νxy', 'νyx', 'αx', 'αy', 'Gxz',
+                     'Gyz', 'Ez', 'tEx', 'tGxy'):
+            assert math.isclose(getattr(s, name), getattr(g, name), rel_tol=1e-12)
+        for M in ('ABD', 'abd', 'H', 'C'):
+            for r1, r2 in zip(getattr(s, M), getattr(g, M)):
+                for x, y in zip(r1, r2):
+                    assert math.isclose(x, y, rel_tol=1e-12, abs_tol=1e-12)
+    assert not laminate('asym', [A, B]).symmetric
+    with pytest.raises(ValueError):
+        laminate('asym', [A, B], symmetric=True)
+
+
+def test_unsymmetric():  # {{{1
+    layers = [lamina(hf, hr, 100, a, 0.5) for a in (0, 90, 45, 30, -60)]
+    lam = laminate('unsym', layers)
+    assert not lam.symmetric
+    prod = lpm.matmul(lam.ABD, lam.abd)
+    for j, row in enumerate(prod):
+        for k, v in enumerate(row):
+            assert math.isclose(v, 1.0 if j == k else 0.0, abs_tol=1e-9)
+    dABD = lpm.det(lam.ABD)
+    dt1 = lpm.det(lpm.delete(lam.ABD, 0, 0))
+    dt4 = lpm.det(lpm.delete(lam.ABD, 0, 1))
+    assert math.isclose(lam.Ex, dABD / (dt1 * lam.thickness), rel_tol=1e-9)
+    assert math.isclose(lam.νxy, dt4 / dt1, rel_tol=1e-9)
+
+
+def test_rotate_stiffness():  # {{{1
+    Cp = ply_material(hf, hr, 0.5).Cp
+    angles = (0, 30, 45, -60, 90, 135)
+    for a, C in zip(angles, rotate_stiffness_many(Cp, angles)):
+        T = tbar(a)
+        ref = lpm.matmul(lpm.matmul(lpm.transp(T), Cp), T)
+        for x, y in zip(ref.data, C.data):
+            assert math.isclose(x, y, rel_tol=1e-12, abs_tol=1e-9)
+        assert rotate_stiffness(Cp, a) == C
+
+
+def test_rotate_laminate():  # {{{1
+    angles = (0, 30, -60, 90, 10)
+    lam = laminate('rot', [lamina(hf, hr, 100 + 50 * n, a, 0.5)
+                           for n, a in enumerate(angles)])
+    names = ('Ex', 'Ey', 'Gxy', 'νxy', 'νyx', 'αx', 'αy')
+    many = rotate_laminate_many(lam, (25, -70))
+    for j, θ in enumerate((25, -70)):
+        ref = laminate('rot', [lamina(hf, hr, 100 + 50 * n, a + θ, 0.5)
+                               for n, a in enumerate(angles)])
+        r = rotate_laminate(lam, θ)
+        assert r == ref
+        for name in names + ('tEx', 'tGxy', 'Gxz'):
+            assert math.isclose(getattr(r, name), getattr(ref, name),
+                                rel_tol=1e-12)
+        for name in names:
+            assert math.isclose(getattr(many, name)[j], getattr(ref, name),
+                                rel_tol=1e-12)
+        for M in ('ABD', 'abd', 'C'):
+            for r1, r2 in zip(getattr(r, M), getattr(ref, M)):
+                for x, y in zip(r1, r2):
+                    assert math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def test_rotate_laminate_many_numpy():  # {{{1
+    pytest.importorskip("numpy")
+    lam = laminate('rot', [lamina(hf, hr, 100 + 50 * n, a, 0.5)
+                           for n, a in enumerate((0, 30, -60, 90, 10))])
+    angles = (0, 25, -70, 135)
+    ref = rotate_laminate_many(lam, angles)
+    set_backend("numpy")
+    try:
+        lam = laminate('rot', lam.layers)
+        many = rotate_laminate_many(lam, angles)
+    finally:
+        set_backend("python")
+    for name in ('Ex', 'Ey', 'Gxy', 'νxy', 'νyx', 'αx', 'αy'):
+        for x, y in zip(getattr(many, name), getattr(ref, name)):
+            assert math.isclose(x, y, rel_tol=1e-9)
+
+
+def test_polar():  # {{{1
+    ud = laminate('ud', [lamina(hf, hr, 100, 0, 0.5)])
+    p = polar(ud, 8)
+    assert list(p.angle) == [0, 45, 90, 135, 180, 225, 270, 315]
+    assert math.isclose(p.Ex[0], ud.Ex) and math.isclose(p.Ex[2], ud.Ey)
+    assert math.isclose(p.αx[6], ud.αy) and math.isclose(p.Ex[1], p.Ey[3])
+    r = rotate_laminate(ud, -30)
+    assert math.isclose(polar(ud, 12).Gxy[1], r.Gxy)
+    with pytest.raises(ValueError):
+        polar(ud, 0)
+
+
+def test_sensitivities():  # {{{1
+    spec = [(100, 0, 0.5), (200, 30, 0.55), (150, -60, 0.45), (300, 90, 0.5)]
+
+    def lam(spec):
+        return laminate('s', [lamina(hf, hr, fw, a, vf) for fw, a, vf in spec])
+
+    sens = sensitivities(lam(spec))
+    for kind, k, h in (('fiber_weight', 0, 1e-3), ('angle', 1, 1e-5),
+                       ('vf', 2, 1e-7)):
+        for j in range(len(spec)):
+            plus = [list(s) for s in spec]
+            minus = [list(s) for s in spec]
+            plus[j][k] += h
+            minus[j][k] -= h
+            p, m = lam(plus), lam(minus)
+            d = getattr(sens, kind)
+            for name in ('Ex', 'Ey', 'Gxy', 'νxy', 'νyx', 'αx', 'αy'):
+                fd = (getattr(p, name) - getattr(m, name)) / (2 * h)
+                assert math.isclose(getattr(d, name)[j], fd, rel_tol=1e-5)
+            for r in range(6):
+                for c in range(6):
+                    fd = (p.ABD[r][c] - m.ABD[r][c]) / (2 * h)
+                    assert math.isclose(d.ABD[j][r][c], fd, rel_tol=1e-5,
+                                        abs_tol=1e-3)
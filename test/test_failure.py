@@ -0,0 +1,166 @@
+# file: test_failure.py
+# vim:fileencoding=utf-8:ft=python:fdm=marker
+#
+# Author: R.F. Smith <rsmith@xs4all.nl>
+# Created: 2026-10-18T17:52:06+0200
+# Last modified: 2026-10-18T17:52:06+0200
+"""Tests for first-ply failure."""
+
+import sys
+import math
+import pytest
+# Inserting the path is needed to make sure that the module here is loaded,
+# not an installed version!
+sys.path.insert(1, '.')
+
+import lp.core as core  # noqa
+from lp.core import fiber, resin, lamina, laminate, strength  # noqa
+import lp.failure as failure  # noqa
+from lp.failure import reserve_factors, envelope, progressive  # noqa
+from lp.parser import parse  # noqa
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+hs = strength(1500, 1200, 50, 200, 70, "Hyer's carbon fiber")
+
+
+def test_strength():  # {{{1
+    assert hs.Xc == 1200.0
+    with pytest.raises(ValueError):
+        strength(1500, -1200, 50, 200, 70, "bad")
+    la = lamina(hf, hr, 100, 0, 0.5)
+    assert laminate('ud', [la, la]).strengths is None
+    assert laminate('ud', [la, la], strengths=hs).strengths == (hs, hs)
+    assert laminate('ud', [la], strengths={hf.name: hs}).strengths == (hs,)
+    with pytest.raises(ValueError):
+        laminate('ud', [la, la], strengths=[hs])
+
+
+def test_ud():  # {{{1
+    la = lamina(hf, hr, 100, 0, 0.5)
+    ud = laminate('ud', [la, la, la, la], strengths=hs)
+    T = ud.thickness
+    loads = [(100, 0, 0, 0, 0, 0), (-100, 0, 0, 0, 0, 0), (0, 10, 0, 0, 0, 0),
+             (0, 0, 10, 0, 0, 0), (0, 0, 0, 0, 0, 0)]
+    expected = (1500 * T / 100, 1200 * T / 100, 50 * T / 10, 70 * T / 10)
+    for criterion in ("tsai-wu", "max-stress"):
+        rv = reserve_factors(ud, loads, criterion=criterion)
+        for a, b in zip(rv.rf, expected[:2]):
+            assert math.isclose(a, b, rel_tol=1e-9)
+        assert rv.rf[-1] == math.inf and rv.ply[-1] == -1
+    rv = reserve_factors(ud, loads, criterion="max-stress")
+    for a, b in zip(rv.rf, expected):
+        assert math.isclose(a, b, rel_tol=1e-9)
+    with pytest.raises(ValueError):
+        reserve_factors(ud, loads, criterion="hashin")
+    with pytest.raises(ValueError):
+        reserve_factors(laminate('ud', [la]), loads)
+
+
+def test_envelope():  # {{{1
+    A = lamina(hf, hr, 100, 0, 0.5)
+    B = lamina(hf, hr, 100, 90, 0.5)
+    lam = laminate('cross-ply', [A, B, B, A], strengths=hs)
+    for criterion in ("tsai-wu", "max-stress"):
+        rv = envelope(lam, "Nx", "Nxy", n=360, ΔT=-20, criterion=criterion)
+        assert len(rv.x) == len(rv.y) == len(rv.ply) == 360
+        # Every point of the envelope is a load at first-ply failure.
+        loads = [(x, 0, y, 0, 0, 0) for x, y in zip(rv.x, rv.y)]
+        rf = reserve_factors(lam, loads, ΔT=-20, criterion=criterion).rf
+        for r in rf:
+            assert math.isclose(r, 1, rel_tol=1e-9)
+    # Shear envelope of a cross-ply laminate is symmetric.
+    rv = envelope(lam, "Nx", "Nxy", n=4)
+    assert math.isclose(rv.y[1], -rv.y[3], rel_tol=1e-9)
+    with pytest.raises(ValueError):
+        envelope(lam, "Nx", "Nx")
+
+
+def test_envelope_numpy(monkeypatch):  # {{{1
+    pytest.importorskip("numpy")
+    # Evaluate the directions in several blocks.
+    monkeypatch.setattr(failure, "_BLOCK", 1000)
+    layers = [lamina(hf, hr, 100, a, 0.5) for a in (0, 45, -45, 90, 30)]
+    # Thermal stresses fail the plies of the last case on their own.
+    cases = (("Nx", "Ny", 0), ("Nxy", "Mx", -20), ("Ny", "Mxy", 10),
+             ("Nx", "Ny", -400))
+    for criterion in ("tsai-wu", "max-stress"):
+        for x, y, dt in cases:
+            args = (x, y, 720, dt, criterion)
+            ref = envelope(laminate('e', layers, strengths=hs), *args)
+            core.set_backend("numpy")
+            try:
+                rv = envelope(laminate('e', layers, strengths=hs), *args)
+            finally:
+                core.set_backend("python")
+            assert rv.ply == ref.ply and rv.angle == ref.angle
+            for name in ("x", "y"):
+                for a, b in zip(getattr(rv, name), getattr(ref, name)):
+                    assert a == b or math.isclose(a, b, rel_tol=1e-9,
+                                                  abs_tol=1e-9)
+
+
+def test_progressive():  # {{{1
+    la = lamina(hf, hr, 100, 0, 0.5)
+    ud = laminate('ud', [la, la, la], strengths=hs)
+    rv = progressive(ud, [(100, 0, 0, 0, 0, 0)])
+    # All plies fail at once.
+    assert list(rv.ply) == [0, 1, 2]
+    assert list(rv.mode) == [2, 2, 2]
+    assert rv.first[0] == rv.ultimate[0]
+    A = lamina(hf, hr, 100, 0, 0.5)
+    B = lamina(hf, hr, 100, 90, 0.5)
+    C = lamina(hf, hr, 100, 45, 0.5)
+    lam = laminate('cross-ply', [A, B, C, B, A], strengths=hs)
+    loads = [(1, 0, 0, 0, 0, 0), (0, 1, 0, 0, 0, 0), (1, -1, 1, 0, 0, 0),
+             (1, 0, 0, 0.1, 0, 0)]
+    for criterion in ("tsai-wu", "max-stress"):
+        rv = progressive(lam, loads, ΔT=-20, criterion=criterion)
+        rf = reserve_factors(lam, loads, ΔT=-20, criterion=criterion).rf
+        for a, b in zip(rv.first, rf):
+            assert math.isclose(a, b, rel_tol=1e-9)
+        for j in range(len(loads)):
+            events = [k for k, p in enumerate(rv.path) if p == j]
+            # Load factors do not decrease.
+            levels = [rv.load[k] for k in events]
+            assert levels == sorted(levels)
+            assert rv.ultimate[j] == levels[-1] >= rv.first[j]
+    # Under Nx the 90° plies crack first, and last-ply failure is fiber
+    # failure of a 0° ply.
+    rv = progressive(lam, loads[:1])
+    assert (rv.ply[0], rv.mode[0]) in ((1, 1), (3, 1))
+    assert (0, 2) in zip(rv.ply, rv.mode) or (4, 2) in zip(rv.ply, rv.mode)
+    with pytest.raises(ValueError):
+        progressive(lam, loads, factor=0)
+
+
+def test_progressive_biaxial():  # {{{1
+    A = lamina(hf, hr, 100, 0, 0.5)
+    B = lamina(hf, hr, 100, 90, 0.5)
+    lam = laminate('cross-ply', [A, B, B, A], strengths=hs)
+    rv = progressive(lam, [(100, 100, 0, 0, 0, 0)])
+    # All plies crack in the matrix first; the fibers carry the load after
+    # that, so last-ply failure is fiber failure at a much higher load.
+    assert list(rv.mode[:4]) == [1, 1, 1, 1]
+    assert rv.mode[-1] == 2
+    assert rv.ultimate[0] > 3 * rv.first[0]
+    # A cross-ply laminate cannot carry shear once the matrix has cracked.
+    rv = progressive(lam, [(0, 0, 1, 0, 0, 0)])
+    assert set(rv.mode) == {1}
+
+
+def test_parse(tmp_path):  # {{{1
+    path = tmp_path / 'strength.lam'
+    path.write_text(
+        "f: 233000 0.2 -0.54e-6 1.76 Hyer's carbon fiber\n"
+        "r: 4620 0.36 41.4e-6 1.1 Hyer's resin\n"
+        "x: 1500 1200 50 200 70 Hyer's carbon fiber\n"
+        "t: cross-ply\n"
+        "m: 0.5 Hyer's resin\n"
+        "l: 100 0 Hyer's carbon fiber\n"
+        "l: 100 90 Hyer's carbon fiber\n"
+        "s:\n",
+        encoding='utf-8'
+    )
+    lam = parse(str(path))[0]
+    assert lam.strengths == (hs,) * 4
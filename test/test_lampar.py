@@ -0,0 +1,66 @@
+# file: test_lampar.py
+# vim:fileencoding=utf-8:ft=python:fdm=marker
+#
+# Author: R.F. Smith <rsmith@xs4all.nl>
+# Created: 2026-10-18T12:10:04+0200
+# Last modified: 2026-10-18T12:10:04+0200
+"""Test for invariants and lamination parameters"""
+
+import sys
+import math
+import pytest
+# Inserting the path is needed to make sure that the module here is loaded,
+# not an installed version!
+sys.path.insert(1, '.')
+
+from lp.core import fiber, resin, lamina, laminate  # noqa
+from lp.lampar import (invariants, lamination_parameters,  # noqa
+                       abd_from_lamination_parameters)
+
+hf = fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+hr = resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+
+
+def test_invariants():  # {{{1
+    la = lamina(hf, hr, 100, 30, 0.5)
+    U1, U2, U3, U4, U5 = invariants(la)
+    assert invariants(la.ply) == (U1, U2, U3, U4, U5)
+    c2, s2 = math.cos(math.radians(60)), math.sin(math.radians(60))
+    c4, s4 = math.cos(math.radians(120)), math.sin(math.radians(120))
+    for v, e in ((la.Q̅11, U1 + U2 * c2 + U3 * c4),
+                 (la.Q̅22, U1 - U2 * c2 + U3 * c4),
+                 (la.Q̅12, U4 - U3 * c4),
+                 (la.Q̅66, U5 - U3 * c4),
+                 (la.Q̅16, U2 * s2 / 2 + U3 * s4),
+                 (la.Q̅26, U2 * s2 / 2 - U3 * s4)):
+        assert math.isclose(v, e, rel_tol=1e-12)
+
+
+def test_abd():  # {{{1
+    for angles in ((0, 45, -45, 90), (0, 30, 60), (0, 45, 90, -45, 0), (15, -15)):
+        layers = [lamina(hf, hr, 100 + 50 * (n % 2), a, 0.5)
+                  for n, a in enumerate(angles)]
+        lam = laminate('lp', layers)
+        ξ = lamination_parameters(lam)
+        assert len(ξ) == 12 and all(-1 <= x <= 1 for x in ξ)
+        ABD = abd_from_lamination_parameters(invariants(layers[0]), ξ,
+                                             lam.thickness)
+        for r1, r2 in zip(ABD, lam.ABD):
+            for x, y in zip(r1, r2):
+                assert math.isclose(x, y, rel_tol=1e-12, abs_tol=1e-9)
+
+
+def test_parameters():  # {{{1
+    ud = laminate('ud', [lamina(hf, hr, 100, 0, 0.5)] * 2)
+    for x, y in zip(lamination_parameters(ud), (1, 0, 1, 0, 0, 0, 0, 0, 1, 0, 1, 0)):
+        assert math.isclose(x, y, rel_tol=1e-12, abs_tol=1e-15)
+    cp = laminate('cp', [lamina(hf, hr, 100, a, 0.5) for a in (0, 90)])
+    ξ = lamination_parameters(cp)
+    assert math.isclose(ξ[0], 0, abs_tol=1e-15)
+    assert math.isclose(ξ[4], -1) and math.isclose(ξ[2], 1)
+
+
+def test_mixed():  # {{{1
+    layers = [lamina(hf, hr, 100, 0, 0.5), lamina(hf, hr, 100, 0, 0.4)]
+    with pytest.raises(ValueError):
+        lamination_parameters(laminate('mixed', layers))
@@ -81,3 +81,101 @@ def test_delete():  # {{{1
         [0.57, 0.98, 0.49, 0.01, 0.71]
     ]
     assert mat.delete(_rndm, 1, 3) == smaller
+
+
+def test_det_2():  # {{{1
+    m = [[4.0, 7.0], [2.0, 6.0]]
+    assert mat.det(m) == 10.0
+
+
+def test_inv_2():  # {{{1
+    m = [[4.0, 7.0], [2.0, 6.0]]
+    assert mat.inv(m) == [[0.6, -0.7], [-0.2, 0.4]]
+
+
+def test_inv_3():  # {{{1
+    m = [[6, 1, 1], [4, -2, 5], [2, 8, 7]]
+    ref = mat._inv_gj([v for row in m for v in row], 3)
+    for x, y in zip(mat.inv(m).data, ref):
+        assert abs(x - y) < 1e-12
+
+
+def test_det_5():  # {{{1
+    m = mat.delete(_rndm, 2, 4)
+    assert abs(mat.det(m) - mat.LU(_rndm).minor(2, 4)) < 1e-12
+
+
+def test_block_kernels():  # {{{1
+    # The top-left block of the last one is singular.
+    cases = [_rndm, mat.delete(_rndm, 2, 4),
+             mat.matmul(_rndm, mat.transp(_rndm)),
+             [[0, 0, 0, 1, 0, 0], [0, 1, 0, 0, 0, 0], [0, 0, 1, 0, 0, 0],
+              [1, 0, 0, 0, 0, 0], [0, 0, 0, 0, 2, 0], [0, 0, 0, 0, 0, 3]]]
+    for m in cases:
+        size, d = mat._flat(m)
+        assert mat._DET[size] is mat._det_block
+        assert abs(mat.det(m) - mat._det_ge(d, size)) < 1e-12
+        for x, y in zip(mat.inv(m).data, mat._inv_gj(d, size)):
+            assert abs(x - y) < 1e-9
+
+
+def test_matmul_6():  # {{{1
+    prod = mat.matmul(_rndm, mat.inv(_rndm))
+    ident = mat.ident(6)
+    for a, b in zip(prod, ident):
+        for x, y in zip(a, b):
+            assert abs(x - y) < 1e-9
+    m = mat.matmul(_rndm, mat.transp(_rndm))
+    assert m[0][0] == sum(v * v for v in _rndm[0])
+
+
+def test_lu():  # {{{1
+    f = mat.LU(_rndm)
+    assert abs(f.det() - mat.det(_rndm)) < 1e-12
+    for a, b in zip(f.inv(), mat.inv(_rndm)):
+        for x, y in zip(a, b):
+            assert abs(x - y) < 1e-9
+    for r, k in ((0, 0), (1, 3), (5, 2)):
+        assert abs(f.minor(r, k) - mat.det(mat.delete(_rndm, r, k))) < 1e-12
+
+
+def test_matrix():  # {{{1
+    m = mat.matrix(_rndm)
+    assert isinstance(m, mat.Matrix)
+    assert len(m) == 6 and len(m.data) == 36
+    assert m[1][2] == 0.94 and m[-1][0] == 0.57
+    m[1][2] = 2.0
+    assert m.data[8] == 2.0
+    assert m.tolist()[1][2] == 2.0
+    assert mat.matrix(m) is m
+    assert mat.transp(mat.transp(_rndm)) == _rndm
+
+
+def test_inplace():  # {{{1
+    m = mat.matrix(_rndm)
+    assert mat.iadd(m, _rndm) is m
+    assert m == mat.mul(_rndm, 2)
+    mat.imul(m, 0.5)
+    assert m == _rndm
+    mat.axpy(-1.0, _rndm, m)
+    assert m == mat.zeros(6)
+    m[0][1] = 1e-12
+    assert mat.clean_inplace(m)[0][1] == 0.0
+
+
+def test_out():  # {{{1
+    m = mat.matrix(_rndm)
+    r = mat.matmul(m, m)
+    assert mat.matmul(m, m, out=m) is m
+    assert m == r
+    t = mat.zeros(6)
+    assert mat.transp(_rndm, out=t) is t
+    assert t == mat.transp(_rndm)
+
+
+def test_block():  # {{{1
+    a, b, c, d = mat.split(_rndm)
+    assert a == [[0.21, 0.76, 0.07], [0.76, 0.07, 0.94], [0.07, 0.94, 0.33]]
+    assert mat.block(a, b, c, d) == _rndm
+    inv = [[round(n, 2) for n in row] for row in mat.inv_block(_rndm)]
+    assert inv == _invm
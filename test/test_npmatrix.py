@@ -0,0 +1,47 @@
+# file: test_npmatrix.py
+# vim:fileencoding=utf-8:fdm=marker:ft=python
+#
+# Author: R.F. Smith <rsmith@xs4all.nl>
+# Created: 2026-10-18T10:31:05+0200
+# Last modified: 2026-10-18T10:31:05+0200
+"""Test of the NumPy matrix backend"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import lp.core as core  # noqa
+import lp.matrix as mat  # noqa
+import lp.npmatrix as npm  # noqa
+from test_matrix import _rndm  # noqa
+
+
+def test_same_as_python():  # {{{1
+    assert abs(npm.det(_rndm) - mat.det(_rndm)) < 1e-12
+    assert np.allclose(npm.inv(_rndm), mat.inv(_rndm).tolist())
+    f = npm.LU(_rndm)
+    assert abs(f.minor(1, 3) - mat.LU(_rndm).minor(1, 3)) < 1e-12
+
+
+def test_stacks():  # {{{1
+    angles = [0, 30, 45, -45, 90]
+    T = npm.tbar_stack(angles)
+    for j, a in enumerate(angles):
+        assert np.allclose(T[j], core.tbar(a).tolist())
+    Cp = np.diag([6.0, 5.0, 4.0, 3.0, 2.0, 1.0])
+    C = npm.rotate_stack(Cp, angles)
+    assert C.shape == (5, 6, 6)
+    assert np.allclose(npm.inv_stack(C) @ C, np.eye(6))
+
+
+def test_qbar_stack():  # {{{1
+    hf = core.fiber(233000, 0.2, -0.54e-6, 1.76, "Hyer's carbon fiber")
+    hr = core.resin(4620, 0.36, 41.4e-6, 1.1, "Hyer's resin")
+    la = core.lamina(hf, hr, 100, 0, 0.5)
+    Q11, Q12, Q22, Q66 = la.Q̅11, la.Q̅12, la.Q̅22, la.Q̅66
+    angles = np.array([15.0, 45.0, -60.0])
+    res = npm.qbar_stack(Q11, Q12, Q22, Q66, angles)
+    for j, a in enumerate(angles):
+        lb = core.lamina(hf, hr, 100, a, 0.5)
+        ref = (lb.Q̅11, lb.Q̅12, lb.Q̅16, lb.Q̅22, lb.Q̅26, lb.Q̅66)
+        assert np.allclose([q[j] for q in res], ref)
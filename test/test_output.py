@@ -7,15 +7,25 @@
 """Compare output to reference output."""
 
 import zipfile
+import pytest
 from lp.parser import parse
+import lp.core as core
 import lp.text as text
 import lp.latex as latex
 import lp.html as html
 
-laminates = parse('test/hyer.lam')
 
+@pytest.fixture(params=["python", "numpy"])
+def laminates(request):
+    """Parse the test file with every matrix backend."""
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    core.set_backend(request.param)
+    yield parse('test/hyer.lam')
+    core.set_backend("python")
 
-def test_text_output():
+
+def test_text_output(laminates):
     # Read reference. Remove "Generated" lines.
     with zipfile.ZipFile("test/reference/reference.zip") as refz:
         with refz.open("hyer-2020.12.28.txt") as orig:
@@ -29,7 +39,7 @@ def test_text_output():
     assert outlist == origlines
 
 
-def test_LaTeX_output():
+def test_LaTeX_output(laminates):
     # Read reference. Remove "calculated by" lines.
     with zipfile.ZipFile("test/reference/reference.zip") as refz:
         with refz.open("hyer-2020.12.28.tex") as orig:
@@ -43,7 +53,7 @@ def test_LaTeX_output():
     assert outlist == origlines
 
 
-def test_html_output():
+def test_html_output(laminates):
     # Read reference. Remove "calculated by" lines.
     with zipfile.ZipFile("test/reference/reference.zip") as refz:
         with refz.open("hyer-2020.12.28.html") as orig:
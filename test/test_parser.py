@@ -16,10 +16,11 @@ from lp.core import (fiber, resin)  # noqa
 
 
 def test_directives():  # {{{1
-    r, f, la = _directives('test/twill245.lam')
+    r, f, la, x = _directives('test/twill245.lam')
     assert len(r) == 1
     assert len(f) == 1
     assert len(la) == 9
+    assert len(x) == 0
 
 
 def test_numbers():  # {{{1
@@ -13,8 +13,8 @@ syn case ignore
 syn spell toplevel
 
 syn match lampropComment ".*" contains=@Spell
-syn match lampropStart "^[frtmls]:" contained
-syn match lampropStatement "^[frtmls]:.*$" contains=lampropNumber,lampropStart skipwhite
+syn match lampropStart "^[frtmlsx]:" contained
+syn match lampropStatement "^[frtmlsx]:.*$" contains=lampropNumber,lampropStart skipwhite
 syn match lampropNumber "\s[+-]\?\d\+" contained
 syn match lampropNumber "\.\d\+\s" contained
 syn match lampropNumber "\s[+-]\?\d\+\%(\.\d\+\)\?\%([eE][+-]\?\d\+\)\s" contained